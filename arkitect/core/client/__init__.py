@@ -13,7 +13,16 @@
 # limitations under the License.
 
 from .base import Client, ClientPool, get_client_pool
-from .http import default_ark_client, load_request
+from .http import (
+    ArkClientConfig,
+    RequestLoader,
+    close_ark_clients,
+    configure_ark_clients,
+    default_ark_client,
+    default_sync_ark_client,
+    get_request_loader,
+    load_request,
+)
 from .sse import AsyncSSEDecoder
 
 __all__ = [
@@ -21,6 +30,12 @@ __all__ = [
     "ClientPool",
     "AsyncSSEDecoder",
     "default_ark_client",
+    "default_sync_ark_client",
+    "ArkClientConfig",
+    "configure_ark_clients",
+    "close_ark_clients",
     "load_request",
+    "RequestLoader",
+    "get_request_loader",
     "get_client_pool",
 ]
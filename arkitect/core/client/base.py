@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import inspect
 import logging
 from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
@@ -121,6 +122,29 @@ class ClientPool(Singleton):
 
         return await client_cls.get_instance_async(*args, **kwargs)
 
+    async def close(self) -> None:
+        """
+        Close the clients of the pool, called when the server shuts down.
+        Clients without aclose, close or cleanup method are left as is.
+        """
+        for name, client in list(self.clients.items()):
+            close = next(
+                (
+                    getattr(client, method)
+                    for method in ("aclose", "close", "cleanup")
+                    if callable(getattr(client, method, None))
+                ),
+                None,
+            )
+            if close is None:
+                continue
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logging.error(f"close client {name} failed:{e}")
+
 
 @task()
 def get_client_pool(
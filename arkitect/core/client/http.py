@@ -12,37 +12,218 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Type
+import asyncio
+import functools
+import threading
+import weakref
+from typing import Any, Callable, Optional, Type
 
 import fastapi
+import httpx
 from httpx import Timeout
-from pydantic import ValidationError
-from volcenginesdkarkruntime import AsyncArk
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from volcenginesdkarkruntime import Ark, AsyncArk
 
 from arkitect.core.errors import InvalidParameter, parse_pydantic_error
 from arkitect.core.runtime import RequestType
 
 from .base import get_client_pool
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+class ArkClientConfig(BaseModel):
+    """Connection settings of the shared Ark clients"""
+
+    max_connections: int = 1000
+    max_keepalive_connections: int = 100
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+    """requires the `h2` package"""
+    connect_timeout: float = 1.0
+    timeout: float = 60.0
+    """timeout of async requests, sync requests keep the sdk default"""
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+_ark_client_config = ArkClientConfig()
+# httpx async connections can not be shared across event loops
+_async_ark_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncArk]" = (
+    weakref.WeakKeyDictionary()
+)
+_sync_ark_client: Optional[Ark] = None
+_sync_ark_client_lock = threading.Lock()
+
+
+def configure_ark_clients(config: ArkClientConfig) -> None:
+    """
+    Sets the connection settings of the shared Ark clients,
+    only clients created afterwards are affected.
+    """
+    global _ark_client_config
+    _ark_client_config = config
+
 
 def default_ark_client() -> AsyncArk:
     """
     Retrieves or creates an instance of the AsyncArk client.
 
     This function attempts to fetch an existing client from the client pool.
-    If no client is found, it creates a new instance of the AsyncArk client
-    with a specified timeout configuration.
+    If no client is found, it returns the AsyncArk client shared in the running
+    event loop, so connections are kept alive across requests.
 
     Returns:
         AsyncArk: An instance of the AsyncArk client.
     """
     client_pool = get_client_pool()
     client: AsyncArk = client_pool.get_client("ark")  # type: ignore
-    if not client:
-        client = AsyncArk(timeout=Timeout(connect=1.0, timeout=60.0))
+    if client:
+        return client
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # no event loop to bind the connections to
+        return _new_async_ark_client()
+    client = _async_ark_clients.get(loop)  # type: ignore
+    if client is None:
+        client = _new_async_ark_client()
+        _async_ark_clients[loop] = client
     return client
 
 
+def default_sync_ark_client() -> Ark:
+    """
+    Retrieves the Ark client shared in the process, creating it on first use.
+    """
+    global _sync_ark_client
+    if _sync_ark_client is None:
+        with _sync_ark_client_lock:
+            if _sync_ark_client is None:
+                _sync_ark_client = Ark(
+                    http_client=httpx.Client(
+                        limits=_ark_client_config.limits(),
+                        http2=_ark_client_config.http2,
+                        follow_redirects=True,
+                    )
+                )
+    return _sync_ark_client
+
+
+async def close_ark_clients() -> None:
+    """
+    Closes the shared Ark clients, called when the server shuts down.
+    """
+    global _sync_ark_client
+    loop = asyncio.get_running_loop()
+    client = _async_ark_clients.pop(loop, None)
+    if client is not None:
+        await client.close()
+    with _sync_ark_client_lock:
+        sync_client, _sync_ark_client = _sync_ark_client, None
+    if sync_client is not None:
+        sync_client.close()
+
+
+def _new_async_ark_client() -> AsyncArk:
+    config = _ark_client_config
+    return AsyncArk(
+        timeout=Timeout(connect=config.connect_timeout, timeout=config.timeout),
+        http_client=httpx.AsyncClient(
+            limits=config.limits(),
+            http2=config.http2,
+            follow_redirects=True,
+        ),
+    )
+
+
+class RequestLoader:
+    """
+    Reads and validates the requests of one request class,
+    the validator is looked up once and shared by every request.
+
+    Bodies of at least `large_body_bytes` are read into a single buffer sized
+    by their content-length and parsed with orjson before being validated,
+    the json scanning dominates for large multimodal requests.
+    """
+
+    def __init__(
+        self,
+        req_cls: Type[RequestType],
+        large_body_bytes: int = 64 * 1024,
+        max_preallocated_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.req_cls = req_cls
+        self.large_body_bytes = large_body_bytes
+        self.max_preallocated_bytes = max_preallocated_bytes
+        if isinstance(req_cls, type) and issubclass(req_cls, BaseModel):
+            validator: Any = req_cls.__pydantic_validator__
+        else:
+            validator = TypeAdapter(req_cls).validator
+        self._validate_json: Callable[[Any], RequestType] = validator.validate_json
+        self._validate_python: Callable[[Any], RequestType] = validator.validate_python
+
+    async def read_body(self, http_request: fastapi.Request) -> Any:
+        length = http_request.headers.get("content-length", "")
+        if not length.isdigit() or not (
+            self.large_body_bytes <= int(length) <= self.max_preallocated_bytes
+        ):
+            return await http_request.body()
+        # copy the received chunks straight into place instead of
+        # keeping them until they are joined
+        size = int(length)
+        body = bytearray(size)
+        view = memoryview(body)
+        received = 0
+        async for chunk in http_request.stream():
+            if received + len(chunk) > size:
+                raise InvalidParameter("Invalid request: body exceeds content-length")
+            view[received : received + len(chunk)] = chunk
+            received += len(chunk)
+        view.release()
+        if received != size:
+            raise InvalidParameter("Invalid request: incomplete body")
+        return body
+
+    def validate(self, body: Any) -> RequestType:
+        if orjson is not None and len(body) >= self.large_body_bytes:
+            try:
+                data = orjson.loads(body)
+            except orjson.JSONDecodeError:
+                # let pydantic report the error
+                return self._validate_json(body)
+            return self._validate_python(data)
+        return self._validate_json(body)
+
+    async def load(self, http_request: fastapi.Request) -> RequestType:
+        if "content-type" not in http_request.headers:
+            raise InvalidParameter("Invalid request: missing content-type")
+        content_type = http_request.headers.get("content-type", "")
+        media_type = content_type.split(";")[0].strip()
+        if media_type != "application/json":
+            raise InvalidParameter(
+                f"Invalid request: invalid content-type={content_type}"
+            )
+        body = await self.read_body(http_request)
+        try:
+            return self.validate(body)
+        except ValidationError as e:
+            raise parse_pydantic_error(e)
+
+
+@functools.lru_cache(maxsize=None)
+def get_request_loader(req_cls: Type[RequestType]) -> RequestLoader:
+    return RequestLoader(req_cls)
+
+
 async def load_request(
     http_request: fastapi.Request,
     req_cls: Type[RequestType],
@@ -50,16 +231,4 @@ async def load_request(
     """
     Loads and validates a request from a FastAPI HTTP request.
     """
-    if "content-type" not in http_request.headers:
-        raise InvalidParameter("Invalid request: missing content-type")
-    content_type, body = (
-        http_request.headers.get("content-type", ""),
-        await http_request.body(),
-    )
-    media_type = content_type.split(";")[0].strip()
-    try:
-        if media_type == "application/json":
-            return req_cls.model_validate_json(body)
-    except ValidationError as e:
-        raise parse_pydantic_error(e)
-    raise InvalidParameter(f"Invalid request: invalid content-type={content_type}")
+    return await get_request_loader(req_cls).load(http_request)
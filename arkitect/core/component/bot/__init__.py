@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from arkitect.core.component.bot.lifecycle import Lifecycle, LifecycleState
 from arkitect.core.component.bot.server import BotServer
 
-__all__ = ["BotServer"]
+__all__ = ["BotServer", "Lifecycle", "LifecycleState"]
@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import threading
+from enum import Enum
+from types import FrameType
+from typing import Any, Awaitable, Callable, List, Optional
+
+import uvicorn
+
+Hook = Callable[[], Awaitable[Any]]
+
+
+class LifecycleState(str, Enum):
+    STARTING = "starting"
+    READY = "ready"
+    DRAINING = "draining"
+    STOPPED = "stopped"
+
+
+class Lifecycle:
+    """
+    Readiness of a bot server and its startup and shutdown hooks.
+
+    Startup hooks run in order before the server is ready, e.g. to warm up
+    clients. Shutdown hooks run in reverse order once the in-flight requests
+    are done, each one is given at most `hook_timeout` seconds.
+    """
+
+    def __init__(self, hook_timeout: float = 10) -> None:
+        self.state = LifecycleState.STARTING
+        self.hook_timeout = hook_timeout
+        self._startup_hooks: List[Hook] = []
+        self._shutdown_hooks: List[Hook] = []
+
+    @property
+    def ready(self) -> bool:
+        return self.state == LifecycleState.READY
+
+    def on_startup(self, hook: Hook) -> Hook:
+        self._startup_hooks.append(hook)
+        return hook
+
+    def on_shutdown(self, hook: Hook) -> Hook:
+        self._shutdown_hooks.append(hook)
+        return hook
+
+    def start_draining(self) -> None:
+        """Stop reporting ready, so that no new traffic is routed here"""
+        if self.state in (LifecycleState.STARTING, LifecycleState.READY):
+            logging.info("bot server is draining")
+            self.state = LifecycleState.DRAINING
+
+    async def startup(self) -> None:
+        for hook in self._startup_hooks:
+            await hook()
+        if self.state == LifecycleState.STARTING:
+            self.state = LifecycleState.READY
+
+    async def shutdown(self) -> None:
+        self.start_draining()
+        for hook in reversed(self._shutdown_hooks):
+            try:
+                await asyncio.wait_for(hook(), self.hook_timeout)
+            except Exception as e:
+                logging.error(f"shutdown hook {hook} failed:{e!r}")
+        self.state = LifecycleState.STOPPED
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    Uvicorn server starting to drain on the first SIGTERM or SIGINT:
+    readiness fails right away, new connections are accepted for
+    `drain_delay` more seconds while load balancers catch up, then the
+    in-flight requests get `timeout_graceful_shutdown` seconds to finish.
+    """
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        lifecycle: Optional[Lifecycle] = None,
+        drain_delay: float = 0,
+    ) -> None:
+        super().__init__(config)
+        self.lifecycle = lifecycle
+        self.drain_delay = drain_delay
+        self._drain_timer: Optional[threading.Timer] = None
+
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        if self.lifecycle is not None:
+            self.lifecycle.start_draining()
+        if self.drain_delay <= 0 or self._drain_timer is not None:
+            # no delay, or a second signal: stop now
+            if self._drain_timer is not None:
+                self._drain_timer.cancel()
+            super().handle_exit(sig, frame)
+            return
+        # the default handling, wrappers included, e.g. of sse-starlette,
+        # runs once the delay is over
+        self._drain_timer = threading.Timer(
+            self.drain_delay, super().handle_exit, (sig, frame)
+        )
+        self._drain_timer.daemon = True
+        self._drain_timer.start()
@@ -13,17 +13,33 @@
 # limitations under the License.
 
 import asyncio
+import heapq
+import itertools
 import logging
+import os
 import time
 from dataclasses import dataclass, field
-from functools import partial
-from typing import Awaitable, Callable
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
 
-import anyio
 from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from arkitect.telemetry.logger import DEBUG, INFO, WARN, gen_log_id
+from arkitect.core.errors import ServerOverloaded
+from arkitect.telemetry.logger import (
+    DEBUG,
+    INFO,
+    WARN,
+    LoggerName,
+    get_log_id_generator,
+    start_timeline,
+)
+from arkitect.telemetry.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUED,
+    ADMISSION_REJECTED,
+    ADMISSION_WAIT,
+)
 from arkitect.utils.context import (
     get_client_reqid,
     get_reqid,
@@ -41,21 +57,35 @@ class LogIdMiddleware:
     client_header_name: str = "x-client-request-id"
     header_name: str = "x-request-id"
 
-    generator: Callable[[], str] = field(default=lambda: gen_log_id())
+    generator: Callable[[], str] = field(default_factory=get_log_id_generator)
+    """log id generator, selected by env LOG_ID_GENERATOR ("random" or "fast")"""
+    timeline: bool = field(
+        default_factory=lambda: os.getenv("LATENCY_TIMELINE") == "true"
+    )
+    """
+    record the latency timeline of each request, sent as a Server-Timing
+    header and logged in one line once the response is sent.
+    The header goes out with the response start, so for streaming responses
+    it only has the phases before the first chunk; the llm, tool and sse
+    phases of the stream are only in the log line.
+    """
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Load log ID from headers if present. Generate one otherwise.
         And put it into context.
         """
-        set_start_time(time.perf_counter())
+        start_time = time.perf_counter()
+        set_start_time(start_time)
         if scope["type"] not in ("http", "websocket"):
             await self.app(scope, receive, send)
             return
 
         headers = MutableHeaders(scope=scope)
-        headers[self.header_name] = headers.get(
-            "X-Faas-Request-Id", headers.get(self.header_name, self.generator())
+        headers[self.header_name] = (
+            headers.get("X-Faas-Request-Id")
+            or headers.get(self.header_name)
+            or self.generator()
         )
         headers[self.client_header_name] = headers.get(
             self.client_header_name.lower(), headers[self.header_name]
@@ -64,17 +94,31 @@ class LogIdMiddleware:
         set_client_reqid(headers[self.client_header_name])
         set_reqid(headers[self.header_name])
         set_headers(headers)
+        timeline = start_timeline(start_time) if self.timeline else None
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
 
         async def handle_outgoing_request(message: "Message") -> None:
-            if message["type"] == "http.response.start" and get_reqid():
+            if message["type"] == "http.response.start":
                 headers = MutableHeaders(scope=message)
-                headers.append(self.header_name, get_reqid())
-                headers.append(self.client_header_name, get_client_reqid())
+                if get_reqid():
+                    headers.append(self.header_name, get_reqid())
+                    headers.append(self.client_header_name, get_client_reqid())
+                if timeline is not None:
+                    headers.append("server-timing", timeline.server_timing())
 
             await send(message)
-            logging.debug(
-                f"[{get_reqid()}] out app cost={time.perf_counter() - get_start_time()}"
-            )
+            if debug:
+                logging.debug(
+                    "[%s] out app cost=%s",
+                    get_reqid(),
+                    time.perf_counter() - get_start_time(),
+                )
+            if (
+                timeline is not None
+                and message["type"] == "http.response.body"
+                and not message.get("more_body", False)
+            ):
+                INFO("[%s] timeline %s", get_reqid(), timeline.summary())
 
         await self.app(scope, receive, handle_outgoing_request)
         return
@@ -86,49 +130,263 @@ class ListenDisconnectionMiddleware:
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Cancel the request if the client disconnected.
+        Cancel the request if the client disconnected while the response
+        is streamed. The disconnect watcher task is only started once
+        the response streams, non streaming requests run without it.
         """
-        INFO("listen disconnection middleware called.")
-
-        if scope["type"] not in ("http", "websocket"):
+        if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
 
-        request_received, response_sent = asyncio.Event(), asyncio.Event()
+        debug = logging.getLogger(LoggerName.get()).isEnabledFor(logging.DEBUG)
+        if debug:
+            DEBUG("listen disconnection middleware called.")
+
+        app_task = asyncio.current_task()
+        request_received = response_sent = disconnected = False
+        watcher: Optional[asyncio.Task] = None
+
+        async def listen_for_disconnect() -> None:
+            nonlocal disconnected
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            if not response_sent:
+                WARN("request canceled before response finished.")
+                disconnected = True
+                if app_task is not None:
+                    app_task.cancel()
 
         async def _receive() -> Message:
+            nonlocal request_received
             message = await receive()
-            DEBUG(f"receive message={message}")
+            if debug:
+                DEBUG("receive message=%s", message)
             if message["type"] == "http.request" and not message.get(
                 "more_body", False
             ):
-                request_received.set()
+                request_received = True
             return message
 
         async def _send(message: Message) -> None:
-            DEBUG(f"send message={message}")
-            if message["type"] == "http.response.body" and not message.get(
-                "more_body", False
-            ):
-                response_sent.set()
+            nonlocal response_sent, watcher
+            if debug:
+                DEBUG("send message=%s", message)
+            if message["type"] == "http.response.body":
+                if not message.get("more_body", False):
+                    response_sent = True
+                elif watcher is None and request_received:
+                    watcher = asyncio.create_task(listen_for_disconnect())
             await send(message)
 
-        async def listen_for_disconnect() -> None:
-            await request_received.wait()
-            while True:
-                message = await receive()
-                if message["type"] == "http.disconnect":
-                    if not response_sent.is_set():
-                        WARN("request canceled before response finished.")
-                    break
+        try:
+            await self.app(scope, _receive, _send)
+        except asyncio.CancelledError:
+            if not disconnected:
+                raise
+            # cancelled by the watcher, the client is gone
+            if hasattr(app_task, "uncancel"):
+                app_task.uncancel()
+        finally:
+            if watcher is not None:
+                watcher.cancel()
 
-        async with anyio.create_task_group() as task_group:
 
-            async def wrap(func: Callable[[], Awaitable[None]]) -> None:
-                await func()
-                task_group.cancel_scope.cancel()
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name) or default)
 
-            task_group.start_soon(wrap, partial(self.app, scope, _receive, _send))
-            await wrap(listen_for_disconnect)
 
-        return
+def _env_path_priorities() -> Dict[str, int]:
+    # e.g. ADMISSION_PATH_PRIORITIES="/api/v3/bots/chat/completions=10,/batch=-5"
+    priorities = {}
+    for item in (os.getenv("ADMISSION_PATH_PRIORITIES") or "").split(","):
+        if "=" in item:
+            path, priority = item.rsplit("=", 1)
+            priorities[path.strip()] = int(priority)
+    return priorities
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Limits the requests in flight, the others wait in a bounded queue
+    and are admitted by priority, then arrival order.
+
+    When the queue is full, a request evicts the latest waiter of the lowest
+    priority if that one has a lower priority, otherwise it is rejected.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue_size: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queue_size = max_queue_size
+        self.in_flight = 0
+        # (-priority, sequence, future), cancelled futures are removed lazily
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._queued = 0
+        self._sequence = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    async def acquire(self, priority: int, timeout: float) -> None:
+        if self.in_flight < self.max_in_flight and not self._queued:
+            self._admit()
+            return
+        if self._queued >= self.max_queue_size and not self._evict(priority):
+            raise AdmissionRejected("queue_full")
+
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._sequence), future))
+        self._set_queued(self._queued + 1)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                self._set_queued(self._queued - 1)
+                raise AdmissionRejected("timeout")
+            # admitted right when the deadline passed
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+                self._set_queued(self._queued - 1)
+            elif not future.cancelled() and future.exception() is None:
+                # the slot was handed over, give it to the next waiter
+                self.release()
+            raise
+        future.result()
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            # hand the slot over, in_flight stays the same
+            self._set_queued(self._queued - 1)
+            future.set_result(None)
+            return
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.dec()
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.inc()
+
+    def _set_queued(self, queued: int) -> None:
+        self._queued = queued
+        ADMISSION_QUEUED.set(queued)
+
+    def _evict(self, priority: int) -> bool:
+        pending = [w for w in self._waiters if not w[2].done()]
+        if not pending:
+            return False
+        victim = max(pending)  # lowest priority, latest arrival
+        if -victim[0] >= priority:
+            return False
+        victim[2].set_exception(AdmissionRejected("evicted"))
+        self._set_queued(self._queued - 1)
+        return True
+
+
+@dataclass
+class AdmissionControlMiddleware:
+    """
+    Admission control of http requests, disabled unless `max_in_flight` > 0.
+
+    At most `max_in_flight` requests are handled at once, streams count until
+    their last chunk is sent. Up to `max_queue_size` others wait at most
+    `queue_timeout` seconds, the rest are answered 429 with a Retry-After.
+    The priority of a request comes from `path_priorities`, higher priorities
+    are admitted first. With `priority_header` set, e.g. "x-request-priority",
+    the header overrides it; clients can then jump the queue, so only set it
+    when the header is set or stripped by a trusted proxy.
+    """
+
+    app: "ASGIApp"
+    max_in_flight: int = field(
+        default_factory=lambda: _env_int("ADMISSION_MAX_IN_FLIGHT", 0)
+    )
+    max_queue_size: int = field(
+        default_factory=lambda: _env_int("ADMISSION_MAX_QUEUE_SIZE", 100)
+    )
+    queue_timeout: float = field(
+        default_factory=lambda: float(os.getenv("ADMISSION_QUEUE_TIMEOUT") or 10)
+    )
+    retry_after: int = field(
+        default_factory=lambda: _env_int("ADMISSION_RETRY_AFTER", 1)
+    )
+    priority_header: Optional[str] = field(
+        default_factory=lambda: os.getenv("ADMISSION_PRIORITY_HEADER") or None
+    )
+    path_priorities: Dict[str, int] = field(default_factory=_env_path_priorities)
+    exempt_paths: FrozenSet[str] = frozenset(
+        {"/healthz", "/metrics", "/readyz", "/livez"}
+    )
+    controller: Optional[AdmissionController] = None
+
+    def __post_init__(self) -> None:
+        if self.controller is None and self.max_in_flight > 0:
+            self.controller = AdmissionController(
+                self.max_in_flight, self.max_queue_size
+            )
+
+    def priority(self, scope: Scope) -> int:
+        if self.priority_header:
+            name = self.priority_header.encode("latin-1")
+            for key, value in scope.get("headers", ()):
+                if key.lower() == name:
+                    try:
+                        return int(value)
+                    except ValueError:
+                        break
+        return self.path_priorities.get(scope.get("path", ""), 0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        controller = self.controller
+        if (
+            controller is None
+            or scope["type"] != "http"
+            or scope.get("path") in self.exempt_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await controller.acquire(self.priority(scope), self.queue_timeout)
+        except AdmissionRejected as e:
+            ADMISSION_REJECTED.labels(e.reason).inc()
+            WARN(
+                "request rejected by admission control: %s, in flight %d, queued %d",
+                e.reason,
+                controller.in_flight,
+                controller.queued,
+            )
+            await self.reject(send)
+            return
+        ADMISSION_WAIT.observe(time.perf_counter() - start)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release()
+
+    async def reject(self, send: Send) -> None:
+        error = ServerOverloaded("bot").to_error()
+        body = JSONResponse({"detail": error.model_dump(exclude_none=True)}).body
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(self.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -13,23 +13,59 @@
 # limitations under the License.
 
 import asyncio
+import inspect
+import os
+import sys
+import time
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Dict, Generic, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import fastapi
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from starlette.responses import StreamingResponse
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from volcenginesdkarkruntime._exceptions import ArkAPIError
 
-from arkitect.core.client import Client, get_client_pool, load_request
+from arkitect.core.client import (
+    Client,
+    close_ark_clients,
+    get_client_pool,
+    get_request_loader,
+    load_request,
+)
 from arkitect.core.component.llm import ArkChatRequest
+from arkitect.core.component.tool import MCPRegistry
 from arkitect.core.errors import APIException, ArkError, InternalServiceError
-from arkitect.core.runtime import AsyncRunner, RequestType, ResponseType
+from arkitect.core.runtime import (
+    AsyncRunner,
+    ChunkCoalescer,
+    RequestType,
+    ResponseType,
+)
+from arkitect.telemetry.metrics import (
+    ACTIVE_STREAMS,
+    HTTP_REQUEST_DURATION,
+    generate_latest,
+)
+from arkitect.telemetry.trace import flush_tracing
 
+from .lifecycle import DrainingServer, Hook, Lifecycle
 from .middleware import (
+    AdmissionControlMiddleware,
     ListenDisconnectionMiddleware,
     LogIdMiddleware,
 )
@@ -47,6 +83,61 @@ def _default_healthcheck_config() -> str:
     return "/healthz"
 
 
+def _default_readiness_config() -> str:
+    return "/readyz"
+
+
+def _default_liveness_config() -> str:
+    return "/livez"
+
+
+def _to_http_exception(e: Exception) -> HTTPException:
+    if isinstance(e, APIException):
+        return HTTPException(
+            status_code=e.http_code,
+            detail=e.to_error().model_dump(exclude_unset=True, exclude_none=True),
+        )
+    if isinstance(e, ArkAPIError):
+        return HTTPException(
+            status_code=e.status_code if hasattr(e, "status_code") else 500,
+            detail=ArkError(
+                code=e.code, message=e.message, param=e.param, type=e.type
+            ).model_dump(exclude_unset=True, exclude_none=True),
+        )
+    err = InternalServiceError(str(e))
+    return HTTPException(
+        status_code=err.http_code,
+        detail=err.to_error().model_dump(exclude_none=True, exclude_unset=True),
+    )
+
+
+async def _observe_stream(
+    path: str, stream: AsyncIterable[Any], start: float
+) -> AsyncIterable[Any]:
+    ACTIVE_STREAMS.labels(path).inc()
+    try:
+        async for chunk in stream:
+            yield chunk
+    finally:
+        ACTIVE_STREAMS.labels(path).dec()
+        HTTP_REQUEST_DURATION.labels(path, 200).observe(time.perf_counter() - start)
+
+
+def _chain_lifespan(outer: Callable[[Any], Any], inner: Callable[[Any], Any]) -> Any:
+    """
+    Runs the `inner` lifespan of a given app within the `outer` one,
+    so its startup sees the started server and its shutdown runs first.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[Dict[str, Any]]:
+        async with outer(app) as state:
+            async with inner(app) as inner_state:
+                yield {**(state or {}), **(inner_state or {})}
+
+    return lifespan
+
+
 class BotServer(BaseModel, Generic[RequestType, ResponseType]):
     """BotServer in charge of the server router and runtime"""
 
@@ -61,8 +152,25 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
     """
     health_check_path: str = Field(default_factory=_default_healthcheck_config)
     """path for server health check"""
+    readiness_path: Optional[str] = Field(default_factory=_default_readiness_config)
+    """path answering 503 until started and once draining, None to disable"""
+    liveness_path: Optional[str] = Field(default_factory=_default_liveness_config)
+    """path answering 200 as long as the process serves requests, None to disable"""
+    lifecycle: Lifecycle = Field(default_factory=Lifecycle)
+    """readiness state, startup and shutdown hooks of the server"""
+    metrics_path: Optional[str] = None
+    """
+    path for prometheus metrics, None to disable.
+    Metrics are kept per process: with several workers each scrape
+    only sees the worker answering it, so only enable it with one worker.
+    """
+    chunk_coalescer: Optional[ChunkCoalescer] = None
+    """merges text deltas of streamed responses, None to send every chunk"""
     app: FastAPI
-    """server application"""
+    """
+    server application, the lifespan of a given app runs within
+    the startup and shutdown hooks of the server
+    """
 
     class Config:
         """Configuration for this pydantic object."""
@@ -76,17 +184,59 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
         clients: Optional[Dict[str, Tuple[Type[Client], Dict[str, Any]]]] = None,
         app: Optional[FastAPI] = None,
         health_check_path: Optional[str] = None,
+        mcp_registry: Optional[MCPRegistry] = None,
+        metrics_path: Optional[str] = None,
+        chunk_coalescer: Optional[ChunkCoalescer] = None,
+        startup_hooks: Optional[List[Hook]] = None,
+        shutdown_hooks: Optional[List[Hook]] = None,
         **kwargs: Any,
     ):
+        lifecycle = Lifecycle()
+        client_pool = get_client_pool(clients)
+
+        async def flush() -> None:
+            await asyncio.to_thread(flush_tracing)
+
+        # shutdown hooks run last registered first: user hooks, then mcp
+        # sessions, clients of the pool, Ark clients and the buffered spans
+        lifecycle.on_shutdown(flush)
+        lifecycle.on_shutdown(close_ark_clients)
+        lifecycle.on_shutdown(client_pool.close)
+        if mcp_registry is not None:
+            lifecycle.on_startup(mcp_registry.start)
+            lifecycle.on_shutdown(mcp_registry.close)
+        for hook in startup_hooks or []:
+            lifecycle.on_startup(hook)
+        for hook in shutdown_hooks or []:
+            lifecycle.on_shutdown(hook)
+
         @asynccontextmanager
         async def lifespan(app: FastAPI) -> AsyncIterator[Dict[str, Any]]:
-            yield {"client_pool": get_client_pool(clients)}
+            await lifecycle.startup()
+            try:
+                yield {
+                    "client_pool": client_pool,
+                    "mcp_registry": mcp_registry,
+                }
+            finally:
+                await lifecycle.shutdown()
+
+        if app is not None:
+            app.router.lifespan_context = _chain_lifespan(
+                lifespan, app.router.lifespan_context
+            )
+        else:
+            app = FastAPI(lifespan=lifespan)
+        app.state.lifecycle = lifecycle
 
         super().__init__(
             runner=runner,
             endpoint_config=endpoint_config or _default_endpoint_config(),
             health_check_path=health_check_path or _default_healthcheck_config(),
-            app=app or FastAPI(lifespan=lifespan),
+            metrics_path=metrics_path,
+            chunk_coalescer=chunk_coalescer,
+            lifecycle=lifecycle,
+            app=app,
             **kwargs,
         )
 
@@ -94,42 +244,60 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
         self.add_routes(self.app)
 
     async def handler(self, http_request: fastapi.Request) -> fastapi.Response:
+        path = http_request.url.path
+        start = time.perf_counter()
         try:
             request: RequestType = await load_request(
                 http_request=http_request,
-                req_cls=self.get_request_cls(http_request.url.path),
+                req_cls=self.get_request_cls(path),
             )
 
             if request.stream:
-                generator = self.runner.astream(request)
-                return StreamingResponse(generator, media_type="text/event-stream")
+                if self.chunk_coalescer is not None:
+                    generator = self.runner.astream(
+                        request, coalescer=self.chunk_coalescer
+                    )
+                else:
+                    generator = self.runner.astream(request)
+                return StreamingResponse(
+                    _observe_stream(path, generator, start),
+                    media_type="text/event-stream",
+                )
             else:
-                return await self.runner.arun(request)
+                response = await self.runner.arun(request)
+                HTTP_REQUEST_DURATION.labels(path, 200).observe(
+                    time.perf_counter() - start
+                )
+                return response
 
-        except APIException as e:
-            raise HTTPException(
-                status_code=e.http_code,
-                detail=e.to_error().model_dump(exclude_unset=True, exclude_none=True),
-            )
-        except ArkAPIError as e:
-            raise HTTPException(
-                status_code=e.status_code if hasattr(e, "status_code") else 500,
-                detail=ArkError(
-                    code=e.code, message=e.message, param=e.param, type=e.type
-                ).model_dump(exclude_unset=True, exclude_none=True),
-            )
         except Exception as e:
-            err = InternalServiceError(str(e))
-            raise HTTPException(
-                status_code=err.http_code,
-                detail=err.to_error().model_dump(exclude_none=True, exclude_unset=True),
+            error = _to_http_exception(e)
+            HTTP_REQUEST_DURATION.labels(path, error.status_code).observe(
+                time.perf_counter() - start
             )
+            raise error
 
     async def health_check(self) -> Any:
         return {}
 
+    async def readiness(self) -> fastapi.Response:
+        return JSONResponse(
+            {"status": self.lifecycle.state.value},
+            status_code=200 if self.lifecycle.ready else 503,
+        )
+
+    async def liveness(self) -> fastapi.Response:
+        return JSONResponse({"status": self.lifecycle.state.value})
+
+    async def metrics(self) -> fastapi.Response:
+        return PlainTextResponse(
+            generate_latest(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
     def add_routes(self, app: FastAPI) -> None:
         for endpoint_path, request_cls in self.endpoint_config.items():
+            # build the validator of the endpoint before the first request
+            get_request_loader(request_cls)
             app.add_api_route(
                 endpoint_path,
                 self.handler,
@@ -140,6 +308,16 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
             self.health_check,
             methods=["GET"],
         )
+        if self.metrics_path:
+            app.add_api_route(
+                self.metrics_path,
+                self.metrics,
+                methods=["GET"],
+            )
+        if self.readiness_path:
+            app.add_api_route(self.readiness_path, self.readiness, methods=["GET"])
+        if self.liveness_path:
+            app.add_api_route(self.liveness_path, self.liveness, methods=["GET"])
 
     def get_request_cls(self, api_path: str) -> Type[RequestType]:
         assert api_path in self.endpoint_config, ValueError(
@@ -150,6 +328,8 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
     @staticmethod
     def add_middlewares(app: FastAPI) -> None:
         app.add_middleware(ListenDisconnectionMiddleware)
+        # configured by the ADMISSION_* env, disabled by default
+        app.add_middleware(AdmissionControlMiddleware)
         app.add_middleware(LogIdMiddleware)
         app.add_middleware(
             CORSMiddleware,
@@ -165,6 +345,34 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
         host: str = "0.0.0.0",
         port: int = 8080,
         workers_num: int = 1,
+        grace_period: Optional[float] = None,
+        drain_delay: Optional[float] = None,
         **kwargs: Any,
     ) -> None:
-        uvicorn.run(app, host=host, port=port, workers=workers_num, **kwargs)
+        """
+        Args:
+            grace_period: seconds given to in-flight requests, streams included,
+                once the server stops. Defaults to env SHUTDOWN_GRACE_PERIOD or 30.
+            drain_delay: seconds between SIGTERM, when readiness starts failing,
+                and closing the listening socket. Defaults to env
+                SHUTDOWN_DRAIN_DELAY or 0. Only used with a single worker.
+        """
+        if grace_period is None:
+            grace_period = float(os.getenv("SHUTDOWN_GRACE_PERIOD") or 30)
+        if drain_delay is None:
+            drain_delay = float(os.getenv("SHUTDOWN_DRAIN_DELAY") or 0)
+        if "timeout_graceful_shutdown" in inspect.signature(uvicorn.Config).parameters:
+            kwargs.setdefault("timeout_graceful_shutdown", grace_period)
+        if isinstance(app, str) or workers_num > 1 or kwargs.get("reload"):
+            uvicorn.run(app, host=host, port=port, workers=workers_num, **kwargs)
+            return
+
+        config = uvicorn.Config(app, host=host, port=port, **kwargs)
+        server = DrainingServer(
+            config,
+            lifecycle=getattr(app.state, "lifecycle", None),
+            drain_delay=drain_delay,
+        )
+        server.run()
+        if not server.started:
+            sys.exit(3)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 from typing import Any, AsyncIterable, Dict, List, Literal, Optional, Union
 
 from volcenginesdkarkruntime import AsyncArk
@@ -27,6 +28,12 @@ from volcenginesdkarkruntime.types.chat.chat_completion_message import (
 )
 
 from arkitect.core.component.tool.tool_pool import ToolPool
+from arkitect.telemetry.metrics import (
+    observe_llm_stream,
+    record_llm_completion,
+    record_llm_error,
+)
+from arkitect.utils.stream import StreamAccumulator
 
 from .model import State
 
@@ -45,53 +52,49 @@ class _AsyncCompletions(AsyncCompletions):
         **kwargs: Dict[str, Any],
     ) -> Union[ChatCompletion, AsyncIterable[ChatCompletionChunk]]:
         parameters = (
-            self._state.parameters.__dict__
+            dict(self._state.parameters.__dict__)
             if self._state.parameters is not None
             else {}
         )
         if tool_pool:
-            tools = await tool_pool.list_tools()
-            parameters["tools"] = [t.model_dump() for t in tools]
-        resp = await super().create(
-            model=model,
-            messages=messages,
-            stream=stream,
-            **parameters,
-            **kwargs,
-        )
+            parameters["tools"] = await tool_pool.list_tool_params()
+        start = time.perf_counter()
+        try:
+            resp = await super().create(
+                model=model,
+                messages=messages,
+                stream=stream,
+                **parameters,
+                **kwargs,
+            )
+        except Exception:
+            record_llm_error(model, bool(stream), start)
+            raise
         if not stream:
+            record_llm_completion(model, resp, start)
             if resp.choices:
                 self._state.messages.append(resp.choices[0].message.model_dump())
             return resp
         else:
 
             async def iterator() -> AsyncIterable[ChatCompletionChunk]:
-                final_tool_calls = {}
+                accumulator = StreamAccumulator()
                 chat_completion_messages = ChatCompletionMessage(
                     role="assistant",
                     content="",
                     tool_calls=[],
                 )
                 self._state.messages.append(chat_completion_messages.__dict__)
-                async for chunk in resp:
-                    if len(chunk.choices) > 0:
-                        if chunk.choices[0].delta.content:
-                            chat_completion_messages.content += chunk.choices[
-                                0
-                            ].delta.content
-                        if chunk.choices[0].delta.tool_calls:
-                            for tool_call in chunk.choices[0].delta.tool_calls:
-                                index = tool_call.index
-                                if index not in final_tool_calls:
-                                    final_tool_calls[index] = tool_call
-                                else:
-                                    final_tool_calls[
-                                        index
-                                    ].function.arguments += tool_call.function.arguments
-                    yield chunk
-                chat_completion_messages.tool_calls = [
-                    v.model_dump() for v in final_tool_calls.values()
-                ]
+                try:
+                    async for chunk in observe_llm_stream(model, resp, start):
+                        accumulator.add(chunk)
+                        yield chunk
+                finally:
+                    # the message is filled once, also when the stream is closed early
+                    chat_completion_messages.content = accumulator.content
+                    chat_completion_messages.tool_calls = [
+                        v.model_dump() for v in accumulator.tool_calls
+                    ]
 
             return iterator()
 
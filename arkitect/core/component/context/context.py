@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import copy
 import json
 from typing import (
@@ -34,6 +35,11 @@ from volcenginesdkarkruntime.types.chat import (
 from volcenginesdkarkruntime.types.context import CreateContextResponse
 
 from arkitect.core.client import default_ark_client
+from arkitect.core.component.context.history import (
+    FullHistory,
+    HistoryMetrics,
+    HistoryStrategy,
+)
 from arkitect.core.component.context.hooks import (
     HookInterruptException,
     PostLLMCallHook,
@@ -47,6 +53,7 @@ from arkitect.telemetry.trace import task
 from arkitect.types.llm.model import (
     ArkChatParameters,
     ArkContextParameters,
+    FunctionCallMode,
 )
 
 from .chat_completion import _AsyncChat
@@ -66,6 +73,9 @@ class _AsyncCompletions:
             return False
         if self._ctx.tool_pool is None:
             return False
+        if self._ctx.function_call_mode == FunctionCallMode.PARALLEL:
+            await self.handle_tool_call_parallel(last_message.get("tool_calls"))
+            return True
         for tool_call in last_message.get("tool_calls"):
             tool_name = tool_call.get("function", {}).get("name")
 
@@ -80,14 +90,9 @@ class _AsyncCompletions:
                 tool_call_param = copy.deepcopy(tool_call)
                 parameters = tool_call_param.get("function", {}).get("arguments", "{}")
                 # tool execution
-                tool_resp = None
-                tool_exception = None
-                try:
-                    tool_resp = await self._ctx.tool_pool.execute_tool(
-                        tool_name=tool_name, parameters=json.loads(parameters)
-                    )
-                except Exception as e:
-                    tool_exception = e
+                tool_resp, tool_exception = await self.execute_tool(
+                    tool_name, parameters
+                )
 
                 self._ctx.state.messages.append(
                     {
@@ -109,6 +114,76 @@ class _AsyncCompletions:
                     )
         return True
 
+    async def handle_tool_call_parallel(self, tool_calls: List[Any]) -> None:
+        """
+        Runs all pre tool call hooks in order, executes the tool calls
+        concurrently, then appends the results and runs the post tool call
+        hooks in the original tool call order.
+        """
+        scheduled = []
+        for tool_call in tool_calls:
+            tool_name = tool_call.get("function", {}).get("name")
+            if not await self._ctx.tool_pool.contain(tool_name):  # type: ignore
+                continue
+            if self._ctx.pre_tool_call_hook:
+                self._ctx.state = await self._ctx.pre_tool_call_hook.pre_tool_call(
+                    tool_name,
+                    tool_call.get("function", {}).get("arguments", "{}"),
+                    self._ctx.state,
+                )
+            scheduled.append(copy.deepcopy(tool_call))
+
+        tasks = self.schedule_tool_calls(scheduled)
+        try:
+            for tool_call_param, tool_task in zip(scheduled, tasks):
+                tool_name = tool_call_param.get("function", {}).get("name")
+                parameters = tool_call_param.get("function", {}).get("arguments", "{}")
+                tool_resp, tool_exception = await tool_task
+                self._ctx.state.messages.append(
+                    {
+                        "role": "tool",
+                        "tool_call_id": tool_call_param.get("id", ""),
+                        "content": tool_resp if tool_resp else str(tool_exception),
+                    }
+                )
+                if self._ctx.post_tool_call_hook:
+                    self._ctx.state = (
+                        await self._ctx.post_tool_call_hook.post_tool_call(
+                            tool_name,
+                            parameters,
+                            tool_resp,
+                            tool_exception,
+                            self._ctx.state,
+                        )
+                    )
+        finally:
+            _cancel_pending(tasks)
+
+    def schedule_tool_calls(
+        self, tool_calls: List[Any]
+    ) -> List["asyncio.Task[tuple[Any | None, Exception | None]]"]:
+        """
+        Starts the given tool calls as tasks,
+        with at most `max_parallel_tool_calls` of them running at the same time.
+        """
+        semaphore = asyncio.Semaphore(self._ctx.max_parallel_tool_calls)
+
+        async def run(
+            tool_name: str, parameters: str
+        ) -> tuple[Any | None, Exception | None]:
+            async with semaphore:
+                return await self.execute_tool(tool_name, parameters)
+
+        return [
+            asyncio.create_task(
+                run(
+                    tool_call.get("function", {}).get("name"),
+                    tool_call.get("function", {}).get("arguments", "{}"),
+                )
+            )
+            for tool_call in tool_calls
+        ]
+
     @task()
     async def create(
         self,
@@ -140,7 +215,7 @@ class _AsyncCompletions:
                 resp = (
                     await self._ctx.chat.completions.create(
                         model=self.model,
-                        messages=self._ctx.state.messages,
+                        messages=await self._ctx.get_request_messages(),
                         stream=stream,
                         tool_pool=self._ctx.tool_pool,
                         **kwargs,
@@ -218,7 +293,7 @@ class _AsyncCompletions:
                     resp = (
                         await self._ctx.chat.completions.create(
                             model=self.model,
-                            messages=self._ctx.state.messages,
+                            messages=await self._ctx.get_request_messages(),
                             stream=stream,
                             tool_pool=self._ctx.tool_pool,
                             **kwargs,
@@ -276,8 +351,15 @@ class _AsyncCompletions:
     ) -> tuple[Any | None, Exception | None]:
         tool_resp, tool_exception = None, None
         try:
-            tool_resp = await self._ctx.tool_pool.execute_tool(  # type: ignore
-                tool_name=tool_name, parameters=json.loads(parameters)
+            tool_resp = await asyncio.wait_for(
+                self._ctx.tool_pool.execute_tool(  # type: ignore
+                    tool_name=tool_name, parameters=json.loads(parameters)
+                ),
+                timeout=self._ctx.tool_call_timeout,
+            )
+        except asyncio.TimeoutError:
+            tool_exception = TimeoutError(
+                f"Tool {tool_name} timed out after {self._ctx.tool_call_timeout}s"
             )
         except Exception as e:
             tool_exception = e
@@ -294,6 +376,9 @@ class _AsyncCompletions:
         return False
 
     def create_tool_call_stream(self) -> AsyncIterable[ToolChunk]:
+        if self._ctx.function_call_mode == FunctionCallMode.PARALLEL:
+            return self.create_parallel_tool_call_stream()
+
         async def tool_call_events() -> AsyncIterable[ToolChunk]:
             tool_calls = self._ctx.get_latest_message().get("tool_calls")  # type: ignore
             for tool_call in tool_calls:
@@ -340,6 +425,74 @@ class _AsyncCompletions:
 
         return tool_call_events()
 
+    def create_parallel_tool_call_stream(self) -> AsyncIterable[ToolChunk]:
+        async def tool_call_events() -> AsyncIterable[ToolChunk]:
+            tool_calls = self._ctx.get_latest_message().get("tool_calls")  # type: ignore
+            scheduled, original_arguments = [], []
+            for tool_call in tool_calls:
+                tool_name = tool_call.get("function", {}).get("name")
+                arguments = tool_call.get("function", {}).get("arguments", "{}")
+                if self._ctx.pre_tool_call_hook:
+                    self._ctx.state = await self._ctx.pre_tool_call_hook.pre_tool_call(
+                        tool_name,
+                        arguments,
+                        self._ctx.state,
+                    )
+                scheduled.append(copy.deepcopy(tool_call))
+                original_arguments.append(arguments)
+
+            tasks = self.schedule_tool_calls(scheduled)
+            try:
+                for tool_call in scheduled:
+                    yield ToolChunk(
+                        tool_call_id=tool_call.get("id", ""),
+                        tool_name=tool_call.get("function", {}).get("name"),
+                        tool_arguments=tool_call.get("function", {}).get(
+                            "arguments", "{}"
+                        ),
+                    )
+                for tool_call, arguments, tool_task in zip(
+                    scheduled, original_arguments, tasks
+                ):
+                    tool_name = tool_call.get("function", {}).get("name")
+                    resp, exceptions = await tool_task
+                    yield ToolChunk(
+                        tool_call_id=tool_call.get("id", ""),
+                        tool_name=tool_name,
+                        tool_arguments=tool_call.get("function", {}).get(
+                            "arguments", "{}"
+                        ),
+                        tool_exception=exceptions,
+                        tool_response=resp,
+                    )
+                    self._ctx.state.messages.append(
+                        {
+                            "role": "tool",
+                            "tool_call_id": tool_call.get("id", ""),
+                            "content": resp,
+                        }
+                    )
+                    if self._ctx.post_tool_call_hook:
+                        self._ctx.state = (
+                            await self._ctx.post_tool_call_hook.post_tool_call(
+                                name=tool_name,
+                                arguments=arguments,
+                                response=resp,
+                                exception=exceptions,
+                                state=self._ctx.state,
+                            )
+                        )
+            finally:
+                _cancel_pending(tasks)
+
+        return tool_call_events()
+
+
+def _cancel_pending(tasks: List[asyncio.Task]) -> None:
+    for t in tasks:
+        if not t.done():
+            t.cancel()
+
 
 class Context:
     def __init__(
@@ -351,7 +504,26 @@ class Context:
         parameters: Optional[ArkChatParameters] = None,
         context_parameters: Optional[ArkContextParameters] = None,
         client: Optional[AsyncArk] = None,
+        function_call_mode: FunctionCallMode = FunctionCallMode.SEQUENTIAL,
+        max_parallel_tool_calls: int = 8,
+        tool_call_timeout: Optional[float] = None,
+        history_strategy: Optional[HistoryStrategy] = None,
+        collect_history_metrics: bool = False,
     ):
+        """
+        Args:
+            function_call_mode: SEQUENTIAL runs tool calls one after another,
+                PARALLEL runs all tool calls of a round concurrently.
+                Pre/post tool call hooks are always called in tool call order.
+            max_parallel_tool_calls: max running tool calls in PARALLEL mode.
+            tool_call_timeout: timeout in seconds of each tool call,
+                a timed out tool call is reported as a tool exception.
+            history_strategy: decides which messages of the state are sent
+                to the model in each round, full history by default.
+                Not used when the server side context (context_id) is enabled.
+            collect_history_metrics: record messages and bytes sent per round
+                into `history_metrics`.
+        """
         self.client = default_ark_client() if client is None else client
         self.state = (
             state
@@ -368,6 +540,13 @@ class Context:
         if context_parameters is not None:
             self.context = _AsyncContext(client=self.client, state=self.state)
         self.tool_pool = build_tool_pool(tools)
+        self.function_call_mode = function_call_mode
+        self.max_parallel_tool_calls = max_parallel_tool_calls
+        self.tool_call_timeout = tool_call_timeout
+        self.history_strategy = history_strategy or FullHistory()
+        self.history_metrics: Optional[HistoryMetrics] = (
+            HistoryMetrics() if collect_history_metrics else None
+        )
         self.pre_tool_call_hook: PreToolCallHook | None = None
         self.post_tool_call_hook: PostToolCallHook | None = None
         self.pre_llm_call_hook: PreLLMCallHook | None = None
@@ -387,6 +566,12 @@ class Context:
             await self.tool_pool.refresh_tool_list()
         return
 
+    async def get_request_messages(self) -> List[ChatCompletionMessageParam]:
+        messages = await self.history_strategy.select(self.state.messages)
+        if self.history_metrics is not None:
+            self.history_metrics.record(messages)
+        return messages
+
     def get_latest_message(
         self, role: str = "assistant"
     ) -> Optional[ChatCompletionMessageParam]:
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 from typing import Any, AsyncIterable, Dict, List, Literal, Optional, Union
 
 from volcenginesdkarkruntime import AsyncArk
@@ -28,6 +29,13 @@ from volcenginesdkarkruntime.types.context import (
     ContextChatCompletionChunk,
 )
 
+from arkitect.telemetry.metrics import (
+    observe_llm_stream,
+    record_llm_completion,
+    record_llm_error,
+)
+from arkitect.utils.stream import StreamAccumulator
+
 from .model import State
 
 
@@ -48,33 +56,36 @@ class _AsyncCompletions(AsyncCompletions):
             if self._state.parameters is not None
             else {}
         )
-        resp = await super().create(
-            model=model,
-            context_id=self._state.context_id,
-            messages=messages,
-            stream=stream,
-            **parameters,
-            **kwargs,
-        )
+        start = time.perf_counter()
+        try:
+            resp = await super().create(
+                model=model,
+                context_id=self._state.context_id,
+                messages=messages,
+                stream=stream,
+                **parameters,
+                **kwargs,
+            )
+        except Exception:
+            record_llm_error(model, bool(stream), start)
+            raise
         if not stream:
+            record_llm_completion(model, resp, start)
             if resp.choices:
                 self._state.messages.append(resp.choices[0].message.__dict__)
             return resp
         else:
 
             async def iterator() -> AsyncIterable[ContextChatCompletionChunk]:
+                accumulator = StreamAccumulator()
+                async for chunk in observe_llm_stream(model, resp, start):
+                    accumulator.add(chunk)
+                    yield chunk
                 chat_completion_messages = ChatCompletionMessage(
                     role="assistant",
-                    content="",
+                    content=accumulator.content,
                     tool_calls=None,
                 )
-                async for chunk in resp:
-                    if len(chunk.choices) > 0:
-                        if chunk.choices[0].delta.content:
-                            chat_completion_messages.content += chunk.choices[
-                                0
-                            ].delta.content
-                    yield chunk
                 self._state.messages.append(chat_completion_messages.__dict__)
 
             return iterator()
@@ -0,0 +1,189 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import abc
+import json
+import math
+from typing import Any, Awaitable, Callable, List, Optional
+
+from pydantic import BaseModel, Field
+from volcenginesdkarkruntime.types.chat import ChatCompletionMessageParam
+
+from arkitect.telemetry.logger import DEBUG
+
+TokenEstimator = Callable[[ChatCompletionMessageParam], int]
+
+
+def estimate_tokens(message: ChatCompletionMessageParam) -> int:
+    """
+    Roughly estimates the token count of a message without a tokenizer:
+    ascii text counts 1 token per 4 chars, other chars (e.g. CJK) 1 token each.
+    """
+    content = message.get("content") or ""
+    if not isinstance(content, str):
+        content = json.dumps(content, ensure_ascii=False)
+    if message.get("tool_calls"):
+        content += json.dumps(message.get("tool_calls"), ensure_ascii=False)
+    ascii_chars = sum(1 for c in content if ord(c) < 128)
+    return 4 + math.ceil(ascii_chars / 4) + (len(content) - ascii_chars)
+
+
+class HistoryMetrics(BaseModel):
+    rounds: int = 0
+    messages_sent: List[int] = Field(default_factory=list)
+    """number of messages sent in each round"""
+    bytes_sent: List[int] = Field(default_factory=list)
+    """json size of messages sent in each round"""
+
+    def record(self, messages: List[ChatCompletionMessageParam]) -> None:
+        size = len(json.dumps(messages, ensure_ascii=False, default=str).encode())
+        self.rounds += 1
+        self.messages_sent.append(len(messages))
+        self.bytes_sent.append(size)
+        DEBUG(f"round {self.rounds} sends {len(messages)} messages, {size} bytes")
+
+
+class HistoryStrategy(abc.ABC):
+    """
+    Decides which part of State.messages is sent to the model in each round.
+    State.messages always keeps the full history.
+    """
+
+    @abc.abstractmethod
+    async def select(
+        self, messages: List[ChatCompletionMessageParam]
+    ) -> List[ChatCompletionMessageParam]:
+        pass
+
+
+class FullHistory(HistoryStrategy):
+    async def select(
+        self, messages: List[ChatCompletionMessageParam]
+    ) -> List[ChatCompletionMessageParam]:
+        return messages
+
+
+class SlidingWindowHistory(HistoryStrategy):
+    """
+    Keeps leading system messages and the last `max_messages` messages.
+    The window grows back to the assistant message holding the tool calls
+    of the tool messages it starts with.
+    """
+
+    def __init__(self, max_messages: int):
+        self.max_messages = max_messages
+
+    async def select(
+        self, messages: List[ChatCompletionMessageParam]
+    ) -> List[ChatCompletionMessageParam]:
+        system, rest = _split_system_messages(messages)
+        if len(rest) <= self.max_messages:
+            return messages
+        start = _tool_call_owner(rest, len(rest) - self.max_messages)
+        if start == 0:
+            return messages
+        return system + rest[start:]
+
+
+class TokenBudgetHistory(HistoryStrategy):
+    """
+    Keeps leading system messages and as many recent messages
+    as fit into `max_tokens` estimated by `token_estimator`.
+    Tool messages are never separated from the assistant message holding
+    their tool calls, even if that exceeds the budget.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        token_estimator: TokenEstimator = estimate_tokens,
+    ):
+        self.max_tokens = max_tokens
+        self.token_estimator = token_estimator
+
+    async def select(
+        self, messages: List[ChatCompletionMessageParam]
+    ) -> List[ChatCompletionMessageParam]:
+        system, rest = _split_system_messages(messages)
+        budget = self.max_tokens - sum(self.token_estimator(m) for m in system)
+        start = len(rest)
+        while start > 0:
+            cost = self.token_estimator(rest[start - 1])
+            # always keep the latest message
+            if cost > budget and start < len(rest):
+                break
+            budget -= cost
+            start -= 1
+        start = _tool_call_owner(rest, start)
+        if start == 0:
+            return messages
+        return system + rest[start:]
+
+
+class SummarizeHistory(HistoryStrategy):
+    """
+    Replaces older messages with a summary once there are more than
+    `max_messages` non-system messages, keeping the last `keep_last` ones.
+    The summary is reused until the window moves again.
+    """
+
+    def __init__(
+        self,
+        summarize: Callable[[List[ChatCompletionMessageParam]], Awaitable[str]],
+        max_messages: int,
+        keep_last: int,
+    ):
+        assert keep_last < max_messages, "keep_last should be less than max_messages"
+        self.summarize = summarize
+        self.max_messages = max_messages
+        self.keep_last = keep_last
+        self._summary: Optional[str] = None
+        self._summarized_count = 0
+
+    async def select(
+        self, messages: List[ChatCompletionMessageParam]
+    ) -> List[ChatCompletionMessageParam]:
+        system, rest = _split_system_messages(messages)
+        if len(rest) - self._summarized_count <= self.max_messages:
+            if self._summary is None:
+                return messages
+        else:
+            count = _tool_call_owner(rest, len(rest) - self.keep_last)
+            if count == 0:
+                return messages
+            self._summarized_count = count
+            self._summary = await self.summarize(rest[:count])
+        recent = rest[self._summarized_count :]
+        summary_message: Any = {
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{self._summary}",
+        }
+        return system + [summary_message] + recent
+
+
+def _split_system_messages(
+    messages: List[ChatCompletionMessageParam],
+) -> tuple[List[ChatCompletionMessageParam], List[ChatCompletionMessageParam]]:
+    index = 0
+    while index < len(messages) and messages[index].get("role") == "system":
+        index += 1
+    return messages[:index], messages[index:]
+
+
+def _tool_call_owner(messages: List[ChatCompletionMessageParam], start: int) -> int:
+    # tool messages must follow the assistant message holding their tool calls,
+    # move the start back to it instead of cutting them off
+    while 0 < start < len(messages) and messages[start].get("role") == "tool":
+        start -= 1
+    return start
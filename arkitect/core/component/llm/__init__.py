@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from arkitect.utils.stream import StreamAccumulator
+
 from ....types.llm.model import ArkChatCompletionChunk, ArkChatRequest, ArkChatResponse
 from .llm import BaseChatLanguageModel
 
@@ -20,4 +22,5 @@ __all__ = [
     "ArkChatRequest",
     "ArkChatResponse",
     "ArkChatCompletionChunk",
+    "StreamAccumulator",
 ]
@@ -12,9 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import copy
 import json
-from typing import Any, Optional, Union
+from typing import Any, Callable, List, Optional, Union
 
 from volcenginesdkarkruntime.types.chat import (
     ChatCompletion,
@@ -24,14 +25,17 @@ from volcenginesdkarkruntime.types.chat import (
 from arkitect.core.component.tool.tool_pool import ToolPool
 from arkitect.telemetry.logger import INFO, WARN
 from arkitect.telemetry.trace import task
-from arkitect.utils import dump_json_str
+from arkitect.utils import dump_json_str, gather
 
 from ....types.llm.model import (
+    ActionDetail,
     ArkChatCompletionChunk,
     ArkChatRequest,
     ArkChatResponse,
     ArkMessage,
+    BotUsage,
     FunctionCallMode,
+    ToolDetail,
 )
 from .utils import convert_response_message
 
@@ -44,6 +48,8 @@ async def handle_function_call(
     ],
     tool_pool: Optional[ToolPool] = None,
     function_call_mode: Optional[FunctionCallMode] = FunctionCallMode.SEQUENTIAL,
+    max_parallel_function_calls: int = 8,
+    on_function_result: Optional[Callable[[ArkMessage], Any]] = None,
     **kwargs: Any,
 ) -> bool:
     """
@@ -57,6 +63,12 @@ async def handle_function_call(
         response : The chat response to process.
         functions : A dictionary of available functions.
         function_call_mode : The mode for handling function calls.
+        max_parallel_function_calls : Max running function calls in parallel mode.
+        on_function_result : Called with each tool message as soon as its
+            function returns, i.e. in completion order.
+
+    Returns:
+        Whether the model should be requested again with the function results.
     """
     if response.choices[0].finish_reason != "tool_calls":
         return False
@@ -72,32 +84,102 @@ async def handle_function_call(
     if not tool_calls or not tool_pool:
         return False
 
-    if function_call_mode and function_call_mode != FunctionCallMode.SEQUENTIAL:
-        raise NotImplementedError("Only sequential function call mode is supported")
-
     request.messages.append(convert_response_message(response_message))
 
+    async def call(tool_call: Any) -> Optional[ArkMessage]:
+        message = await _call_function(tool_pool, tool_call)  # type: ignore
+        if message is not None and on_function_result is not None:
+            on_function_result(message)
+        return message
+
     function_calls = copy.deepcopy(tool_calls)
-    for tool_call in function_calls:
-        tool_name = tool_call.function.name
-        parameters = json.loads(tool_call.function.arguments)
-        if not await tool_pool.contain(tool_name=tool_name):
-            WARN(f"Function {tool_name} not found")
-        else:
-            resp = await tool_pool.execute_tool(
-                tool_name=tool_name,
-                parameters=parameters,
-            )
-            INFO(
-                f"Function {tool_name} called with parameters:"
-                + dump_json_str(parameters)
-                + f" and response: {resp}"
-            )
-            request.messages.append(
-                ArkMessage(
-                    role="tool",
-                    content=resp,
-                    tool_call_id=tool_call.id,
-                )
+    if function_call_mode == FunctionCallMode.PARALLEL:
+        semaphore = asyncio.Semaphore(max_parallel_function_calls)
+
+        async def call_with_limit(tool_call: Any) -> Optional[ArkMessage]:
+            async with semaphore:
+                return await call(tool_call)
+
+        tool_messages = await gather(
+            *[call_with_limit(tool_call) for tool_call in function_calls]
+        )
+    else:
+        tool_messages = [await call(tool_call) for tool_call in function_calls]
+
+    # results are appended in tool call order regardless of completion order
+    request.messages.extend([m for m in tool_messages if m is not None])
+    return function_call_mode != FunctionCallMode.ONCE
+
+
+async def _call_function(tool_pool: ToolPool, tool_call: Any) -> Optional[ArkMessage]:
+    tool_name = tool_call.function.name
+    parameters = json.loads(tool_call.function.arguments)
+    if not await tool_pool.contain(tool_name=tool_name):
+        WARN(f"Function {tool_name} not found")
+        return None
+    resp = await tool_pool.execute_tool(
+        tool_name=tool_name,
+        parameters=parameters,
+    )
+    INFO(
+        f"Function {tool_name} called with parameters:"
+        + dump_json_str(parameters)
+        + f" and response: {resp}"
+    )
+    return ArkMessage(
+        role="tool",
+        content=resp,
+        tool_call_id=tool_call.id,
+    )
+
+
+def convert_function_details(
+    tool_calls: Optional[List[Any]],
+    messages: List[ArkMessage],
+) -> List[ActionDetail]:
+    """
+    Converts the tool messages appended by `handle_function_call`
+    into action details with the input and output of each call.
+    """
+    tool_calls_by_id = {tool_call.id: tool_call for tool_call in (tool_calls or [])}
+    details = []
+    for message in messages:
+        if message.role != "tool" or message.tool_call_id not in tool_calls_by_id:
+            continue
+        function = tool_calls_by_id[message.tool_call_id].function
+        details.append(
+            ActionDetail(
+                name=function.name,
+                tool_details=[
+                    ToolDetail(
+                        name=function.name,
+                        input=function.arguments,
+                        output=message.content,
+                    )
+                ],
             )
-    return True
+        )
+    return details
+
+
+def convert_function_results(
+    response: ArkChatCompletionChunk,
+    messages: List[ArkMessage],
+) -> List[ArkChatCompletionChunk]:
+    """
+    Converts the tool messages appended by `handle_function_call`
+    into chunks carrying the tool details in bot usage.
+    """
+    return [
+        ArkChatCompletionChunk(
+            id=response.id,
+            choices=[],
+            created=response.created,
+            model=response.model,
+            object="chat.completion.chunk",
+            bot_usage=BotUsage(action_details=[detail]),
+        )
+        for detail in convert_function_details(
+            response.choices[0].delta.tool_calls, messages
+        )
+    ]
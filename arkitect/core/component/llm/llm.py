@@ -12,23 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import time
 from typing import Any, Callable, Dict, List, Optional, Union
 
 from langchain.prompts.chat import BaseChatPromptTemplate
 from langchain.schema.output_parser import BaseTransformOutputParser
-from volcenginesdkarkruntime import Ark, AsyncArk
+from volcenginesdkarkruntime import AsyncArk
 from volcenginesdkarkruntime._streaming import AsyncStream
 from volcenginesdkarkruntime.types.chat import (
     ChatCompletion,
     ChatCompletionChunk,
 )
 
+from arkitect.core.client import default_sync_ark_client
 from arkitect.core.component.tool.mcp_client import MCPClient
 from arkitect.core.component.tool.tool_pool import ToolPool, build_tool_pool
 
 # from arkitect.core.component.tool import BaseTool
+from arkitect.telemetry.logger import timeline_phase
+from arkitect.telemetry.metrics import (
+    observe_llm_stream,
+    record_llm_completion,
+    record_llm_error,
+)
 from arkitect.telemetry.trace import task
 from arkitect.utils.context import get_extra_headers
+from arkitect.utils.stream import StreamAccumulator
 
 from ....types.llm.model import (
     ArkChatCompletionChunk,
@@ -36,10 +46,15 @@ from ....types.llm.model import (
     ArkChatRequest,
     ArkChatResponse,
     ArkMessage,
+    BotUsage,
     FunctionCallMode,
 )
 from .base import BaseLanguageModel
-from .function_call import handle_function_call
+from .function_call import (
+    convert_function_details,
+    convert_function_results,
+    handle_function_call,
+)
 from .utils import format_ark_prompts
 
 
@@ -73,7 +88,8 @@ class BaseChatLanguageModel(BaseLanguageModel):
         if not self.template:
             return messages
 
-        return format_ark_prompts(self.template, messages, **kwargs)
+        with timeline_phase("prompt.render"):
+            return format_ark_prompts(self.template, messages, **kwargs)
 
     def get_request_model(self, **kwargs: Any) -> str:
         return self.model
@@ -106,11 +122,19 @@ class BaseChatLanguageModel(BaseLanguageModel):
 
         extra_headers = get_extra_headers(extra_headers)
 
-        return await self.client.chat.completions.create(
-            **params,
-            extra_headers=extra_headers,
-            extra_query=extra_query,
-        )
+        start = time.perf_counter()
+        try:
+            completion = await self.client.chat.completions.create(
+                **params,
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+            )
+        except Exception:
+            record_llm_error(request.model, bool(request.stream), start)
+            raise
+        if not request.stream:
+            record_llm_completion(request.model, completion, start)
+        return completion
 
     @task()
     def _run(
@@ -120,15 +144,23 @@ class BaseChatLanguageModel(BaseLanguageModel):
         extra_query: Optional[Dict[str, Any]] = None,
         extra_body: Optional[Dict[str, Any]] = None,
     ) -> Union[ChatCompletion, AsyncStream[ChatCompletionChunk]]:
-        sync_client = Ark()
+        sync_client = default_sync_ark_client()
 
         extra_headers = get_extra_headers(extra_headers)
 
-        return sync_client.chat.completions.create(
-            **request.get_chat_request(extra_body),
-            extra_headers=extra_headers,
-            extra_query=extra_query,
-        )
+        start = time.perf_counter()
+        try:
+            completion = sync_client.chat.completions.create(
+                **request.get_chat_request(extra_body),
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+            )
+        except Exception:
+            record_llm_error(request.model, bool(request.stream), start)
+            raise
+        if not request.stream:
+            record_llm_completion(request.model, completion, start)
+        return completion
 
     def run(
         self,
@@ -189,11 +221,16 @@ class BaseChatLanguageModel(BaseLanguageModel):
         *,
         functions: list[MCPClient | Callable] | ToolPool | None = None,
         function_call_mode: Optional[FunctionCallMode] = FunctionCallMode.SEQUENTIAL,
+        max_parallel_function_calls: int = 8,
         additional_system_prompts: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> ArkChatResponse:
         """
         Asynchronously runs a chat request and returns the response.
+
+        With `FunctionCallMode.ONCE` the model is not requested again after
+        the function calls; their results are returned as tool details
+        in `bot_usage`.
         """
         parameters: Dict[str, Any] = (
             self.parameters.model_dump(exclude_none=True, exclude_unset=True)
@@ -217,6 +254,7 @@ class BaseChatLanguageModel(BaseLanguageModel):
             **parameters,
         )
         responses = []
+        function_results: List[ArkMessage] = []
         while True:
             completion: ChatCompletion = await self._arun(
                 request, extra_headers, extra_query, extra_body
@@ -225,11 +263,26 @@ class BaseChatLanguageModel(BaseLanguageModel):
 
             if completion.choices and completion.choices[0].finish_reason:
                 if not await handle_function_call(
-                    request, completion, tool_pool, function_call_mode
+                    request,
+                    completion,
+                    tool_pool,
+                    function_call_mode,
+                    max_parallel_function_calls,
+                    on_function_result=function_results.append,
                 ):
                     break
-
-        return ArkChatResponse.merge(responses)
+                function_results.clear()
+
+        response = ArkChatResponse.merge(responses)
+        # FunctionCallMode.ONCE stops after calling the functions,
+        # so their results are returned in bot usage
+        if function_results:
+            response.bot_usage = BotUsage(
+                action_details=convert_function_details(
+                    completion.choices[0].message.tool_calls, function_results
+                )
+            )
+        return response
 
     async def astream(
         self,
@@ -239,11 +292,20 @@ class BaseChatLanguageModel(BaseLanguageModel):
         *,
         functions: list[MCPClient | Callable] | ToolPool | None = None,
         function_call_mode: Optional[FunctionCallMode] = FunctionCallMode.SEQUENTIAL,
+        max_parallel_function_calls: int = 8,
+        stream_function_results: bool = False,
         additional_system_prompts: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> AsyncStream[ArkChatCompletionChunk]:
         """
         Asynchronously streams chat completions from the language model.
+
+        If `stream_function_results` is set, each function result is yielded
+        as a chunk with its tool detail in `bot_usage` as soon as its call
+        returns, so in completion order with parallel function calls.
+        The messages sent back to the model keep the tool call order.
+        With `FunctionCallMode.ONCE` the function results are always yielded,
+        as the model is not requested again with them.
         """
 
         parameters: Dict[str, Any] = (
@@ -270,42 +332,58 @@ class BaseChatLanguageModel(BaseLanguageModel):
 
         usage_chunks = []
         while True:
+            start = time.perf_counter()
             completion = await self._arun(
                 request, extra_headers, extra_query, extra_body
             )
             # default: one iter
             is_more_request = False
-            final_tool_calls = {}
-            cumulated = []
-            async for resp in completion:  # type: ChatCompletionChunk
+            accumulator = StreamAccumulator()
+            async for resp in observe_llm_stream(request.model, completion, start):
                 if resp.usage:
                     usage_chunks.append(resp)
                     continue
                 if not resp.choices:
                     continue
-                # cumulated chunks is used for calculator/fc inner cot output
-                cumulated.append(resp)
-                if resp.choices[0].delta.tool_calls:
-                    for tool_call in resp.choices[0].delta.tool_calls:
-                        index = tool_call.index
-                        if index not in final_tool_calls:
-                            final_tool_calls[index] = tool_call
-                        else:
-                            final_tool_calls[
-                                index
-                            ].function.arguments += tool_call.function.arguments
-                else:
+                # accumulated chunks are used for calculator/fc inner cot output
+                accumulator.add(resp)
+                if not resp.choices[0].delta.tool_calls:
                     # hide tool_calls info from response
                     if resp.choices[0].finish_reason != "tool_calls":
                         yield ArkChatCompletionChunk(**resp.__dict__)
                 if resp.choices[0].finish_reason == "tool_calls":
-                    ark_resp = ArkChatCompletionChunk.merge(cumulated)
-                    ark_resp.choices[0].delta.tool_calls = list(  # type: ignore
-                        final_tool_calls.values()
-                    )
-                    is_more_request = await handle_function_call(
-                        request, ark_resp, tool_pool, function_call_mode
+                    ark_resp = accumulator.to_chunk(ArkChatCompletionChunk)
+                    if (
+                        not stream_function_results
+                        and function_call_mode != FunctionCallMode.ONCE
+                    ):
+                        is_more_request = await handle_function_call(
+                            request,
+                            ark_resp,
+                            tool_pool,
+                            function_call_mode,
+                            max_parallel_function_calls,
+                        )
+                        continue
+                    results: "asyncio.Queue[Optional[ArkMessage]]" = asyncio.Queue()
+                    call = asyncio.ensure_future(
+                        handle_function_call(
+                            request,
+                            ark_resp,
+                            tool_pool,
+                            function_call_mode,
+                            max_parallel_function_calls,
+                            on_function_result=results.put_nowait,
+                        )
                     )
+                    call.add_done_callback(lambda _: results.put_nowait(None))
+                    try:
+                        while (message := await results.get()) is not None:
+                            for chunk in convert_function_results(ark_resp, [message]):
+                                yield chunk
+                        is_more_request = await call
+                    finally:
+                        call.cancel()
 
             if not is_more_request:
                 break
@@ -15,16 +15,21 @@
 from .builder import build_mcp_clients_from_config
 from .builtin_tools import calculator, link_reader
 from .mcp_client import MCPClient
+from .mcp_client_pool import MCPClientPool
 from .mcp_server import ArkFastMCP
+from .registry import MCPRegistry, get_mcp_registry
 from .tool_pool import ToolPool, build_tool_pool
 from .builtin_tools import link_reader, calculator
 
 __all__ = [
     "MCPClient",
+    "MCPClientPool",
     "ToolPool",
     "build_tool_pool",
     "build_mcp_clients_from_config",
     "ArkFastMCP",
+    "MCPRegistry",
+    "get_mcp_registry",
     "link_reader",
     "calculator",
 ]
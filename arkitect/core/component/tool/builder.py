@@ -24,13 +24,12 @@ import anyio
 from anyio.abc import Process
 
 from arkitect.core.component.tool.mcp_client import MCPClient
+from arkitect.core.component.tool.mcp_client_pool import MCPClientPool
 from mcp.client.stdio import get_default_environment
 
 
-def build_mcp_clients_from_config(  # type: ignore
-    config_file: str,
-    **kwargs,
-) -> tuple[dict[str, MCPClient], Callable]:
+def load_mcp_servers_config(config_file: str) -> dict:
+    """Reads the mcpServers section of a config file."""
     # https://www.librechat.ai/docs/configuration/librechat_yaml/object_structure/mcp_servers#servername
     # check file exist
     if not os.path.exists(config_file):
@@ -38,9 +37,39 @@ def build_mcp_clients_from_config(  # type: ignore
 
     with open(config_file, "r") as f:
         config = json.loads(f.read())
-    mcp_servers_config = config.get("mcpServers", {})
+    return config.get("mcpServers", {})
+
+
+def build_mcp_clients_from_config(  # type: ignore
+    config_file: str,
+    pool_size: int | None = None,
+    **kwargs,
+) -> tuple[dict[str, MCPClient], Callable]:
+    """
+    Builds MCP clients from a mcpServers config file.
+    With `pool_size` set, each server gets a MCPClientPool of that many
+    health checked sessions instead of a single MCPClient.
+    """
+    return build_mcp_clients(
+        load_mcp_servers_config(config_file), pool_size=pool_size, **kwargs
+    )
+
+
+def build_mcp_clients(  # type: ignore
+    mcp_servers_config: dict,
+    pool_size: int | None = None,
+    **kwargs,
+) -> tuple[dict[str, MCPClient], Callable]:
+    """
+    Builds MCP clients from the mcpServers section of a config,
+    see build_mcp_clients_from_config.
+    """
     mcp_clients = {}
     exit_stack = AsyncExitStack()
+    client_cls = MCPClient
+    if pool_size is not None:
+        client_cls = MCPClientPool
+        kwargs["pool_size"] = pool_size
     for server_name in mcp_servers_config:
         command = mcp_servers_config[server_name].get("command", None)
         args = mcp_servers_config[server_name].get("args", None)
@@ -51,7 +80,7 @@ def build_mcp_clients_from_config(  # type: ignore
         transport = mcp_servers_config[server_name].get("type", None)
         if port is not None:
             logger.info("Starting local SSE MCP server")
-            client = MCPClient(
+            client = client_cls(
                 name=server_name,
                 server_url=f"http://localhost:{port}/sse",
                 exit_stack=exit_stack,
@@ -59,7 +88,7 @@ def build_mcp_clients_from_config(  # type: ignore
             )
         else:
             logger.info("Starting server")
-            client = MCPClient(
+            client = client_cls(
                 name=server_name,
                 server_url=server_url,
                 exit_stack=exit_stack,
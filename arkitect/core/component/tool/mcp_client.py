@@ -14,18 +14,23 @@
 
 import asyncio
 import datetime
+import inspect
 from datetime import timedelta
 import logging
+import time
+import weakref
 from contextlib import AsyncExitStack
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
+from opentelemetry import trace
 from volcenginesdkarkruntime.types.chat import ChatCompletionContentPartParam
 
 from arkitect.core.component.tool.utils import (
     convert_to_chat_completion_content_part_param,
     mcp_to_chat_completion_tool,
 )
-from arkitect.telemetry.trace import task
+from arkitect.telemetry.metrics import observe_tool_call
+from arkitect.telemetry.trace import inject_trace_context, task
 from arkitect.types.llm.model import ChatCompletionTool
 from mcp import (
     ClientSession,
@@ -36,6 +41,17 @@ from mcp import (
 from mcp.client.sse import sse_client
 from mcp.client.stdio import get_default_environment
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import (
+    CallToolRequest,
+    CallToolRequestParams,
+    CallToolResult,
+    ClientRequest,
+    CancelledNotification,
+    CancelledNotificationParams,
+    ClientNotification,
+    ServerNotification,
+    ToolListChangedNotification,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -54,7 +70,19 @@ class MCPClient:
         sse_read_timeout: float = 60 * 5,
         exit_stack: AsyncExitStack | None = None,
         transport: str | None = None,
+        max_concurrent_calls: int = 1,
+        call_timeout: float | None = None,
+        notify_cancellation: bool = False,
     ) -> None:
+        """
+        Args:
+            max_concurrent_calls: max in-flight tool calls on the session,
+                1 means tool calls are sent one by one.
+            call_timeout: timeout in seconds of each tool call.
+            notify_cancellation: send `notifications/cancelled` to the server
+                when a tool call times out or is cancelled. Off by default as
+                some server versions crash on cancelled requests.
+        """
         self.command = command
         self.arguments = arguments
         self.server_url = server_url
@@ -63,6 +91,9 @@ class MCPClient:
         self.timeout: float = timeout
         self.sse_read_timeout = sse_read_timeout
         self.transport = transport
+        self.max_concurrent_calls = max_concurrent_calls
+        self.call_timeout = call_timeout
+        self.notify_cancellation = notify_cancellation
 
         # Initialize session and client objects
         self.session: ClientSession = None  # type: ignore
@@ -71,6 +102,11 @@ class MCPClient:
         self._mcp_server_name: str = name if name is not None else ""
         self._chat_completion_tools: dict[str, ChatCompletionTool] = {}
         self._lock = asyncio.Lock()
+        self._call_semaphore = asyncio.Semaphore(max_concurrent_calls)
+        self._tools_outdated = False
+        self._tool_list_changed_callbacks: list[
+            Callable[[], Callable[[], None] | None]
+        ] = []
 
     async def connect_to_server(
         self,
@@ -121,6 +157,7 @@ class MCPClient:
                 stdio_read,
                 stdio_write,
                 read_timeout_seconds=datetime.timedelta(seconds=self.timeout),
+                message_handler=self._handle_message,
             )
         )
 
@@ -139,7 +176,7 @@ class MCPClient:
         )
 
         self.session = await self.exit_stack.enter_async_context(
-            ClientSession(*streams)
+            ClientSession(*streams, message_handler=self._handle_message)
         )
 
     async def _connect_to_streamablehttp_server(
@@ -158,7 +195,7 @@ class MCPClient:
         read, write, _ = streams
 
         self.session = await self.exit_stack.enter_async_context(
-            ClientSession(read, write)
+            ClientSession(read, write, message_handler=self._handle_message)
         )
 
     async def _init(self) -> None:
@@ -180,6 +217,43 @@ class MCPClient:
             self.name if self.name != "" else init_result.serverInfo.name
         )
 
+    def add_tool_list_changed_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callback called when the server tool list changed.
+        Bound methods are held weakly, so short-lived tool pools can
+        share a long-lived client.
+        """
+        ref: Callable[[], Callable[[], None] | None]
+        if inspect.ismethod(callback):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback  # noqa: E731
+        self._tool_list_changed_callbacks = [
+            r for r in self._tool_list_changed_callbacks if r() is not None
+        ] + [ref]
+
+    def _notify_tool_list_changed(self) -> None:
+        for ref in list(self._tool_list_changed_callbacks):
+            callback = ref()
+            if callback is not None:
+                callback()
+
+    async def _handle_message(self, message: Any) -> None:
+        if isinstance(message, ServerNotification) and isinstance(
+            message.root, ToolListChangedNotification
+        ):
+            logger.info("Tool list of %s changed", self.name)
+            self._tools_outdated = True
+            self._notify_tool_list_changed()
+
+    async def _refresh_tools(self) -> None:
+        response = await self.session.list_tools()
+        self.tools = {t.name: t for t in response.tools}
+        self._chat_completion_tools = {
+            t.name: mcp_to_chat_completion_tool(t) for t in response.tools
+        }
+        self._tools_outdated = False
+
     async def cleanup(self) -> None:
         """Clean up resources"""
         try:
@@ -199,9 +273,8 @@ class MCPClient:
                     "MCP client is not connected to server yet. Connecting..."
                 )
                 await self.connect_to_server()
-            if not use_cache:
-                response = await self.session.list_tools()
-                self.tools = {t.name: t for t in response.tools}
+            if not use_cache or self._tools_outdated:
+                await self._refresh_tools()
             return list(self.tools.values())
 
     @task()
@@ -212,12 +285,8 @@ class MCPClient:
                     "MCP client is not connected to server yet. Connecting..."
                 )
                 await self.connect_to_server()
-            if not use_cache:
-                response = await self.session.list_tools()
-                self.tools = {t.name: t for t in response.tools}
-                self._chat_completion_tools = {
-                    t.name: mcp_to_chat_completion_tool(t) for t in response.tools
-                }
+            if not use_cache or self._tools_outdated:
+                await self._refresh_tools()
             return list(self._chat_completion_tools.values())
 
     @property
@@ -230,14 +299,68 @@ class MCPClient:
         tool_name: str,
         parameters: dict[str, Any],
     ) -> str | list[ChatCompletionContentPartParam]:
-        async with self._lock:
+        with observe_tool_call(self.name, tool_name):
             if self.session is None:
-                logger.warning(
-                    "MCP client is not connected to server yet. Connecting..."
+                async with self._lock:
+                    if self.session is None:
+                        logger.warning(
+                            "MCP client is not connected to server yet. Connecting..."
+                        )
+                        await self.connect_to_server()
+            queued_at = time.perf_counter()
+            async with self._call_semaphore:
+                trace.get_current_span().set_attribute(
+                    "mcp.queue_ms", (time.perf_counter() - queued_at) * 1000
                 )
-                await self.connect_to_server()
-            result = await self.session.call_tool(tool_name, parameters)
-            return convert_to_chat_completion_content_part_param(result)
+                result = await asyncio.wait_for(
+                    self._call_tool(tool_name, parameters), timeout=self.call_timeout
+                )
+        return convert_to_chat_completion_content_part_param(result)
+
+    async def _call_tool(
+        self, tool_name: str, parameters: dict[str, Any]
+    ) -> CallToolResult:
+        # id the session assigns to the next request, read right before
+        # `send_request` without any await in between. mcp has no public
+        # way to get it; test_cancellation_notification checks it against
+        # the id received by the server, without it no notification is sent
+        request_id = getattr(self.session, "_request_id", None)
+        if not isinstance(request_id, int):
+            request_id = None
+        # the server continues the trace from the traceparent in `_meta`,
+        # not from connection headers, which are shared across requests
+        meta = inject_trace_context()
+        request = CallToolRequest(
+            method="tools/call",
+            params=CallToolRequestParams(
+                name=tool_name,
+                arguments=parameters,
+                _meta=CallToolRequestParams.Meta(**meta) if meta else None,
+            ),
+        )
+        try:
+            return await self.session.send_request(
+                ClientRequest(request), CallToolResult
+            )
+        except asyncio.CancelledError:
+            if self.notify_cancellation and request_id is not None:
+                await asyncio.shield(self._send_cancel_notification(request_id))
+            raise
+
+    async def _send_cancel_notification(self, request_id: int) -> None:
+        try:
+            await self.session.send_notification(
+                ClientNotification(
+                    CancelledNotification(
+                        method="notifications/cancelled",
+                        params=CancelledNotificationParams(
+                            requestId=request_id, reason="cancelled by client"
+                        ),
+                    )
+                )
+            )
+        except Exception as e:
+            logger.warning("Failed to cancel request %s: %s", request_id, e)
 
     @task()
     async def get_tool(self, tool_name: str, use_cache: bool = True) -> Tool | None:
@@ -247,7 +370,6 @@ class MCPClient:
                     "MCP client is not connected to server yet. Connecting..."
                 )
                 await self.connect_to_server()
-            if not use_cache:
-                response = await self.session.list_tools()
-                self.tools = {t.name: t for t in response.tools}
+            if not use_cache or self._tools_outdated:
+                await self._refresh_tools()
             return self.tools.get(tool_name, None)
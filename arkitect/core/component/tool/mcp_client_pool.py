@@ -0,0 +1,259 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from typing import Any
+
+import anyio
+from volcenginesdkarkruntime.types.chat import ChatCompletionContentPartParam
+
+from arkitect.core.component.tool.mcp_client import MCPClient
+from arkitect.types.llm.model import ChatCompletionTool
+from mcp import Tool
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.client: MCPClient | None = None
+        self.in_flight = 0
+        self.ready = asyncio.Event()
+        # set to make the slot task check the session right away
+        self.wake = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+
+class MCPClientPool(MCPClient):
+    """
+    A drop-in MCPClient keeping `pool_size` sessions to the same MCP server.
+
+    Each session is owned by a background task which pings it every
+    `health_check_interval` seconds and reconnects it with exponential backoff
+    once it fails. Tool calls go to the healthy session with the fewest
+    in-flight calls. Closing the pool waits up to `drain_timeout` seconds for
+    in-flight calls before the sessions are closed.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        pool_size: int = 2,
+        health_check_interval: float = 30,
+        health_check_timeout: float = 5,
+        reconnect_backoff: float = 0.5,
+        max_reconnect_backoff: float = 30,
+        drain_timeout: float = 10,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        assert pool_size > 0, "pool_size should be positive"
+        self.pool_size = pool_size
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.reconnect_backoff = reconnect_backoff
+        self.max_reconnect_backoff = max_reconnect_backoff
+        self.drain_timeout = drain_timeout
+
+        self._slots: list[_Slot] = []
+        self._closing = False
+        # sessions are closed by their own tasks, the exit stack only stops them
+        self.exit_stack.push_async_callback(self._close)
+
+    async def connect_to_server(self) -> None:
+        async with self._lock:
+            if self._closing:
+                raise ConnectionError(f"MCP client pool {self.name} is closed")
+            if not self._slots:
+                self._slots = [_Slot(i) for i in range(self.pool_size)]
+                for slot in self._slots:
+                    slot.task = asyncio.create_task(self._run_slot(slot))
+        await self._acquire()
+
+    async def list_mcp_tools(self, use_cache: bool = True) -> list[Tool]:
+        slot = await self._acquire()
+        return await slot.client.list_mcp_tools(use_cache)  # type: ignore
+
+    async def list_tools(self, use_cache: bool = True) -> list[ChatCompletionTool]:
+        slot = await self._acquire()
+        return await slot.client.list_tools(use_cache)  # type: ignore
+
+    async def get_tool(self, tool_name: str, use_cache: bool = True) -> Tool | None:
+        slot = await self._acquire()
+        return await slot.client.get_tool(tool_name, use_cache)  # type: ignore
+
+    async def execute_tool(
+        self,
+        tool_name: str,
+        parameters: dict[str, Any],
+    ) -> str | list[ChatCompletionContentPartParam]:
+        for attempt in range(2):
+            slot = await self._acquire()
+            client: MCPClient = slot.client  # type: ignore
+            slot.in_flight += 1
+            try:
+                return await client.execute_tool(tool_name, parameters)
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                # the request was never sent, safe to retry on another session
+                self._mark_unhealthy(slot, client)
+                if attempt > 0:
+                    raise
+            except McpError as e:
+                if e.error.code == CONNECTION_CLOSED:
+                    self._mark_unhealthy(slot, client)
+                raise
+            finally:
+                slot.in_flight -= 1
+        raise AssertionError("unreachable")
+
+    async def _acquire(self) -> _Slot:
+        if self._closing:
+            raise ConnectionError(f"MCP client pool {self.name} is closed")
+        if not self._slots:
+            await self.connect_to_server()
+        ready = [s for s in self._slots if s.ready.is_set()]
+        if not ready:
+            waiters = [asyncio.create_task(s.ready.wait()) for s in self._slots]
+            try:
+                await asyncio.wait(
+                    waiters, timeout=self.timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                for waiter in waiters:
+                    waiter.cancel()
+            ready = [s for s in self._slots if s.ready.is_set()]
+            if not ready:
+                raise ConnectionError(
+                    f"No healthy session to MCP server {self.name} "
+                    f"after {self.timeout}s"
+                )
+        return min(ready, key=lambda s: s.in_flight)
+
+    def _mark_unhealthy(self, slot: _Slot, client: MCPClient) -> None:
+        if slot.client is client:
+            slot.ready.clear()
+            slot.wake.set()
+
+    def _new_client(self) -> MCPClient:
+        client = MCPClient(
+            name=self._mcp_server_name or None,
+            command=self.command,
+            arguments=self.arguments,
+            server_url=self.server_url,
+            env=self.env,
+            headers=self.headers,
+            timeout=self.timeout,
+            sse_read_timeout=self.sse_read_timeout,
+            transport=self.transport,
+            max_concurrent_calls=self.max_concurrent_calls,
+            call_timeout=self.call_timeout,
+            notify_cancellation=self.notify_cancellation,
+        )
+        client.add_tool_list_changed_callback(self._notify_tool_list_changed)
+        return client
+
+    async def _run_slot(self, slot: _Slot) -> None:
+        backoff = self.reconnect_backoff
+        reconnecting = False
+        while not self._closing:
+            client = self._new_client()
+            try:
+                await client.connect_to_server()
+            except Exception as e:
+                logger.warning(
+                    "Session %s to MCP server %s failed to connect, "
+                    "retrying in %.1fs: %s",
+                    slot.index,
+                    self.name,
+                    backoff,
+                    e,
+                )
+                await self._close_client(client)
+                await self._wait(slot, backoff)
+                backoff = min(backoff * 2, self.max_reconnect_backoff)
+                continue
+
+            backoff = self.reconnect_backoff
+            if not self._mcp_server_name:
+                self._mcp_server_name = client.name
+            slot.client = client
+            slot.wake.clear()
+            slot.ready.set()
+            if reconnecting:
+                logger.info("Session %s to %s reconnected", slot.index, self.name)
+                # the server may have restarted with other tools
+                self._notify_tool_list_changed()
+            reconnecting = True
+
+            await self._watch(slot, client)
+            slot.ready.clear()
+            if self._closing:
+                await self._drain(slot)
+            await self._close_client(client)
+
+    async def _watch(self, slot: _Slot, client: MCPClient) -> None:
+        while not self._closing:
+            if await self._wait(slot, self.health_check_interval):
+                return
+            try:
+                await asyncio.wait_for(
+                    client.session.send_ping(), timeout=self.health_check_timeout
+                )
+            except Exception as e:
+                logger.warning(
+                    "Health check of session %s to %s failed: %r",
+                    slot.index,
+                    self.name,
+                    e,
+                )
+                return
+
+    async def _wait(self, slot: _Slot, seconds: float) -> bool:
+        """Sleeps up to `seconds`, returns True if woken up earlier"""
+        try:
+            await asyncio.wait_for(slot.wake.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _drain(self, slot: _Slot) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.drain_timeout
+        while slot.in_flight > 0 and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        if slot.in_flight > 0:
+            logger.warning(
+                "Closing session %s to %s with %s calls in flight",
+                slot.index,
+                self.name,
+                slot.in_flight,
+            )
+
+    async def _close_client(self, client: MCPClient) -> None:
+        try:
+            await client.cleanup()
+        except Exception as e:
+            logger.warning("Error while closing session to %s: %r", self.name, e)
+
+    async def _close(self) -> None:
+        self._closing = True
+        for slot in self._slots:
+            slot.wake.set()
+        tasks = [s.task for s in self._slots if s.task is not None]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
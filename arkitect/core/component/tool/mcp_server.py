@@ -12,10 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Literal, Sequence
+from contextlib import contextmanager
+from typing import Any, Iterator, Literal, Sequence
 
-from arkitect.telemetry.trace import setup_tracing, task
-from mcp.server.fastmcp import FastMCP
+from arkitect.telemetry.trace import continue_trace, setup_tracing, task
+from mcp.server.fastmcp import Context, FastMCP
 from mcp.types import (
     EmbeddedResource,
     ImageContent,
@@ -26,6 +27,26 @@ from mcp.types import (
 )
 
 
+@contextmanager
+def continue_mcp_trace(ctx: Context) -> Iterator[None]:
+    """
+    Continues the trace of the client calling the tool,
+    for tools of plain `FastMCP` servers taking a `Context` argument:
+
+        @mcp.tool()
+        async def search(query: str, ctx: Context) -> str:
+            with continue_mcp_trace(ctx):
+                ...
+    """
+    try:
+        meta = ctx.request_context.meta
+    except ValueError:
+        # not called within a request
+        meta = None
+    with continue_trace(meta.model_dump() if meta is not None else None):
+        yield
+
+
 class ArkFastMCP(FastMCP):
     def __init__(self, *args, **kwargs):  # type: ignore
         super().__init__(*args, **kwargs)
@@ -43,6 +64,16 @@ class ArkFastMCP(FastMCP):
     async def list_tools(self) -> list[MCPTool]:
         return await super().list_tools()
 
+    def _setup_handlers(self) -> None:
+        super()._setup_handlers()
+        self._mcp_server.call_tool()(self._call_tool_in_client_trace)
+
+    async def _call_tool_in_client_trace(
+        self, name: str, arguments: dict[str, Any]
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        with continue_mcp_trace(self.get_context()):
+            return await self.call_tool(name, arguments)
+
     @task()
     async def call_tool(
         self, name: str, arguments: dict[str, Any]
@@ -0,0 +1,120 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from arkitect.core.component.tool.builder import (
+    build_mcp_clients,
+    load_mcp_servers_config,
+)
+from arkitect.core.component.tool.mcp_client import MCPClient
+from arkitect.utils.common import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+class MCPRegistry(Singleton):
+    """
+    Application scoped MCP clients, connected once at server startup
+    and shared by all requests.
+    """
+
+    def __init__(
+        self,
+        config_file: Optional[str] = None,
+        isolated_servers: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            config_file: mcpServers config file, see build_mcp_clients_from_config.
+            isolated_servers: servers keeping per-session state, each `session()`
+                gets its own connection to them instead of the shared one.
+            kwargs: passed to build_mcp_clients_from_config, e.g. pool_size.
+                Shared servers always get a MCPClientPool, of one session
+                unless pool_size is set.
+        """
+        self.config_file = config_file
+        self.isolated_servers = set(isolated_servers or [])
+        self.client_kwargs = kwargs
+        self.clients: Dict[str, MCPClient] = {}
+        self._isolated_config: Dict[str, Any] = {}
+        self._cleanup: Optional[Callable[[], Awaitable[None]]] = None
+        if config_file is not None:
+            config = load_mcp_servers_config(config_file)
+            self._isolated_config = {
+                name: server
+                for name, server in config.items()
+                if name in self.isolated_servers
+            }
+            # sessions of a pool are owned by its background tasks, so a
+            # reconnect from a request never opens them in the request task
+            self.clients, self._cleanup = build_mcp_clients(
+                {
+                    name: server
+                    for name, server in config.items()
+                    if name not in self.isolated_servers
+                },
+                **{"pool_size": 1, **kwargs},
+            )
+
+    def get_client(self, name: str) -> Optional[MCPClient]:
+        return self.clients.get(name)
+
+    async def start(self) -> None:
+        """
+        Connects to all shared servers,
+        failed ones keep reconnecting in the background.
+        """
+        results = await asyncio.gather(
+            *[client.connect_to_server() for client in self.clients.values()],
+            return_exceptions=True,
+        )
+        for name, result in zip(self.clients, results):
+            if isinstance(result, BaseException):
+                logger.error("Failed to connect to MCP server %s: %s", name, result)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Dict[str, MCPClient]]:
+        """
+        Yields the MCP clients for one request: shared clients plus
+        new connections to isolated servers, which are closed on exit.
+        """
+        if not self._isolated_config:
+            yield dict(self.clients)
+            return
+        clients, cleanup = build_mcp_clients(
+            self._isolated_config, **self.client_kwargs
+        )
+        try:
+            yield {**self.clients, **clients}
+        finally:
+            await cleanup()
+
+    async def close(self) -> None:
+        if self._cleanup is not None:
+            await self._cleanup()
+
+
+def get_mcp_registry(
+    config_file: Optional[str] = None,
+    **kwargs: Any,
+) -> MCPRegistry:
+    """
+    Get the MCP registry instance, the arguments only apply to the first call.
+    """
+    return MCPRegistry.get_instance_sync(config_file=config_file, **kwargs)
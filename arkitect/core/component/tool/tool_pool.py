@@ -23,6 +23,7 @@ from arkitect.core.component.tool.utils import (
     mcp_to_chat_completion_tool,
 )
 from arkitect.telemetry.logger import WARN
+from arkitect.telemetry.metrics import observe_tool_call
 from arkitect.telemetry.trace.wrapper import task
 from arkitect.types.llm.model import ChatCompletionTool
 from mcp.server.fastmcp import FastMCP
@@ -34,13 +35,29 @@ class ToolPool:
         self.session: FastMCP = FastMCP()
         self.tools: dict[str, ChatCompletionTool] = {}
         self.mcp_clients: Dict[str, MCPClient] = {}
-        self._all_tool_name: set[str] = set()
+        # bumped whenever the tool list may have changed
+        self.version: int = 0
+        self._tool_params_cache: list[dict[str, Any]] | None = None
+        self._tool_params_version: int = -1
+        # tool name -> (mcp client or None for local tools, tool name on server)
+        self._routes: dict[str, tuple[MCPClient | None, str]] = {}
+        self._routes_version: int = -1
+        self._client_tools: list[ChatCompletionTool] = []
 
     def add_mcp_client(self, mcp_client: MCPClient) -> None:
         if mcp_client.name in self.mcp_clients:
             WARN(f"Found MCP client with the same name: {mcp_client.name}. Skipping.")
             return
         self.mcp_clients[mcp_client.name] = mcp_client
+        mcp_client.add_tool_list_changed_callback(self.invalidate_tool_cache)
+        self.invalidate_tool_cache()
+
+    def remove_mcp_client(self, name: str) -> None:
+        if self.mcp_clients.pop(name, None) is not None:
+            self.invalidate_tool_cache()
+
+    def invalidate_tool_cache(self) -> None:
+        self.version += 1
 
     def add_tool(
         self,
@@ -49,11 +66,18 @@ class ToolPool:
         description: str | None = None,
     ) -> None:
         self.session.add_tool(fn=fn, name=name, description=description)
+        self.invalidate_tool_cache()
 
     def tool(
         self, name: str | None = None, description: str | None = None
     ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
-        fn = self.session.tool(name=name, description=description)
+        decorator = self.session.tool(name=name, description=description)
+
+        def fn(func: Callable[..., Any]) -> Callable[..., Any]:
+            result = decorator(func)
+            self.invalidate_tool_cache()
+            return result
+
         return fn
 
     async def initialize(self) -> None:
@@ -61,21 +85,39 @@ class ToolPool:
 
     @task()
     async def refresh_tool_list(self) -> None:
+        """
+        Rebuilds the tool list and the routing table from tool name to
+        its MCP client. A tool whose name is already taken is exposed as
+        `{client name}__{tool name}`.
+        """
         tools = await self.session.list_tools()
         self.tools = {t.name: mcp_to_chat_completion_tool(t) for t in tools}
-        self._all_tool_name.update([t.name for t in tools])
+        routes: dict[str, tuple[MCPClient | None, str]] = {
+            t.name: (None, t.name) for t in tools
+        }
+        client_tools = []
         for client in self.mcp_clients.values():
-            new_tools = await client.list_tools()
-            new_names = [t.function.name for t in new_tools]
-            self._all_tool_name.update(new_names)
+            for t in await client.list_tools():
+                server_tool_name = t.function.name
+                if server_tool_name in routes:
+                    t = t.model_copy(deep=True)
+                    t.function.name = f"{client.name}__{server_tool_name}"
+                    WARN(
+                        f"Found tools with the same name in the tool pool: "
+                        f"{server_tool_name}. Renamed it to {t.function.name}."
+                    )
+                routes[t.function.name] = (client, server_tool_name)
+                client_tools.append(t)
+        self._routes = routes
+        self._client_tools = client_tools
+        self.invalidate_tool_cache()
+        self._routes_version = self.version
 
     @task()
     async def list_tools(self, use_cache: bool = True) -> list[ChatCompletionTool]:
-        if not use_cache:
+        if not use_cache or self._routes_version != self.version:
             await self.refresh_tool_list()
-        chat_completion_tools = list(self.tools.values())
-        for client in self.mcp_clients.values():
-            chat_completion_tools.extend(await client.list_tools())
+        chat_completion_tools = list(self.tools.values()) + self._client_tools
         duplicates = find_duplicate_tools(chat_completion_tools)
         if duplicates:
             WARN(
@@ -84,27 +126,43 @@ class ToolPool:
             )
         return chat_completion_tools
 
+    async def list_tool_params(self) -> list[dict[str, Any]]:
+        """
+        Returns the serialized tool schemas for chat completion requests.
+        The result is cached until the tool list changes, callers should not modify it.
+        """
+        if self._tool_params_cache is None or self._tool_params_version != self.version:
+            tools = await self.list_tools()
+            self._tool_params_cache = [t.model_dump() for t in tools]
+            # the version the tools were listed at, a refresh bumps it
+            self._tool_params_version = self._routes_version
+        return self._tool_params_cache
+
     @task()
     async def execute_tool(
         self,
         tool_name: str,
         parameters: dict[str, Any],
     ) -> str | list[ChatCompletionContentPartParam]:
-        available_tool_names = [t.name for t in await self.session.list_tools()]
-        if tool_name in available_tool_names:
-            result = await self.session.call_tool(tool_name, parameters)
-            return convert_to_chat_completion_content_part_param(
-                CallToolResult(content=list(result), isError=False)
-            )
-        else:
-            for client in self.mcp_clients.values():
-                if await client.get_tool(tool_name):
-                    return await client.execute_tool(tool_name, parameters)
+        if self._routes_version != self.version:
+            await self.refresh_tool_list()
+        route = self._routes.get(tool_name)
+        if route is not None:
+            client, server_tool_name = route
+            if client is None:
+                with observe_tool_call("local", server_tool_name):
+                    result = await self.session.call_tool(server_tool_name, parameters)
+                return convert_to_chat_completion_content_part_param(
+                    CallToolResult(content=list(result), isError=False)
+                )
+            return await client.execute_tool(server_tool_name, parameters)
         raise ValueError(f"Tool {tool_name} is not found!")
 
     @task()
     async def contain(self, tool_name: str) -> bool:
-        return tool_name in self._all_tool_name
+        if self._routes_version != self.version:
+            await self.refresh_tool_list()
+        return tool_name in self._routes
 
 
 def build_tool_pool(
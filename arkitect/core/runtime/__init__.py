@@ -14,7 +14,9 @@
 
 from ...types.runtime.model import Context, Request, RequestType, Response, ResponseType
 from .asyncio import AsyncRunner, ChatAsyncRunner, CustomAsyncRunner
+from .coalesce import ChunkCoalescer
 from .runner import load_function
+from .sse import SSEEncoder
 from .sync import SyncRunner
 
 __all__ = [
@@ -22,6 +24,8 @@ __all__ = [
     "CustomAsyncRunner",
     "ChatAsyncRunner",
     "SyncRunner",
+    "SSEEncoder",
+    "ChunkCoalescer",
     "Request",
     "Response",
     "RequestType",
@@ -13,8 +13,8 @@
 # limitations under the License.
 
 import abc
-import json
 import logging
+import time
 from typing import (
     Any,
     AsyncIterable,
@@ -22,11 +22,12 @@ from typing import (
     Callable,
     Coroutine,
     Generic,
+    Optional,
     Type,
     Union,
 )
 
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, Field, ValidationError
 from volcenginesdkarkruntime._exceptions import ArkAPIError
 
 from arkitect.core.errors import (
@@ -35,12 +36,16 @@ from arkitect.core.errors import (
     InternalServiceError,
     parse_pydantic_error,
 )
+from arkitect.telemetry.logger import record_phase
 
 from ...types.runtime.model import RequestType, Response, ResponseType
+from .coalesce import ChunkCoalescer
+from .sse import SSEEncoder
 
 
 class AsyncRunner(BaseModel, Generic[RequestType, ResponseType]):
     invoke: Callable[[RequestType], Coroutine[Any, Any, AsyncIterable[ResponseType]]]
+    sse_encoder: SSEEncoder = Field(default_factory=SSEEncoder)
 
     class Config:
         """Configuration for this pydantic object."""
@@ -64,9 +69,19 @@ class AsyncRunner(BaseModel, Generic[RequestType, ResponseType]):
         pass
 
     @abc.abstractmethod
-    def astream(self, request: RequestType) -> AsyncIterator[str]:
+    def astream(
+        self, request: RequestType, coalescer: Optional[ChunkCoalescer] = None
+    ) -> AsyncIterator[str]:
         pass
 
+    async def _stream(
+        self, request: RequestType, coalescer: Optional[ChunkCoalescer]
+    ) -> AsyncIterable[ResponseType]:
+        stream = await self.invoke(request)
+        if coalescer is not None:
+            return coalescer.coalesce(stream)
+        return stream
+
 
 class CustomAsyncRunner(AsyncRunner[RequestType, ResponseType]):
     response_cls: Type[ResponseType]
@@ -95,23 +110,25 @@ class CustomAsyncRunner(AsyncRunner[RequestType, ResponseType]):
             logging.error(f"bot meet internal error{err}")
             return resp
 
-    async def astream(self, request: RequestType) -> AsyncIterator[str]:  # type: ignore
+    async def astream(  # type: ignore
+        self, request: RequestType, coalescer: Optional[ChunkCoalescer] = None
+    ) -> AsyncIterator[str]:
         try:
-            async for resp in await self.invoke(request):  # type: ResponseType
-                if isinstance(resp, BaseModel):
-                    yield f"data:{resp.model_dump_json(exclude_none=True)}\r\n\r\n"  # noqa E501
-                else:
-                    yield f"data:{json.dumps(resp, ensure_ascii=False)}\r\n\r\n"  # noqa E501
+            async for resp in await self._stream(request, coalescer):
+                start = time.perf_counter()
+                data = self.sse_encoder.encode(resp)
+                record_phase("sse.serialize", time.perf_counter() - start)
+                yield data
         except APIException as e:
             resp = self.response_cls(error=e.to_error())
             logging.error("stream chat meet error")
-            yield f"data:{resp.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
+            yield self.sse_encoder.encode_error(resp)
         except Exception as e:
             err = InternalServiceError(str(e))
             resp = self.response_cls(error=err.to_error())
             logging.error("stream chat meet error")
-            yield f"data:{resp.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
-        yield "data:[DONE]\r\n\r\n"
+            yield self.sse_encoder.encode_error(resp)
+        yield self.sse_encoder.encode_done()
 
 
 class ChatAsyncRunner(AsyncRunner[RequestType, ResponseType]):
@@ -133,18 +150,23 @@ class ChatAsyncRunner(AsyncRunner[RequestType, ResponseType]):
             logging.error(f"[Internal Error]: chat meet error:{e}")
             raise err
 
-    async def astream(self, request: RequestType) -> AsyncIterator[str]:
+    async def astream(
+        self, request: RequestType, coalescer: Optional[ChunkCoalescer] = None
+    ) -> AsyncIterator[str]:
         try:
-            async for resp in await self.invoke(request):  # type: ResponseType
-                yield f"data:{resp.model_dump_json(exclude_none=True)}\r\n\r\n"  # noqa E501
+            async for resp in await self._stream(request, coalescer):
+                start = time.perf_counter()
+                data = self.sse_encoder.encode(resp)
+                record_phase("sse.serialize", time.perf_counter() - start)
+                yield data
         except APIException as e:
             err = Response(error=e.to_error())
             logging.error(f"[API Error]: stream chat meet error:{e}")
-            yield f"data:{err.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
+            yield self.sse_encoder.encode_error(err)
         except ValidationError as e:
             err = Response(error=parse_pydantic_error(e).to_error())
             logging.error(f"[Validation Error]: stream chat meet parameter error:{e}")
-            yield f"data:{err.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
+            yield self.sse_encoder.encode_error(err)
         except ArkAPIError as e:
             err = Response(
                 error=ArkError(
@@ -155,9 +177,9 @@ class ChatAsyncRunner(AsyncRunner[RequestType, ResponseType]):
                 )
             )
             logging.error(f"[Calling Chat Error]: stream chat meet error:{e}")
-            yield f"data:{err.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
+            yield self.sse_encoder.encode_error(err)
         except Exception as e:
             err = Response(error=InternalServiceError(str(e)).to_error())
             logging.error(f"[Internal Error]: stream chat meet error:{e}")
-            yield f"data:{err.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
-        yield "data:[DONE]\r\n\r\n"
+            yield self.sse_encoder.encode_error(err)
+        yield self.sse_encoder.encode_done()
@@ -0,0 +1,203 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+_END = object()
+
+
+def _text_delta(chunk: Any) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """
+    Returns (content, reasoning_content) of a chunk carrying nothing but text,
+    None for any other chunk, e.g. tool calls, usage or finish reason.
+    """
+    # checked by duck typing, the chunk models import this package
+    if getattr(chunk, "object", None) != "chat.completion.chunk":
+        return None
+    if (
+        chunk.usage is not None
+        or getattr(chunk, "bot_usage", None) is not None
+        or getattr(chunk, "metadata", None) is not None
+        or getattr(chunk, "references", None) is not None
+        or getattr(chunk, "error", None) is not None
+        or len(chunk.choices) != 1
+    ):
+        return None
+    choice = chunk.choices[0]
+    delta = choice.delta
+    if (
+        choice.finish_reason is not None
+        or choice.moderation_hit_type is not None
+        or choice.logprobs is not None
+        or choice.model_extra
+        or delta.tool_calls
+        or delta.function_call is not None
+        or getattr(delta, "encrypted_content", None) is not None
+        or delta.model_extra
+    ):
+        return None
+    content, reasoning = delta.content, delta.reasoning_content
+    if content is None and reasoning is None:
+        return None
+    if not isinstance(content, (str, type(None))) or not isinstance(
+        reasoning, (str, type(None))
+    ):
+        return None
+    return content, reasoning
+
+
+class _PendingChunk:
+    __slots__ = ("first", "content", "reasoning", "count", "size", "deadline")
+
+    def __init__(self, first: Any, text: Tuple[Any, Any], deadline: float) -> None:
+        self.first = first
+        self.content: Optional[List[str]] = None if text[0] is None else [text[0]]
+        self.reasoning: Optional[List[str]] = None if text[1] is None else [text[1]]
+        self.count = 1
+        self.size = len(text[0] or "") + len(text[1] or "")
+        self.deadline = deadline
+
+    def add(self, chunk: Any) -> bool:
+        text = _text_delta(chunk)
+        if text is None:
+            return False
+        first = self.first
+        delta, first_delta = chunk.choices[0].delta, first.choices[0].delta
+        if (
+            chunk.id != first.id
+            or chunk.model != first.model
+            or chunk.choices[0].index != first.choices[0].index
+            or (delta.role is not None and delta.role != first_delta.role)
+            or (text[0] is None) != (self.content is None)
+            or (text[1] is None) != (self.reasoning is None)
+        ):
+            return False
+        if self.content is not None:
+            self.content.append(text[0])
+        if self.reasoning is not None:
+            self.reasoning.append(text[1])
+        self.count += 1
+        self.size += len(text[0] or "") + len(text[1] or "")
+        return True
+
+    def build(self) -> Any:
+        first = self.first
+        if self.count == 1:
+            return first
+        # copy, the original chunks may still be referenced by the producer
+        choice = first.choices[0]
+        delta = choice.delta.model_copy(
+            update={
+                "content": None if self.content is None else "".join(self.content),
+                "reasoning_content": (
+                    None if self.reasoning is None else "".join(self.reasoning)
+                ),
+            }
+        )
+        return first.model_copy(
+            update={"choices": [choice.model_copy(update={"delta": delta})]}
+        )
+
+
+class _Raised:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+async def _produce(stream: AsyncIterable[Any], queue: "asyncio.Queue[Any]") -> None:
+    try:
+        async for chunk in stream:
+            await queue.put(chunk)
+    except Exception as e:
+        await queue.put(_Raised(e))
+        return
+    await queue.put(_END)
+
+
+class ChunkCoalescer:
+    """
+    Merges consecutive text deltas of `ArkChatCompletionChunk` streams,
+    so that a client receives fewer, larger events.
+
+    The first chunk is sent right away, later text chunks are held for at most
+    `max_delay_ms` or until `max_chars` characters are pending.
+    Chunks with tool calls, usage, a finish reason or anything else
+    than text are never merged and keep their order in the stream.
+    """
+
+    def __init__(
+        self, max_delay_ms: float = 20, max_chars: int = 1024, max_buffered: int = 64
+    ) -> None:
+        self.max_delay = max_delay_ms / 1000
+        self.max_chars = max_chars
+        self.max_buffered = max_buffered
+
+    async def coalesce(self, stream: AsyncIterable[Any]) -> AsyncIterator[Any]:
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[Any]" = asyncio.Queue(self.max_buffered)
+        # the stream is consumed by a single task, so that context changes
+        # of the producer, e.g. the current span, stay in one context
+        producer = asyncio.ensure_future(_produce(stream, queue))
+        pending: Optional[_PendingChunk] = None
+        first = True
+        try:
+            while True:
+                if not queue.empty():
+                    chunk = queue.get_nowait()
+                elif pending is None:
+                    chunk = await queue.get()
+                else:
+                    timeout = pending.deadline - loop.time()
+                    try:
+                        if timeout <= 0:
+                            raise asyncio.TimeoutError()
+                        chunk = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        # latency budget spent, send what we have
+                        yield pending.build()
+                        pending = None
+                        continue
+
+                if chunk is _END or isinstance(chunk, _Raised):
+                    if pending is not None:
+                        yield pending.build()
+                        pending = None
+                    if chunk is _END:
+                        return
+                    raise chunk.error
+                if first:
+                    first = False
+                    yield chunk
+                    continue
+                if pending is not None:
+                    if pending.add(chunk):
+                        if pending.size >= self.max_chars:
+                            yield pending.build()
+                            pending = None
+                        continue
+                    yield pending.build()
+                    pending = None
+                text = _text_delta(chunk)
+                if (
+                    text is None
+                    or len(text[0] or "") + len(text[1] or "") >= self.max_chars
+                ):
+                    yield chunk
+                else:
+                    pending = _PendingChunk(chunk, text, loop.time() + self.max_delay)
+        finally:
+            producer.cancel()
@@ -0,0 +1,68 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from typing import Any, Dict
+
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+SSE_DONE = "data:[DONE]\r\n\r\n"
+
+
+class SSEEncoder:
+    """
+    Encodes stream responses as server-sent events.
+
+    Pydantic models are dumped with the serializer compiled for their class,
+    other types with a `TypeAdapter` built once per type,
+    plain dicts and lists with orjson when it is installed.
+    Subclass and pass it as `sse_encoder` of a runner to change the encoding.
+    """
+
+    def __init__(self, exclude_none: bool = True, use_orjson: bool = True) -> None:
+        self.exclude_none = exclude_none
+        self.use_orjson = use_orjson and orjson is not None
+        self._adapters: Dict[type, TypeAdapter] = {}
+
+    def dumps(self, resp: Any) -> bytes:
+        if isinstance(resp, BaseModel):
+            return type(resp).__pydantic_serializer__.to_json(
+                resp, exclude_none=self.exclude_none
+            )
+        if isinstance(resp, (dict, list, str)):
+            if self.use_orjson:
+                try:
+                    return orjson.dumps(resp)
+                except TypeError:
+                    # e.g. non str keys, keep the json module behaviour
+                    pass
+            return json.dumps(resp, ensure_ascii=False).encode("utf-8")
+        adapter = self._adapters.get(type(resp))
+        if adapter is None:
+            adapter = self._adapters[type(resp)] = TypeAdapter(type(resp))
+        return adapter.dump_json(resp, exclude_none=self.exclude_none)
+
+    def encode(self, resp: Any) -> str:
+        return f"data:{self.dumps(resp).decode('utf-8')}\r\n\r\n"
+
+    def encode_error(self, resp: BaseModel) -> str:
+        return f"data:{resp.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
+
+    def encode_done(self) -> str:
+        return SSE_DONE
@@ -17,7 +17,9 @@ from typing import Any, Dict, Optional, Tuple, Type
 
 from arkitect.core.client import Client
 from arkitect.core.component.bot import BotServer
-from arkitect.core.runtime import load_function
+from arkitect.core.component.tool import MCPRegistry
+from arkitect.core.runtime import ChunkCoalescer, load_function
+from arkitect.telemetry.logger import WARN, setup_queue_logging
 from arkitect.telemetry.trace import TraceConfig, setup_tracing
 from arkitect.utils.context import set_account_id, set_resource_id, set_resource_type
 
@@ -34,8 +36,20 @@ def launch_serve(
     trace_config: Optional[TraceConfig] = None,
     trace_on: bool = True,
     trace_log_dir: Optional[str] = "./",
+    mcp_registry: Optional[MCPRegistry] = None,
+    metrics_path: Optional[str] = None,
+    stream_coalesce_ms: Optional[float] = None,
+    queue_logging: Optional[bool] = None,
+    log_queue_size: int = 10000,
     **kwargs: Any,
 ) -> None:
+    if queue_logging is None:
+        queue_logging = os.getenv("QUEUE_LOGGING", "").lower() == "true"
+    if queue_logging:
+        # write logs from a background thread so that the event loop
+        # is never blocked by a slow disk or pipe
+        setup_queue_logging(max_queue_size=log_queue_size)
+
     set_resource_type(os.getenv("RESOURCE_TYPE") or "")
     set_resource_id(os.getenv("RESOURCE_ID") or "")
     set_account_id(os.getenv("ACCOUNT_ID") or "")
@@ -47,6 +61,13 @@ def launch_serve(
         log_dir=trace_log_dir,
     )
 
+    if metrics_path and kwargs.get("workers_num", 1) > 1:
+        # the registry is per process, a scrape only sees one of the workers
+        WARN(
+            f"{metrics_path} only reports the worker answering the scrape, "
+            "serve metrics with workers_num=1"
+        )
+
     runnable_func = load_function(package_path, "main")
 
     server: BotServer = BotServer(
@@ -54,5 +75,12 @@ def launch_serve(
         health_check_path=health_check_path,
         endpoint_config=get_endpoint_config(endpoint_path, runnable_func),
         clients=clients if clients else get_default_client_configs(),
+        mcp_registry=mcp_registry,
+        metrics_path=metrics_path,
+        chunk_coalescer=(
+            ChunkCoalescer(max_delay_ms=stream_coalesce_ms)
+            if stream_coalesce_ms
+            else None
+        ),
     )
     server.run(app=server.app, host=host, port=port, **kwargs)
@@ -18,7 +18,7 @@ from pydantic import ValidationError
 
 from arkitect.core.errors import parse_pydantic_error
 from arkitect.core.runtime import Request, RequestType
-from arkitect.telemetry.logger import gen_log_id
+from arkitect.telemetry.logger import get_log_id_generator
 from arkitect.telemetry.trace import task
 from arkitect.utils.context import (
     get_client_reqid,
@@ -38,7 +38,9 @@ def parse_request(event: Dict[str, Any], request_cls: Type[RequestType]) -> Requ
 
     # here we generate request id instead of reading from headers
     set_reqid(
-        headers.get("X-Faas-Request-Id", headers.get("X-Request-Id", gen_log_id()))
+        headers.get("X-Faas-Request-Id")
+        or headers.get("X-Request-Id")
+        or get_log_id_generator()()
     )
     set_client_reqid(headers.get("X-Client-Request-Id", get_reqid()))
 
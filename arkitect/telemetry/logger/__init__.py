@@ -16,9 +16,39 @@ import logging
 from typing import Any
 
 from .common import LoggerName, Timer
-from .logid import gen_log_id
+from .logid import (
+    LogIdGenerator,
+    gen_fast_log_id,
+    gen_log_id,
+    get_log_id_generator,
+)
+from .queue_handler import (
+    BoundedQueueHandler,
+    JsonFormatter,
+    QueueLogging,
+    setup_queue_logging,
+)
+from .timeline import Timeline, record_phase, start_timeline, timeline_phase
 
-__all__ = ["DEBUG", "INFO", "WARN", "ERROR", "Timer", "gen_log_id"]
+__all__ = [
+    "DEBUG",
+    "INFO",
+    "WARN",
+    "ERROR",
+    "Timer",
+    "gen_log_id",
+    "gen_fast_log_id",
+    "get_log_id_generator",
+    "LogIdGenerator",
+    "Timeline",
+    "record_phase",
+    "start_timeline",
+    "timeline_phase",
+    "BoundedQueueHandler",
+    "JsonFormatter",
+    "QueueLogging",
+    "setup_queue_logging",
+]
 
 
 def DEBUG(msg: str, *args: Any, **kwargs: Any) -> None:
@@ -36,6 +36,9 @@ class LoggerName:
 
 class LogIdFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
+        if hasattr(record, "_logid"):
+            # already resolved, e.g. before the record was queued to another thread
+            return True
         logid = getattr(record, "tags", {}).get("_reqid")
         client_reqid = getattr(record, "tags", {}).get("_client_reqid")
         if logid:
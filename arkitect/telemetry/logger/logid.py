@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+import os
 import random
+import time
 from datetime import datetime
+from typing import Callable, Dict
 
 time_fmt = "%Y%m%d%H%M%S"
 
@@ -30,3 +34,55 @@ def gen_log_id() -> str:
     return datetime.now().strftime(time_fmt) + format(
         random.randint(0, 2**64 - 1), "020X"
     )
+
+
+class LogIdGenerator:
+    """
+    Generates log IDs of the same format as `gen_log_id`.
+
+    The 20 hexadecimal digits are a 56-bit node ID of the process, read from
+    os.urandom and renewed after fork, followed by a 24-bit counter.
+    IDs are unique across processes as long as a process generates fewer
+    than 2**24 IDs per second, and the timestamp is only formatted
+    once per second.
+    """
+
+    def __init__(self) -> None:
+        self._clock = (0, "")
+        self.reset()
+
+    def reset(self) -> None:
+        self._node = os.urandom(7).hex().upper()
+        self._counter = itertools.count(int.from_bytes(os.urandom(3), "big"))
+
+    def __call__(self) -> str:
+        now = int(time.time())
+        second, prefix = self._clock
+        if now != second:
+            prefix = time.strftime(time_fmt, time.localtime(now))
+            self._clock = (now, prefix)
+        return f"{prefix}{self._node}{next(self._counter) & 0xFFFFFF:06X}"
+
+
+gen_fast_log_id = LogIdGenerator()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=gen_fast_log_id.reset)
+
+LOG_ID_GENERATORS: Dict[str, Callable[[], str]] = {
+    "random": gen_log_id,
+    "fast": gen_fast_log_id,
+}
+
+
+def get_log_id_generator(name: str = "") -> Callable[[], str]:
+    """
+    Returns the log ID generator registered as `name`,
+    defaults to env LOG_ID_GENERATOR or "random".
+    """
+    name = name or os.getenv("LOG_ID_GENERATOR", "random")
+    if name not in LOG_ID_GENERATORS:
+        raise ValueError(
+            f"unknown log id generator {name}, "
+            f"expected one of {list(LOG_ID_GENERATORS)}"
+        )
+    return LOG_ID_GENERATORS[name]
@@ -0,0 +1,201 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import copy
+import datetime
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
+
+from .common import LoggerName, LogIdFilter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_traceback_formatter = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one json object per line,
+    keeping the log id set by `LogIdFilter` and the rpc tags set by `RpcFilter`.
+    """
+
+    def __init__(self, use_orjson: bool = True) -> None:
+        super().__init__()
+        self._use_orjson = use_orjson and orjson is not None
+
+    def to_dict(self, record: logging.LogRecord) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "location": f"{record.filename}:{record.lineno}",
+            "logid": getattr(record, "_logid", "-"),
+            "client_reqid": getattr(record, "_client_reqid", "-"),
+            "message": record.getMessage(),
+        }
+        rpc_tags = getattr(record, "_rpc_tags", None)
+        if rpc_tags is not None:
+            data["rpc_tags"] = rpc_tags
+        elif isinstance(getattr(record, "tags", None), dict):
+            data["tags"] = record.tags
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return data
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = self.to_dict(record)
+        if self._use_orjson:
+            return orjson.dumps(data, default=str).decode("utf-8")
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Puts records on a bounded queue without ever blocking the caller,
+    records are dropped and counted in `dropped_records` when the queue is full.
+
+    Filters attached to this handler run in the thread that logs,
+    so context based fields like the log id are resolved before enqueueing.
+    """
+
+    def __init__(self, max_queue_size: int = 10000) -> None:
+        super().__init__(queue.Queue(maxsize=max_queue_size))
+        self.dropped_records = 0
+        self._counter_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped_records += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # unlike the base class, keep the raw message and the traceback apart
+        # so that the handlers of the listener can format them as they like
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _QueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # the queue may be full, wait for the listener to make room
+        self.queue.put(self._sentinel)
+
+
+class QueueLogging:
+    """Handle of an active queue logging setup, see `setup_queue_logging`"""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        handler: BoundedQueueHandler,
+        listener: QueueListener,
+        replaced_handlers: List[logging.Handler],
+        formatters: Optional[Dict[logging.Handler, Optional[logging.Formatter]]] = None,
+    ) -> None:
+        self.logger = logger
+        self.handler = handler
+        self.listener = listener
+        self._replaced_handlers = replaced_handlers
+        self._formatters = formatters or {}
+        self._stopped = False
+
+    @property
+    def dropped_records(self) -> int:
+        return self.handler.dropped_records
+
+    def stop(self) -> None:
+        """Flush the queued records and restore the original handlers"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self.logger.removeHandler(self.handler)
+        self.listener.stop()
+        for h, formatter in self._formatters.items():
+            h.setFormatter(formatter)
+        for h in self._replaced_handlers:
+            self.logger.addHandler(h)
+        if self.dropped_records:
+            self.logger.warning(
+                "queue logging dropped %d records", self.dropped_records
+            )
+
+
+def setup_queue_logging(
+    logger_name: Optional[str] = None,
+    handlers: Optional[List[logging.Handler]] = None,
+    level: Optional[int] = None,
+    max_queue_size: int = 10000,
+    json_format: bool = True,
+) -> QueueLogging:
+    """
+    Moves the handlers of a logger behind a bounded queue drained by a
+    `QueueListener` thread, so slow disks or pipes never block the event loop.
+
+    Args:
+        logger_name: defaults to the framework logger `LoggerName.get()`.
+        handlers: the handlers to write with, defaults to the handlers currently
+            attached to the logger, or a stderr stream handler if there are none.
+        level: optionally set the level of the logger.
+        max_queue_size: records are dropped when this many are pending.
+        json_format: format records with `JsonFormatter`,
+            the formatters of the handlers are restored by `stop()`.
+
+    Returns:
+        a `QueueLogging` handle, stopped automatically at exit.
+    """
+    name = logger_name or LoggerName.get()
+    logger = logging.getLogger(None if name == "root" else name)
+    replaced = list(logger.handlers)
+    if handlers is None:
+        handlers = replaced or [logging.StreamHandler(sys.stderr)]
+    for h in replaced:
+        logger.removeHandler(h)
+    formatters = {}
+    if json_format:
+        for h in handlers:
+            formatters[h] = h.formatter
+            h.setFormatter(JsonFormatter())
+
+    handler = BoundedQueueHandler(max_queue_size=max_queue_size)
+    handler.addFilter(LogIdFilter())
+    listener = _QueueListener(handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    logger.addHandler(handler)
+    if level is not None:
+        logger.setLevel(level)
+
+    setup = QueueLogging(logger, handler, listener, replaced, formatters)
+    atexit.register(setup.stop)
+    return setup
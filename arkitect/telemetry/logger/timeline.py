@@ -0,0 +1,95 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from arkitect.utils.context import get_timeline, set_timeline
+
+
+class Timeline:
+    """
+    Latency breakdown of a request: the total duration, count and max
+    in milliseconds of each named phase, e.g. llm.ttft, llm.total,
+    tool.<name>, sse.serialize.
+    Phases recorded by tasks of the request are added to the same timeline.
+    """
+
+    __slots__ = ("start", "phases")
+
+    def __init__(self, start: Optional[float] = None) -> None:
+        self.start = time.perf_counter() if start is None else start
+        # name -> [count, total ms, max ms]
+        self.phases: Dict[str, List[float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        ms = seconds * 1000
+        stat = self.phases.get(name)
+        if stat is None:
+            self.phases[name] = [1, ms, ms]
+            return
+        stat[0] += 1
+        stat[1] += ms
+        if ms > stat[2]:
+            stat[2] = ms
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def summary(self) -> str:
+        """
+        One line summary, e.g. `total=812.3 llm.ttft=301.2 llm.total=700.5
+        tool.search=95.1/2(max=60.2)`, /n is the count of repeated phases.
+        """
+        parts = [f"total={self.elapsed_ms():.1f}"]
+        for name, (count, total, max_ms) in self.phases.items():
+            if count == 1:
+                parts.append(f"{name}={total:.1f}")
+            else:
+                parts.append(f"{name}={total:.1f}/{int(count)}(max={max_ms:.1f})")
+        return " ".join(parts)
+
+    def server_timing(self) -> str:
+        """
+        Value of a Server-Timing response header,
+        with the phases recorded so far only.
+        """
+        parts = [f"total;dur={self.elapsed_ms():.1f}"]
+        for name, (_, total, _) in self.phases.items():
+            parts.append(f"{name};dur={total:.1f}")
+        return ", ".join(parts)
+
+
+def start_timeline(start: Optional[float] = None) -> Timeline:
+    """Starts the timeline of the current request"""
+    timeline = Timeline(start)
+    set_timeline(timeline)
+    return timeline
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """Adds a phase to the timeline of the current request, if any"""
+    timeline = get_timeline()
+    if timeline is not None:
+        timeline.record(name, seconds)
+
+
+@contextmanager
+def timeline_phase(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - start)
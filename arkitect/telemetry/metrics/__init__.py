@@ -0,0 +1,67 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .instruments import (
+    ACTIVE_STREAMS,
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUED,
+    ADMISSION_REJECTED,
+    ADMISSION_WAIT,
+    HTTP_REQUEST_DURATION,
+    LLM_OUTPUT_TOKENS_PER_SECOND,
+    LLM_REQUEST_DURATION,
+    LLM_TIME_TO_FIRST_TOKEN,
+    LLM_TOKENS,
+    TOOL_CALL_DURATION,
+    TRACE_DEFERRED_SPANS_EVICTED,
+    observe_llm_stream,
+    observe_tool_call,
+    record_llm_completion,
+    record_llm_error,
+    record_llm_usage,
+)
+from .registry import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    generate_latest,
+)
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "REGISTRY",
+    "generate_latest",
+    "ACTIVE_STREAMS",
+    "ADMISSION_IN_FLIGHT",
+    "ADMISSION_QUEUED",
+    "ADMISSION_REJECTED",
+    "ADMISSION_WAIT",
+    "HTTP_REQUEST_DURATION",
+    "LLM_OUTPUT_TOKENS_PER_SECOND",
+    "LLM_REQUEST_DURATION",
+    "LLM_TIME_TO_FIRST_TOKEN",
+    "LLM_TOKENS",
+    "TOOL_CALL_DURATION",
+    "TRACE_DEFERRED_SPANS_EVICTED",
+    "observe_llm_stream",
+    "observe_tool_call",
+    "record_llm_completion",
+    "record_llm_error",
+    "record_llm_usage",
+]
@@ -0,0 +1,179 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterable, AsyncIterator, Iterator, Optional, TypeVar
+
+from arkitect.telemetry.logger.timeline import record_phase
+
+from .registry import REGISTRY, Counter, Gauge, Histogram
+
+T = TypeVar("T")
+
+LLM_REQUEST_DURATION = Histogram(
+    "arkitect_llm_request_duration_seconds",
+    "Duration of chat completion requests, until the last chunk for streams",
+    ["model", "stream", "status"],
+    registry=REGISTRY,
+)
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "arkitect_llm_time_to_first_token_seconds",
+    "Time from sending a streamed chat completion request to its first chunk",
+    ["model"],
+    registry=REGISTRY,
+)
+LLM_OUTPUT_TOKENS_PER_SECOND = Histogram(
+    "arkitect_llm_output_tokens_per_second",
+    "Completion tokens per second, measured after the first chunk for streams",
+    ["model"],
+    registry=REGISTRY,
+    buckets=(1, 5, 10, 20, 30, 40, 60, 80, 100, 150, 200, 400),
+)
+LLM_TOKENS = Counter(
+    "arkitect_llm_tokens_total",
+    "Tokens reported in chat completion usage",
+    ["model", "type"],
+    registry=REGISTRY,
+)
+TOOL_CALL_DURATION = Histogram(
+    "arkitect_tool_call_duration_seconds",
+    "Duration of tool calls, server is the mcp server name or local",
+    ["server", "tool", "status"],
+    registry=REGISTRY,
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "arkitect_http_request_duration_seconds",
+    "Duration of bot server requests, until the response is fully sent",
+    ["path", "status"],
+    registry=REGISTRY,
+)
+ACTIVE_STREAMS = Gauge(
+    "arkitect_active_streams",
+    "Streaming responses being sent by the bot server",
+    ["path"],
+    registry=REGISTRY,
+)
+TRACE_DEFERRED_SPANS_EVICTED = Counter(
+    "arkitect_trace_deferred_spans_evicted_total",
+    "Spans whose deferred attributes were evicted before export",
+    registry=REGISTRY,
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "arkitect_admission_in_flight",
+    "Requests admitted by the admission control and not finished yet",
+    registry=REGISTRY,
+)
+ADMISSION_QUEUED = Gauge(
+    "arkitect_admission_queued",
+    "Requests waiting for admission",
+    registry=REGISTRY,
+)
+ADMISSION_REJECTED = Counter(
+    "arkitect_admission_rejected_total",
+    "Requests rejected by the admission control, reason is queue_full, "
+    "timeout or evicted",
+    ["reason"],
+    registry=REGISTRY,
+)
+ADMISSION_WAIT = Histogram(
+    "arkitect_admission_wait_seconds",
+    "Time admitted requests waited in the admission queue",
+    registry=REGISTRY,
+)
+
+
+def record_llm_usage(model: str, usage: Any, generation_seconds: float) -> None:
+    if usage is None:
+        return
+    LLM_TOKENS.labels(model, "prompt").inc(usage.prompt_tokens or 0)
+    LLM_TOKENS.labels(model, "completion").inc(usage.completion_tokens or 0)
+    if usage.completion_tokens and generation_seconds > 0:
+        LLM_OUTPUT_TOKENS_PER_SECOND.labels(model).observe(
+            usage.completion_tokens / generation_seconds
+        )
+
+
+def record_llm_completion(model: str, completion: Any, start: float) -> None:
+    """Records a non-streamed chat completion requested at perf_counter `start`"""
+    duration = time.perf_counter() - start
+    LLM_REQUEST_DURATION.labels(model, "false", "ok").observe(duration)
+    record_phase("llm.total", duration)
+    record_llm_usage(model, getattr(completion, "usage", None), duration)
+
+
+def record_llm_error(model: str, stream: bool, start: float) -> None:
+    """Records a chat completion request that failed before returning"""
+    duration = time.perf_counter() - start
+    LLM_REQUEST_DURATION.labels(model, str(bool(stream)).lower(), "error").observe(
+        duration
+    )
+    record_phase("llm.error", duration)
+
+
+async def observe_llm_stream(
+    model: str, stream: AsyncIterable[T], start: Optional[float] = None
+) -> AsyncIterator[T]:
+    """
+    Yields the chunks of `stream` and records its time to first token,
+    duration and token throughput. `start` is the perf_counter time
+    the request was sent, defaults to now.
+    """
+    if start is None:
+        start = time.perf_counter()
+    first_chunk: Optional[float] = None
+    # time the consumer holds the stream paused, e.g. while running the tool
+    # calls of the chunk with the finish reason, is not counted
+    paused: Optional[float] = None
+    consumer_seconds = 0.0
+    usage = None
+    status = "error"
+    try:
+        async for chunk in stream:
+            if first_chunk is None:
+                first_chunk = time.perf_counter()
+                LLM_TIME_TO_FIRST_TOKEN.labels(model).observe(first_chunk - start)
+                record_phase("llm.ttft", first_chunk - start)
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            paused = time.perf_counter()
+            yield chunk
+            consumer_seconds += time.perf_counter() - paused
+            paused = None
+        status = "ok"
+    except (GeneratorExit, asyncio.CancelledError):
+        status = "cancelled"
+        raise
+    finally:
+        end = time.perf_counter()
+        if paused is not None:
+            consumer_seconds += end - paused
+        duration = end - start - consumer_seconds
+        LLM_REQUEST_DURATION.labels(model, "true", status).observe(duration)
+        record_phase("llm.total", duration)
+        record_llm_usage(model, usage, end - (first_chunk or start) - consumer_seconds)
+
+
+@contextmanager
+def observe_tool_call(server: str, tool: str) -> Iterator[None]:
+    start = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        duration = time.perf_counter() - start
+        TOOL_CALL_DURATION.labels(server, tool, status).observe(duration)
+        record_phase(f"tool.{tool}", duration)
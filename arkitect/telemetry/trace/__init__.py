@@ -12,8 +12,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .attributes import set_trace_attributes
-from .setup import TraceConfig, setup_tracing
+from .attributes import enable_deferred_attributes, set_trace_attributes
+from .export import DeferredAttributesSpanExporter, TailSamplingSpanProcessor
+from .json_lines import JsonLinesSpanExporter
+from .propagation import (
+    continue_trace,
+    extract_trace_context,
+    inject_trace_context,
+)
+from .setup import TraceConfig, flush_tracing, setup_tracing
+from .stream import StreamAggregator
 from .wrapper import task
 
-__all__ = ["set_trace_attributes", "task", "setup_tracing", "TraceConfig"]
+__all__ = [
+    "set_trace_attributes",
+    "enable_deferred_attributes",
+    "task",
+    "setup_tracing",
+    "flush_tracing",
+    "TraceConfig",
+    "DeferredAttributesSpanExporter",
+    "TailSamplingSpanProcessor",
+    "StreamAggregator",
+    "JsonLinesSpanExporter",
+    "inject_trace_context",
+    "extract_trace_context",
+    "continue_trace",
+]
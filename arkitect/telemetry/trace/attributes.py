@@ -12,18 +12,93 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import os
-from typing import Any, Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 from opentelemetry import trace
 from opentelemetry.trace.span import Span
 from opentelemetry.trace.status import StatusCode
+from pydantic import BaseModel
 
+from arkitect.telemetry.logger import WARN
+from arkitect.telemetry.metrics import TRACE_DEFERRED_SPANS_EVICTED
 from arkitect.utils import dump_json_str_truncate
 from arkitect.utils.context import get_custom_attributes
 
 _TRACE_MAX_STRING_LEN = os.environ.get("TRACE_MAX_STRING_LEN", "10000")
 
+_DeferredAttributes = Dict[str, Tuple[Any, Optional[int]]]
+
+_deferred_attributes_enabled = False
+# (trace id, span id) -> attributes to serialize at export time
+_deferred_attributes: "OrderedDict[Tuple[int, int], _DeferredAttributes]" = (
+    OrderedDict()
+)
+_deferred_attributes_lock = threading.Lock()
+# spans still open, on top of the ones waiting in the export queue
+_MAX_OPEN_DEFERRED_SPANS = 10000
+_DEFAULT_MAX_QUEUE_SIZE = 2048
+# bound for spans never exported, e.g. dropped by a full export queue
+_max_deferred_spans = _MAX_OPEN_DEFERRED_SPANS + _DEFAULT_MAX_QUEUE_SIZE
+_evicted_spans = 0
+
+
+def enable_deferred_attributes(
+    enabled: bool = True, max_queue_size: Optional[int] = None
+) -> None:
+    """
+    In deferred mode, json attributes only keep a reference to the value and
+    are serialized by DeferredAttributesSpanExporter when the span is exported,
+    so spans dropped by sampling are never serialized.
+
+    Dicts, lists and pydantic models are copied (shallow) when set, nested
+    values are read by the exporter thread as they are at export time.
+
+    Args:
+        max_queue_size: export queue size of the span processor. Attributes of
+            the oldest spans are evicted, with a warning, once more spans than
+            this plus 10000 open ones hold deferred attributes.
+    """
+    global _deferred_attributes_enabled, _max_deferred_spans
+    _deferred_attributes_enabled = enabled
+    _max_deferred_spans = _MAX_OPEN_DEFERRED_SPANS + (
+        max_queue_size
+        or int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE") or _DEFAULT_MAX_QUEUE_SIZE)
+    )
+
+
+def pop_deferred_attributes(span: Any) -> Dict[str, str]:
+    """Serializes and removes the deferred attributes of an ended span"""
+    context = span.get_span_context()
+    with _deferred_attributes_lock:
+        deferred = _deferred_attributes.pop((context.trace_id, context.span_id), None)
+    if not deferred:
+        return {}
+    return {
+        key: serialize_attribute(value, budget)
+        for key, (value, budget) in deferred.items()
+    }
+
+
+def discard_deferred_attributes(span: Any) -> None:
+    context = span.get_span_context()
+    with _deferred_attributes_lock:
+        _deferred_attributes.pop((context.trace_id, context.span_id), None)
+
+
+def serialize_attribute(value: Any, budget: Optional[int] = None) -> str:
+    try:
+        result = dump_json_str_truncate(value, int(_TRACE_MAX_STRING_LEN))
+    except Exception as e:
+        # e.g. the value is being modified by another thread
+        result = f"<failed to serialize: {e}>"
+    if budget is not None and len(result) > budget:
+        result = result[:budget] + "...(truncated)"
+    return result
+
 
 def set_trace_attributes(
     span: Span,
@@ -38,13 +113,17 @@ def set_trace_attributes(
     output: Any = None,
     merge_output: Optional[bool] = None,
     custom_attributes: Optional[Dict[str, Any]] = None,
+    attribute_budget: Optional[int] = None,
 ) -> None:
-    span.set_attribute(
-        "input", dump_json_str_truncate(input, int(_TRACE_MAX_STRING_LEN))
-    )
-    span.set_attribute(
-        "output", dump_json_str_truncate(output, int(_TRACE_MAX_STRING_LEN))
-    )
+    """
+    Args:
+        attribute_budget: max length of each serialized json attribute.
+    """
+    if not span.is_recording():
+        # dropped by the sampler, skip serialization
+        return
+    _set_json_attribute(span, "input", input, attribute_budget)
+    _set_json_attribute(span, "output", output, attribute_budget)
     span.set_attribute("request_id", request_id)
     span.set_attribute("client_request_id", client_request_id)
     span.set_attribute("resource_type", resource_type)
@@ -57,4 +136,39 @@ def set_trace_attributes(
         custom_attributes = get_custom_attributes()
     if custom_attributes:
         for k, v in custom_attributes.items():
-            span.set_attribute(k, dump_json_str_truncate(v, int(_TRACE_MAX_STRING_LEN)))
+            _set_json_attribute(span, k, v, attribute_budget)
+
+
+def _set_json_attribute(
+    span: Span, key: str, value: Any, budget: Optional[int]
+) -> None:
+    if not _deferred_attributes_enabled:
+        span.set_attribute(key, serialize_attribute(value, budget))
+        return
+    if isinstance(value, (dict, list, BaseModel)):
+        # the exporter thread reads it later, keep it from changing size
+        value = copy.copy(value)
+    context = span.get_span_context()
+    evicted = 0
+    with _deferred_attributes_lock:
+        deferred = _deferred_attributes.setdefault(
+            (context.trace_id, context.span_id), {}
+        )
+        deferred[key] = (value, budget)
+        while len(_deferred_attributes) > _max_deferred_spans:
+            _deferred_attributes.popitem(last=False)
+            evicted += 1
+    if evicted:
+        _record_eviction(evicted)
+
+
+def _record_eviction(count: int) -> None:
+    global _evicted_spans
+    TRACE_DEFERRED_SPANS_EVICTED.inc(count)
+    # not under the lock, this is only used for the warning rate
+    previous, _evicted_spans = _evicted_spans, _evicted_spans + count
+    if previous // 1000 != _evicted_spans // 1000 or previous == 0:
+        WARN(
+            f"{_evicted_spans} spans exported without their deferred attributes, "
+            f"more than {_max_deferred_spans} spans were waiting for export"
+        )
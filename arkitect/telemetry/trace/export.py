@@ -0,0 +1,115 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional, Sequence
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.trace import StatusCode
+
+from .attributes import discard_deferred_attributes, pop_deferred_attributes
+
+_TRACE_ID_LIMIT = (1 << 64) - 1
+
+
+class DeferredAttributesSpanExporter(SpanExporter):
+    """
+    Serializes the attributes deferred by `set_trace_attributes` and passes
+    the spans to `exporter`. With a BatchSpanProcessor this runs on the
+    exporter thread instead of the request path.
+    """
+
+    def __init__(self, exporter: SpanExporter) -> None:
+        self.exporter = exporter
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return self.exporter.export([self._materialize(span) for span in spans])
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.exporter.force_flush(timeout_millis)
+
+    @staticmethod
+    def _materialize(span: ReadableSpan) -> ReadableSpan:
+        deferred = pop_deferred_attributes(span)
+        if not deferred:
+            return span
+        return ReadableSpan(
+            name=span.name,
+            context=span.context,
+            parent=span.parent,
+            resource=span.resource,
+            attributes={**(span.attributes or {}), **deferred},
+            events=span.events,
+            links=span.links,
+            kind=span.kind,
+            status=span.status,
+            start_time=span.start_time,
+            end_time=span.end_time,
+            instrumentation_scope=span.instrumentation_scope,
+        )
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """
+    Decides when a span ends whether it is passed to `processor`.
+
+    Error spans and spans slower than `slow_span_threshold_ms` are always kept,
+    the others are kept for `sample_rate` of the traces chosen by trace id,
+    so the spans of a sampled trace are kept together.
+    """
+
+    def __init__(
+        self,
+        processor: SpanProcessor,
+        sample_rate: float = 1.0,
+        slow_span_threshold_ms: Optional[float] = None,
+    ) -> None:
+        self.processor = processor
+        self.sample_rate = sample_rate
+        self.slow_span_threshold_ms = slow_span_threshold_ms
+        self._trace_id_bound = round(sample_rate * (_TRACE_ID_LIMIT + 1))
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self.processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if self.should_keep(span):
+            self.processor.on_end(span)
+        else:
+            discard_deferred_attributes(span)
+
+    def should_keep(self, span: ReadableSpan) -> bool:
+        if span.status.status_code == StatusCode.ERROR:
+            return True
+        if (
+            self.slow_span_threshold_ms is not None
+            and span.start_time is not None
+            and span.end_time is not None
+            and span.end_time - span.start_time
+            >= self.slow_span_threshold_ms * 1_000_000
+        ):
+            return True
+        if span.context is None:
+            return True
+        return span.context.trace_id & _TRACE_ID_LIMIT < self._trace_id_bound
+
+    def shutdown(self) -> None:
+        self.processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.processor.force_flush(timeout_millis)
@@ -0,0 +1,236 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence, Union
+
+from opentelemetry import trace as trace_api
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.util import ns_to_iso_str
+from opentelemetry.trace import SpanContext
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_SHUTDOWN = object()
+
+
+def _dumps_json(obj: Any) -> bytes:
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+def _dumps_orjson(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=str)
+
+
+def _format_context(context: SpanContext) -> Dict[str, str]:
+    return {
+        "trace_id": f"0x{trace_api.format_trace_id(context.trace_id)}",
+        "span_id": f"0x{trace_api.format_span_id(context.span_id)}",
+        "trace_state": repr(context.trace_state),
+    }
+
+
+def span_to_dict(span: ReadableSpan) -> Dict[str, Any]:
+    """Same fields as `ReadableSpan.to_json`, without the json round trips"""
+    status = {"status_code": span.status.status_code.name}
+    if span.status.description:
+        status["description"] = span.status.description
+    return {
+        "name": span.name,
+        "context": _format_context(span.context) if span.context else None,
+        "kind": str(span.kind),
+        "parent_id": (
+            f"0x{trace_api.format_span_id(span.parent.span_id)}"
+            if span.parent is not None
+            else None
+        ),
+        "start_time": ns_to_iso_str(span.start_time) if span.start_time else None,
+        "end_time": ns_to_iso_str(span.end_time) if span.end_time else None,
+        "status": status,
+        "attributes": dict(span.attributes or {}),
+        "events": [
+            {
+                "name": event.name,
+                "timestamp": ns_to_iso_str(event.timestamp),
+                "attributes": dict(event.attributes or {}),
+            }
+            for event in span.events
+        ],
+        "links": [
+            {
+                "context": _format_context(link.context),
+                "attributes": dict(link.attributes or {}),
+            }
+            for link in span.links
+        ],
+        "resource": {
+            "attributes": dict(span.resource.attributes),
+            "schema_url": span.resource.schema_url,
+        },
+    }
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """
+    Writes spans as compact json lines from a background thread.
+
+    `export` only encodes the spans and puts them on a bounded queue,
+    spans are dropped and counted in `dropped_spans` when the queue is full,
+    so a slow stdout or disk never blocks the caller.
+    When writing to `path`, the file is rotated after `max_bytes`,
+    keeping `backup_count` files as `path.1` ... `path.N`.
+    """
+
+    def __init__(
+        self,
+        out: Optional[IO] = None,
+        path: Optional[str] = None,
+        max_bytes: int = 0,
+        backup_count: int = 5,
+        max_queue_size: int = 10000,
+        use_orjson: bool = True,
+    ) -> None:
+        if out is not None and path is not None:
+            raise ValueError("only one of out and path can be set")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped_spans = 0
+        self.written_spans = 0
+        self._dumps: Callable[[Any], bytes] = (
+            _dumps_orjson if use_orjson and orjson is not None else _dumps_json
+        )
+        self._out: Optional[IO] = out
+        self._file: Optional[IO[bytes]] = None
+        self._file_size = 0
+        if path is not None:
+            self._open_file()
+        elif out is None:
+            self._out = sys.stdout
+        self._queue: "queue.Queue[Union[bytes, threading.Event, object]]" = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._counter_lock = threading.Lock()
+        self._shutdown = False
+        self._worker = threading.Thread(
+            target=self._run, name="JsonLinesSpanExporter", daemon=True
+        )
+        self._worker.start()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if self._shutdown:
+            return SpanExportResult.FAILURE
+        dropped = 0
+        for span in spans:
+            try:
+                self._queue.put_nowait(self._dumps(span_to_dict(span)) + b"\n")
+            except queue.Full:
+                dropped += 1
+        if dropped:
+            with self._counter_lock:
+                self.dropped_spans += dropped
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        if self._shutdown:
+            return True
+        flushed = threading.Event()
+        try:
+            self._queue.put(flushed, timeout=timeout_millis / 1000)
+        except queue.Full:
+            return False
+        return flushed.wait(timeout_millis / 1000)
+
+    def shutdown(self, timeout_millis: int = 30000) -> None:
+        if self._shutdown:
+            return
+        self._shutdown = True
+        deadline = time.monotonic() + timeout_millis / 1000
+        try:
+            self._queue.put(_SHUTDOWN, timeout=timeout_millis / 1000)
+        except queue.Full:
+            logging.warning("span export queue is full, pending spans are dropped")
+        self._worker.join(max(deadline - time.monotonic(), 0))
+        if self._file is not None and not self._worker.is_alive():
+            self._file.close()
+
+    def _run(self) -> None:
+        while True:
+            items: List[Any] = [self._queue.get()]
+            # write everything queued meanwhile with a single write and flush
+            while len(items) < 1000:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [item for item in items if isinstance(item, bytes)]
+            if lines:
+                try:
+                    self._write(b"".join(lines))
+                    self.written_spans += len(lines)
+                except Exception as e:
+                    with self._counter_lock:
+                        self.dropped_spans += len(lines)
+                    logging.warning(f"failed to write spans: {e}")
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if _SHUTDOWN in items:
+                return
+
+    def _write(self, data: bytes) -> None:
+        if self._file is None:
+            self._out.write(data.decode("utf-8"))  # type: ignore
+            self._out.flush()  # type: ignore
+            return
+
+        if self.max_bytes > 0 and self._file_size + len(data) > self.max_bytes:
+            if self._file_size > 0:
+                self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._file_size += len(data)
+
+    def _open_file(self) -> None:
+        assert self.path is not None
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._file_size = self._file.tell()
+
+    def _rotate(self) -> None:
+        assert self.path is not None and self._file is not None
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open_file()
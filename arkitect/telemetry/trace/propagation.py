@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from opentelemetry import context as context_api
+from opentelemetry.trace.propagation.tracecontext import (
+    TraceContextTextMapPropagator,
+)
+
+from .wrapper import _current_span_context
+
+# always W3C trace context, whatever the globally configured propagator is
+_propagator = TraceContextTextMapPropagator()
+
+
+def inject_trace_context(carrier: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Adds `traceparent` and `tracestate` of the current span to the carrier,
+    e.g. http headers or the `_meta` of an MCP request.
+    Nothing is added when there is no recording span.
+    """
+    if carrier is None:
+        carrier = {}
+    _propagator.inject(carrier)
+    return carrier
+
+
+def extract_trace_context(
+    carrier: Optional[Mapping[str, Any]],
+) -> Optional[context_api.Context]:
+    """Returns the context continuing the trace of the carrier, if there is one"""
+    if not carrier or "traceparent" not in carrier:
+        return None
+    return _propagator.extract(carrier)
+
+
+@contextmanager
+def continue_trace(carrier: Optional[Mapping[str, Any]]) -> Iterator[None]:
+    """Spans started in this block, `task` ones included,
+    are children of the span in the carrier"""
+    ctx = extract_trace_context(carrier)
+    if ctx is None:
+        yield
+        return
+    token = context_api.attach(ctx)
+    span_token = _current_span_context.set(ctx)
+    try:
+        yield
+    finally:
+        _current_span_context.reset(span_token)
+        context_api.detach(token)
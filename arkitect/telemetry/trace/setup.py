@@ -22,14 +22,19 @@ from typing import IO, Optional
 
 from opentelemetry import trace
 from opentelemetry.sdk.resources import Resource, ResourceAttributes
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
 from opentelemetry.sdk.trace.export import (
     BatchSpanProcessor,
     ConsoleSpanExporter,
     SpanExporter,
 )
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
 from pydantic import BaseModel
 
+from .attributes import enable_deferred_attributes
+from .export import DeferredAttributesSpanExporter, TailSamplingSpanProcessor
+from .json_lines import JsonLinesSpanExporter
+
 
 class TraceConfig(BaseModel):
     # trace basic config
@@ -44,6 +49,29 @@ class TraceConfig(BaseModel):
     max_export_batch_size: Optional[int] = None
     export_timeout_millis: Optional[float] = None
 
+    # attribute & sampling config
+    deferred_attributes: bool = False
+    """
+    serialize span input/output on the exporter thread, only for exported spans.
+    Dicts, lists and models are copied shallowly when set; nested values are
+    read from the exporter thread, so mutating them after the span ended
+    changes what is exported. Attributes are held for at most max_queue_size
+    plus 10000 spans, older ones are evicted with a warning.
+    """
+    head_sample_rate: Optional[float] = None
+    """ratio of traces recorded, decided when the root span starts"""
+    tail_sample_rate: Optional[float] = None
+    """ratio of traces exported, decided when each span ends"""
+    slow_span_threshold_ms: Optional[float] = None
+    """spans slower than this are exported regardless of tail_sample_rate"""
+
+    # local exporter config, used when no endpoint is set
+    json_lines: bool = False
+    """write spans as compact json lines from a background thread"""
+    log_max_bytes: int = 0
+    """rotate the json lines trace log after this size, 0 to never rotate"""
+    log_backup_count: int = 5
+
     def __init__(
         self,
         ak: Optional[str] = None,
@@ -54,6 +82,13 @@ class TraceConfig(BaseModel):
         schedule_delay_millis: Optional[float] = None,
         max_export_batch_size: Optional[int] = None,
         export_timeout_millis: Optional[float] = None,
+        deferred_attributes: bool = False,
+        head_sample_rate: Optional[float] = None,
+        tail_sample_rate: Optional[float] = None,
+        slow_span_threshold_ms: Optional[float] = None,
+        json_lines: bool = False,
+        log_max_bytes: int = 0,
+        log_backup_count: int = 5,
     ):
         super().__init__(
             ak=ak or os.getenv("VOLC_ACCESSKEY", os.getenv("VOLC_ACCESS_KEY", "")),
@@ -64,6 +99,13 @@ class TraceConfig(BaseModel):
             schedule_delay_millis=schedule_delay_millis,
             max_export_batch_size=max_export_batch_size,
             export_timeout_millis=export_timeout_millis,
+            deferred_attributes=deferred_attributes,
+            head_sample_rate=head_sample_rate,
+            tail_sample_rate=tail_sample_rate,
+            slow_span_threshold_ms=slow_span_threshold_ms,
+            json_lines=json_lines,
+            log_max_bytes=log_max_bytes,
+            log_backup_count=log_backup_count,
         )
 
 
@@ -81,13 +123,9 @@ def setup_tracing(
     if provider is not None:
         return
 
-    exporter: SpanExporter = ConsoleSpanExporter(
-        out=_get_trace_log_file(log_dir),
-        formatter=lambda span: json.dumps(
-            json.loads(span.to_json()), ensure_ascii=False, indent=4
-        )
-        + linesep,
-    )
+    if not trace_config:
+        trace_config = TraceConfig()
+
     resource: Resource = Resource.create(
         {
             ResourceAttributes.SERVICE_NAME: "bot",
@@ -101,9 +139,7 @@ def setup_tracing(
     # Allowing for the implementation of a custom exporter.
     from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 
-    if not trace_config:
-        trace_config = TraceConfig()
-
+    exporter: SpanExporter
     if endpoint:
         headers = {
             "x-tls-otel-tracetopic": trace_config.topic or os.getenv("TRACE_TOPIC", ""),
@@ -116,20 +152,66 @@ def setup_tracing(
         }
         logging.info(f"initialize tls trace info: {headers}")
         exporter = OTLPSpanExporter(endpoint=endpoint, insecure=True, headers=headers)  # type: ignore
-
-    provider = TracerProvider(resource=resource)
-    provider.add_span_processor(
-        BatchSpanProcessor(
-            exporter,
-            max_queue_size=trace_config.max_queue_size,  # type: ignore
-            schedule_delay_millis=trace_config.schedule_delay_millis,  # type: ignore
-            max_export_batch_size=trace_config.max_export_batch_size,  # type: ignore
-            export_timeout_millis=trace_config.export_timeout_millis,  # type: ignore
+    elif trace_config.json_lines:
+        exporter = JsonLinesSpanExporter(
+            path=_get_trace_log_path(log_dir),
+            max_bytes=trace_config.log_max_bytes,
+            backup_count=trace_config.log_backup_count,
+        )
+    else:
+        exporter = ConsoleSpanExporter(
+            out=_get_trace_log_file(log_dir),
+            formatter=lambda span: json.dumps(
+                json.loads(span.to_json()), ensure_ascii=False, indent=4
+            )
+            + linesep,
         )
+
+    if trace_config.deferred_attributes:
+        exporter = DeferredAttributesSpanExporter(exporter)
+        enable_deferred_attributes(max_queue_size=trace_config.max_queue_size)
+
+    provider = TracerProvider(
+        resource=resource,
+        sampler=(
+            ParentBased(TraceIdRatioBased(trace_config.head_sample_rate))
+            if trace_config.head_sample_rate is not None
+            else None
+        ),
+    )
+    span_processor: SpanProcessor = BatchSpanProcessor(
+        exporter,
+        max_queue_size=trace_config.max_queue_size,  # type: ignore
+        schedule_delay_millis=trace_config.schedule_delay_millis,  # type: ignore
+        max_export_batch_size=trace_config.max_export_batch_size,  # type: ignore
+        export_timeout_millis=trace_config.export_timeout_millis,  # type: ignore
     )
+    if (
+        trace_config.tail_sample_rate is not None
+        or trace_config.slow_span_threshold_ms is not None
+    ):
+        span_processor = TailSamplingSpanProcessor(
+            span_processor,
+            sample_rate=(
+                trace_config.tail_sample_rate
+                if trace_config.tail_sample_rate is not None
+                else 1.0
+            ),
+            slow_span_threshold_ms=trace_config.slow_span_threshold_ms,
+        )
+    provider.add_span_processor(span_processor)
     trace.set_tracer_provider(provider)
 
 
+def flush_tracing(timeout_millis: int = 5000) -> bool:
+    """Exports the spans still buffered, called when the server shuts down"""
+    provider = trace.get_tracer_provider()
+    force_flush = getattr(provider, "force_flush", None)
+    if force_flush is None:
+        return True
+    return force_flush(timeout_millis)
+
+
 def _get_host_name() -> str:
     # default env key
     host_name = os.getenv("HOSTNAME", "")
@@ -139,14 +221,18 @@ def _get_host_name() -> str:
     return host_name
 
 
-def _get_trace_log_file(log_dir: Optional[str] = None) -> IO:
+def _get_trace_log_path(log_dir: Optional[str] = None) -> Optional[str]:
     if not log_dir:
-        return sys.stdout
+        return None
 
     timestr = datetime.now().strftime("%Y%m%d%H%M%S")
+    return os.path.join(log_dir, f"trace_{timestr}.log")
+
 
-    filename = f"trace_{timestr}.log"
-    filepath = os.path.join(log_dir, filename)
+def _get_trace_log_file(log_dir: Optional[str] = None) -> IO:
+    filepath = _get_trace_log_path(log_dir)
+    if filepath is None:
+        return sys.stdout
 
     try:
         os.makedirs(log_dir, exist_ok=True)
@@ -0,0 +1,101 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import time
+from typing import Any, List, Optional
+
+from opentelemetry.trace.span import Span
+
+from arkitect.utils.stream import StreamAccumulator
+
+# upper bounds in ms of the inter-chunk latency histogram buckets,
+# the last bucket count is for latencies above the largest bound
+INTER_CHUNK_BUCKETS_MS = (1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+
+
+class StreamAggregator:
+    """
+    Collects latency stats and the merged output of a stream,
+    to be recorded on its span once when the stream ends.
+    Chat completion chunks are merged into one chunk,
+    for other streams the last item is the output.
+    """
+
+    def __init__(self, keep_output: bool = True) -> None:
+        self.keep_output = keep_output
+        self.chunk_count = 0
+        self.start_ns = time.time_ns()
+        self.first_chunk_ns: Optional[int] = None
+        self._last_chunk_ns: Optional[int] = None
+        self._inter_chunk_max_ms = 0.0
+        self._inter_chunk_total_ms = 0.0
+        self._inter_chunk_counts: List[int] = [0] * (len(INTER_CHUNK_BUCKETS_MS) + 1)
+        self._last_item: Any = None
+        self._usage: Any = None
+        self._accumulator: Optional[StreamAccumulator] = None
+
+    def add(self, item: Any) -> None:
+        now = time.time_ns()
+        if self._last_chunk_ns is None:
+            self.first_chunk_ns = now
+        else:
+            latency_ms = (now - self._last_chunk_ns) / 1e6
+            self._inter_chunk_max_ms = max(self._inter_chunk_max_ms, latency_ms)
+            self._inter_chunk_total_ms += latency_ms
+            index = bisect.bisect_left(INTER_CHUNK_BUCKETS_MS, latency_ms)
+            self._inter_chunk_counts[index] += 1
+        self._last_chunk_ns = now
+        self.chunk_count += 1
+
+        if not self.keep_output:
+            return
+        self._last_item = item
+        if getattr(item, "usage", None) is not None:
+            self._usage = item.usage
+        if getattr(item, "choices", None):
+            if self._accumulator is None:
+                self._accumulator = StreamAccumulator()
+            self._accumulator.add(item)
+
+    def output(self) -> Any:
+        if not self.keep_output:
+            return ""
+        if self._accumulator is None:
+            return self._last_item
+        merged = self._accumulator.to_chunk()
+        if merged is not None and self._usage is not None:
+            merged.usage = self._usage
+        return merged
+
+    def record(self, span: Span) -> None:
+        span.set_attribute("stream.chunk_count", self.chunk_count)
+        if self.first_chunk_ns is None:
+            return
+        span.add_event("first_chunk", timestamp=self.first_chunk_ns)
+        span.set_attribute(
+            "stream.time_to_first_chunk_ms", (self.first_chunk_ns - self.start_ns) / 1e6
+        )
+        if self.chunk_count > 1:
+            span.set_attribute(
+                "stream.inter_chunk_ms.mean",
+                self._inter_chunk_total_ms / (self.chunk_count - 1),
+            )
+            span.set_attribute("stream.inter_chunk_ms.max", self._inter_chunk_max_ms)
+            span.set_attribute(
+                "stream.inter_chunk_ms.bucket_bounds", INTER_CHUNK_BUCKETS_MS
+            )
+            span.set_attribute(
+                "stream.inter_chunk_ms.bucket_counts", self._inter_chunk_counts
+            )
@@ -28,8 +28,10 @@ from typing import (
 )
 
 from opentelemetry import trace
+from opentelemetry.trace import NoOpTracerProvider, ProxyTracerProvider
 
 from arkitect.telemetry.trace.attributes import set_trace_attributes
+from arkitect.telemetry.trace.stream import StreamAggregator
 from arkitect.utils import aenumerate
 from arkitect.utils.context import (
     get_account_id,
@@ -47,6 +49,7 @@ _current_span_context: contextvars.ContextVar = contextvars.ContextVar(
 _current_span_context_req: contextvars.ContextVar = contextvars.ContextVar(
     "current_span_context_req", default=""
 )
+_tracer_provider_configured = False
 
 
 def get_remote_func(func):  # type: ignore
@@ -61,15 +64,50 @@ def get_remote_func(func):  # type: ignore
         )
 
 
+class _ArgBinder:
+    """
+    Maps positional args to parameter names for the recorded input,
+    the names are looked up once when the function is decorated.
+    """
+
+    __slots__ = ("names", "varargs")
+
+    def __init__(self, func: Callable) -> None:
+        code = getattr(inspect.unwrap(func), "__code__", None)
+        self.names: Optional[Tuple[str, ...]] = None
+        self.varargs: Optional[str] = None
+        if code is None:
+            return
+        self.names = code.co_varnames[: code.co_argcount]
+        if code.co_flags & inspect.CO_VARARGS:
+            self.varargs = code.co_varnames[code.co_argcount + code.co_kwonlyargcount]
+
+    def bind(self, args: Any, kwargs: Any) -> Dict[Any, Any]:
+        if kwargs is None:
+            kwargs = {}
+        if not args:
+            return kwargs
+        if self.names is None:
+            return {"args": args}
+        bound = {**kwargs, **dict(zip(self.names, args))}
+        if self.varargs is not None and len(args) > len(self.names):
+            bound[self.varargs] = tuple(args[len(self.names) :])
+        return bound
+
+
 def _update_kwargs(args: Any, kwargs: Any, func: Callable) -> Dict[Any, Any]:
-    if kwargs is None:
-        kwargs = {}
-    if args is None:
-        return kwargs
-    try:
-        return {**kwargs, **dict(zip(func.__code__.co_varnames, args))}
-    except Exception:
-        return {"args": args}
+    return _ArgBinder(func).bind(args, kwargs)
+
+
+def _tracing_enabled() -> bool:
+    # spans are no-ops until a tracer provider is configured,
+    # the global provider can only be set once
+    global _tracer_provider_configured
+    if not _tracer_provider_configured:
+        _tracer_provider_configured = not isinstance(
+            trace.get_tracer_provider(), (ProxyTracerProvider, NoOpTracerProvider)
+        )
+    return _tracer_provider_configured
 
 
 def task(
@@ -77,6 +115,8 @@ def task(
     watch_io: bool = True,
     trace_all: bool = True,
     custom_attributes: Optional[Dict[str, Any]] = None,
+    attribute_budget: Optional[int] = None,
+    aggregate_stream: bool = False,
 ) -> Any:
     """
     Decorator that wraps a function with tracing and exception handling.
@@ -86,10 +126,27 @@ def task(
         watch_io : Whether to watch input and output.
         trace_all : Whether to trace all iterations.
         custom_attributes : Custom attributes to add to the trace.
+        attribute_budget : Max length of each serialized input/output attribute.
+        aggregate_stream : For generators, record one span with the stream latency
+            stats and the merged output when the stream ends, instead of
+            spans per iteration. trace_all is ignored.
     """
 
     def task_wrapper(func):  # type: ignore
+        binder = _ArgBinder(func)
+        remote_func = None
+
+        def target() -> Callable:
+            nonlocal remote_func
+            if not distributed:
+                return func
+            if remote_func is None:
+                remote_func = get_remote_func(func)
+            return remote_func
+
         async def async_exec(*args: Any, **kwargs: Any) -> Any:
+            if not _tracing_enabled():
+                return await target()(*args, **kwargs)
             _init_trace_context()
 
             parent_ctx = _current_span_context.get(None)
@@ -98,11 +155,9 @@ def task(
             ) as span:
                 _current_span_context.set(trace.set_span_in_context(span))
 
-                input = _update_kwargs(args, kwargs, func)
+                input = binder.bind(args, kwargs) if watch_io else None
                 try:
-                    result = await (get_remote_func(func) if distributed else func)(
-                        *args, **kwargs
-                    )
+                    result = await target()(*args, **kwargs)
                     set_trace_attributes(
                         span,
                         status_code=trace.StatusCode.OK,
@@ -114,15 +169,20 @@ def task(
                         client_request_id=get_client_reqid(),
                         account_id=get_account_id(),
                         custom_attributes=custom_attributes,
+                        attribute_budget=attribute_budget,
                     )
 
                     _current_span_context.set(parent_ctx)
                     return result
                 except Exception as e:
+                    if input is None:
+                        input = binder.bind(args, kwargs)
                     handle_exception(span, e, input)
                     raise e
 
         def sync_exec(*args: Any, **kwargs: Any) -> Any:
+            if not _tracing_enabled():
+                return func(*args, **kwargs)
             _init_trace_context()
 
             parent_ctx = _current_span_context.get(None)
@@ -131,7 +191,7 @@ def task(
             ) as span:
                 _current_span_context.set(trace.set_span_in_context(span))
 
-                input = _update_kwargs(args, kwargs, func)
+                input = binder.bind(args, kwargs) if watch_io else None
                 try:
                     result = func(*args, **kwargs)
                     set_trace_attributes(
@@ -145,26 +205,33 @@ def task(
                         client_request_id=get_client_reqid(),
                         account_id=get_account_id(),
                         custom_attributes=custom_attributes,
+                        attribute_budget=attribute_budget,
                     )
 
                     _current_span_context.set(parent_ctx)
                     return result
                 except Exception as e:
+                    if input is None:
+                        input = binder.bind(args, kwargs)
                     handle_exception(span, e, input)
                     raise e
 
         @wraps(func)
         async def async_iter_task(*args: Any, **kwargs: Any) -> AsyncGenerator[T, None]:
+            if not _tracing_enabled():
+                async for resp in func(*args, **kwargs):
+                    yield resp
+                return
             _init_trace_context()
 
             root_parent_ctx, root_span = _get_span_with_context(
                 func.__qualname__ + ".root"
             )
             last_resp = None
-            input = _update_kwargs(args, kwargs, func)
+            input = binder.bind(args, kwargs)
 
             async def iter_entry() -> AsyncGenerator[T, None]:
-                parent_ctx = _current_span_context.get()
+                parent_ctx = _current_span_context.get(None)
                 span = tracer.start_span(
                     name=func.__qualname__ + ".first_iter",
                     start_time=time.time_ns(),
@@ -186,6 +253,7 @@ def task(
                                 account_id=get_account_id(),
                                 merge_output=True,
                                 custom_attributes=custom_attributes,
+                                attribute_budget=attribute_budget,
                             )
                             if i == 0:
                                 span.end(end_time=time.time_ns())
@@ -227,21 +295,25 @@ def task(
                     account_id=get_account_id(),
                     merge_output=True,
                     custom_attributes=custom_attributes,
+                    attribute_budget=attribute_budget,
                 )
                 _return_span_with_context(root_parent_ctx, root_span)
 
         @wraps(func)
         def iter_task(*args: Any, **kwargs: Any) -> Iterable[T]:
+            if not _tracing_enabled():
+                yield from func(*args, **kwargs)
+                return
             _init_trace_context()
 
             root_parent_ctx, root_span = _get_span_with_context(
                 func.__qualname__ + ".root"
             )
             last_resp = None
-            input = _update_kwargs(args, kwargs, func)
+            input = binder.bind(args, kwargs)
 
             def iter_entry() -> Iterable[T]:
-                parent_ctx = _current_span_context.get()
+                parent_ctx = _current_span_context.get(None)
                 span = tracer.start_span(
                     name=func.__qualname__ + ".first_iter",
                     start_time=time.time_ns(),
@@ -263,6 +335,7 @@ def task(
                                 account_id=get_account_id(),
                                 merge_output=True,
                                 custom_attributes=custom_attributes,
+                                attribute_budget=attribute_budget,
                             )
                             if i == 0:
                                 span.end(end_time=time.time_ns())
@@ -293,6 +366,7 @@ def task(
                         account_id=get_account_id(),
                         merge_output=True,
                         custom_attributes=custom_attributes,
+                        attribute_budget=attribute_budget,
                     )
                     _return_span_with_context(parent_ctx, span)
 
@@ -305,10 +379,79 @@ def task(
             finally:
                 _return_span_with_context(root_parent_ctx, root_span)
 
+        def record_stream(
+            span: Any, aggregator: StreamAggregator, input: Any, failed: bool
+        ) -> None:
+            aggregator.record(span)
+            if failed:
+                return
+            set_trace_attributes(
+                span,
+                status_code=trace.StatusCode.OK,
+                input=input if watch_io else "",
+                output=aggregator.output(),
+                resource_type=get_resource_type(),
+                resource_id=get_resource_id(),
+                request_id=get_reqid(),
+                client_request_id=get_client_reqid(),
+                account_id=get_account_id(),
+                custom_attributes=custom_attributes,
+                attribute_budget=attribute_budget,
+            )
+
+        @wraps(func)
+        async def async_aggregated_iter_task(
+            *args: Any, **kwargs: Any
+        ) -> AsyncGenerator[T, None]:
+            if not _tracing_enabled():
+                async for resp in func(*args, **kwargs):
+                    yield resp
+                return
+            _init_trace_context()
+
+            parent_ctx, span = _get_span_with_context(func.__qualname__)
+            input = binder.bind(args, kwargs)
+            aggregator = StreamAggregator(keep_output=watch_io)
+            failed = False
+            try:
+                async for resp in func(*args, **kwargs):
+                    aggregator.add(resp)
+                    yield resp
+            except Exception as e:
+                failed = True
+                handle_exception(span, e, input)
+                raise e
+            finally:
+                record_stream(span, aggregator, input, failed)
+                _return_span_with_context(parent_ctx, span)
+
+        @wraps(func)
+        def aggregated_iter_task(*args: Any, **kwargs: Any) -> Iterable[T]:
+            if not _tracing_enabled():
+                yield from func(*args, **kwargs)
+                return
+            _init_trace_context()
+
+            parent_ctx, span = _get_span_with_context(func.__qualname__)
+            input = binder.bind(args, kwargs)
+            aggregator = StreamAggregator(keep_output=watch_io)
+            failed = False
+            try:
+                for resp in func(*args, **kwargs):
+                    aggregator.add(resp)
+                    yield resp
+            except Exception as e:
+                failed = True
+                handle_exception(span, e, input)
+                raise e
+            finally:
+                record_stream(span, aggregator, input, failed)
+                _return_span_with_context(parent_ctx, span)
+
         if inspect.isasyncgenfunction(func):
-            return async_iter_task
+            return async_aggregated_iter_task if aggregate_stream else async_iter_task
         elif inspect.isgeneratorfunction(func):
-            return iter_task
+            return aggregated_iter_task if aggregate_stream else iter_task
         elif inspect.iscoroutinefunction(func) or distributed:
             return async_exec
         else:
@@ -340,7 +483,7 @@ def _init_trace_context() -> None:
 
 
 def _get_span_with_context(name: str) -> Tuple[Any, Any]:
-    parent_ctx = _current_span_context.get()
+    parent_ctx = _current_span_context.get(None)
     span = tracer.start_span(
         name=name,
         start_time=time.time_ns(),
@@ -15,6 +15,7 @@
 from .asyncio import AsyncTimedIterable, aenumerate, anext, gather
 from .json import dump_json_str, dump_json_str_truncate, dump_json_truncate
 from .merge import dict_merge, list_item_merge
+from .stream import StreamAccumulator
 
 __all__ = [
     "AsyncTimedIterable",
@@ -26,4 +27,5 @@ __all__ = [
     "dump_json_str",
     "dump_json_str_truncate",
     "dump_json_truncate",
+    "StreamAccumulator",
 ]
@@ -133,6 +133,17 @@ def get_req_source_type(default_val: str = "") -> str:
     return _req_source_type.get(default_val)
 
 
+_timeline: contextvars.ContextVar[Any] = contextvars.ContextVar("_timeline")
+
+
+def set_timeline(val: Any) -> None:
+    _timeline.set(val)
+
+
+def get_timeline(default_val: Any = None) -> Any:
+    return _timeline.get(default_val)
+
+
 HEADERS_WHITE_LIST = {
     "authorization": "Authorization",
     "x-account-id": "X-Account-Id",
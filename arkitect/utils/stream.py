@@ -0,0 +1,97 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict, List, Optional, Type
+
+from volcenginesdkarkruntime.types.chat.chat_completion_chunk import (
+    ChoiceDeltaToolCall,
+)
+
+
+class StreamAccumulator:
+    """
+    Accumulates the first choice of streamed chat completion chunks.
+
+    Content is kept as a list of parts and tool call arguments as fragments
+    per tool call index, they are joined once when the result is read,
+    so accumulating n chunks costs O(n) instead of O(n^2).
+    Chunks passed to `add` are never modified.
+    Chunks are duck typed, so that this module imports no arkitect models.
+    """
+
+    def __init__(self) -> None:
+        self._content_parts: List[str] = []
+        self._tool_calls: Dict[int, ChoiceDeltaToolCall] = {}
+        self._argument_parts: Dict[int, List[str]] = {}
+        self.last_chunk: Optional[Any] = None
+        self.finish_reason: Optional[str] = None
+
+    def add(self, chunk: Any) -> None:
+        if not chunk.choices:
+            return
+        self.last_chunk = chunk
+        choice = chunk.choices[0]
+        delta = choice.delta
+        if delta.content:
+            self._content_parts.append(delta.content)
+        for tool_call in delta.tool_calls or []:
+            index = tool_call.index
+            if index not in self._tool_calls:
+                self._tool_calls[index] = tool_call
+                self._argument_parts[index] = []
+            if tool_call.function and tool_call.function.arguments:
+                self._argument_parts[index].append(tool_call.function.arguments)
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+
+    @property
+    def content(self) -> str:
+        if len(self._content_parts) > 1:
+            self._content_parts[:] = ["".join(self._content_parts)]
+        return self._content_parts[0] if self._content_parts else ""
+
+    @property
+    def tool_calls(self) -> List[ChoiceDeltaToolCall]:
+        tool_calls = []
+        for index, tool_call in self._tool_calls.items():
+            tool_call = tool_call.model_copy(deep=True)
+            if tool_call.function is not None:
+                tool_call.function.arguments = "".join(self._argument_parts[index])
+            tool_calls.append(tool_call)
+        return tool_calls
+
+    def to_chunk(self, chunk_cls: Optional[Type[Any]] = None) -> Optional[Any]:
+        """
+        Returns the last chunk with the accumulated content and tool calls,
+        None if no chunk with choices was added.
+
+        Args:
+            chunk_cls: class of the returned chunk, the class of the last
+                chunk by default.
+        """
+        if self.last_chunk is None:
+            return None
+        choice = self.last_chunk.choices[0]
+        delta = choice.delta.model_copy(
+            update={
+                "content": self.content,
+                "tool_calls": self.tool_calls or None,
+            }
+        )
+        return (chunk_cls or type(self.last_chunk))(
+            **{
+                **self.last_chunk.__dict__,
+                "choices": [choice.model_copy(update={"delta": delta})],
+            }
+        )
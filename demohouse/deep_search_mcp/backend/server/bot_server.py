@@ -17,7 +17,7 @@ from arkitect.telemetry.trace import task, TraceConfig
 from arkitect.types.llm.model import ArkChatRequest, ArkChatCompletionChunk
 from models.request import DeepResearchRequest
 
-from server.server import event_handler
+from server.server import event_handler, get_shared_mcp_registry
 from utils.message import get_last_message
 from utils.converter import convert_event_to_bot_chunk
 
@@ -67,4 +67,5 @@ if __name__ == "__main__":
         trace_on=True,
         trace_config=TraceConfig(),
         clients={},
+        mcp_registry=get_shared_mcp_registry(),
     )
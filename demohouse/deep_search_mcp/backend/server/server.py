@@ -13,8 +13,7 @@ import uuid
 from typing import AsyncIterable, Tuple, Callable, Dict, AsyncIterator, Any
 
 from agent.worker import Worker
-from arkitect.core.component.tool import MCPClient
-from arkitect.core.component.tool.builder import build_mcp_clients_from_config
+from arkitect.core.component.tool import MCPClient, MCPRegistry, get_mcp_registry
 from arkitect.core.errors import (
     ResourceNotFound,
     InternalServiceError,
@@ -46,15 +45,17 @@ from tools.hooks import (
     TLSPostToolCallHook,
 )
 
+def get_shared_mcp_registry() -> MCPRegistry:
+    """
+    MCP clients shared by all sessions, created on first call and
+    connected when the server starts.
+    """
+    return get_mcp_registry(config_file=MCP_CONFIG_FILE_PATH, pool_size=2)
+
 
 async def _run_deep_research(
     state_manager: DeepSearchStateManager, max_plannings: int
 ) -> AsyncIterable[BaseEvent]:
-    # init mcp client
-    mcp_clients, clean_up = build_mcp_clients_from_config(
-        config_file=MCP_CONFIG_FILE_PATH,
-    )
-
     dr_state = await state_manager.load()
 
     if not dr_state:
@@ -66,24 +67,23 @@ async def _run_deep_research(
         return
 
     try:
-        dr = DeepSearch(
-            supervisor_llm_model=SUPERVISOR_LLM_MODEL,
-            summary_llm_model=SUMMARY_LLM_MODEL,
-            workers=get_workers(GlobalState(custom_state=dr_state), mcp_clients),
-            dynamic_planning=False,
-            max_planning_items=max_plannings,
-            state_manager=state_manager,
-        )
+        async with get_shared_mcp_registry().session() as mcp_clients:
+            dr = DeepSearch(
+                supervisor_llm_model=SUPERVISOR_LLM_MODEL,
+                summary_llm_model=SUMMARY_LLM_MODEL,
+                workers=get_workers(GlobalState(custom_state=dr_state), mcp_clients),
+                dynamic_planning=False,
+                max_planning_items=max_plannings,
+                state_manager=state_manager,
+            )
 
-        async for event in dr.astream(
-            dr_state=dr_state,
-        ):
-            yield event
+            async for event in dr.astream(
+                dr_state=dr_state,
+            ):
+                yield event
     except BaseException as e:
         ERROR(str(e))
         yield ErrorEvent(api_exception=InternalServiceError(message=str(e)))
-    finally:
-        await clean_up()
 
 
 # @task()
@@ -222,4 +222,5 @@ if __name__ == "__main__":
         trace_on=True,
         trace_config=TraceConfig(),
         clients={},
+        mcp_registry=get_shared_mcp_registry(),
     )
@@ -0,0 +1,91 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Per-chunk overhead of ListenDisconnectionMiddleware on a streamed response
+of 100k body chunks, and per-request overhead on non streaming requests,
+with DEBUG logging disabled.
+
+usage: python tests/benchmark/bench_disconnect_middleware.py
+"""
+
+import asyncio
+import logging
+import time
+
+from arkitect.core.component.bot.middleware import ListenDisconnectionMiddleware
+
+CHUNKS = 100_000
+REQUESTS = 20_000
+SCOPE = {"type": "http", "method": "POST", "path": "/"}
+
+
+def _receiver():  # type: ignore
+    received = False
+    never = asyncio.Event()
+
+    async def receive() -> dict:
+        nonlocal received
+        if received:
+            # the client stays connected
+            await never.wait()
+        received = True
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    return receive
+
+
+async def _send(message: dict) -> None:
+    pass
+
+
+async def stream_app(scope, receive, send) -> None:  # type: ignore
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    chunk = {"type": "http.response.body", "body": b"data: {}\n\n", "more_body": True}
+    for _ in range(CHUNKS):
+        await send(chunk)
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def unary_app(scope, receive, send) -> None:  # type: ignore
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    for name, app in [
+        ("no middleware", stream_app),
+        ("middleware", ListenDisconnectionMiddleware(stream_app)),
+    ]:
+        start = time.perf_counter()
+        await app(SCOPE, _receiver(), _send)
+        elapsed = time.perf_counter() - start
+        print(f"stream, {name:<16} {elapsed / CHUNKS * 1e9:8.0f} ns/chunk")
+
+    for name, app in [
+        ("no middleware", unary_app),
+        ("middleware", ListenDisconnectionMiddleware(unary_app)),
+    ]:
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            await app(SCOPE, _receiver(), _send)
+        elapsed = time.perf_counter() - start
+        print(f"unary, {name:<17} {elapsed / REQUESTS * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Spans/sec of the pretty printing ConsoleSpanExporter formatter used by
+setup_tracing compared with JsonLinesSpanExporter, writing to a file.
+`export` is the time spent by the caller, `total` includes the writes.
+
+usage: python tests/benchmark/bench_json_lines_exporter.py
+"""
+
+import json
+import os
+import tempfile
+import time
+from os import linesep
+from typing import Any, Callable, List
+
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SpanExporter
+
+from arkitect.telemetry.trace import JsonLinesSpanExporter
+
+SPANS = 20_000
+BATCH = 512
+
+
+def _spans() -> List[ReadableSpan]:
+    tracer = TracerProvider().get_tracer(__name__)
+    spans = []
+    for i in range(SPANS):
+        span = tracer.start_span(f"task-{i}")
+        span.set_attribute("input", json.dumps({"messages": ["你好" * 50] * 4}))
+        span.set_attribute("output", "x" * 1000)
+        span.set_attribute("request_id", "0217xxxxxxxxxxxxxxxx")
+        span.end()
+        spans.append(span)
+    return spans
+
+
+def _bench(name: str, make: Callable[[str], SpanExporter], spans: List[Any]) -> None:
+    with tempfile.TemporaryDirectory() as log_dir:
+        exporter = make(os.path.join(log_dir, "trace.log"))
+        start = time.perf_counter()
+        for i in range(0, len(spans), BATCH):
+            exporter.export(spans[i : i + BATCH])
+        exported = time.perf_counter() - start
+        exporter.force_flush()
+        total = time.perf_counter() - start
+        exporter.shutdown()
+    print(
+        f"{name:<28} export {len(spans) / exported:>9.0f} spans/s"
+        f"   total {len(spans) / total:>9.0f} spans/s"
+    )
+
+
+def main() -> None:
+    spans = _spans()
+    _bench(
+        "console, pretty formatter",
+        lambda path: ConsoleSpanExporter(
+            out=open(path, "w", encoding="utf-8"),
+            formatter=lambda span: (
+                json.dumps(json.loads(span.to_json()), ensure_ascii=False, indent=4)
+                + linesep
+            ),
+        ),
+        spans,
+    )
+    _bench(
+        "json lines, json",
+        lambda path: JsonLinesSpanExporter(
+            path=path, max_queue_size=SPANS, use_orjson=False
+        ),
+        spans,
+    )
+    _bench(
+        "json lines, orjson",
+        lambda path: JsonLinesSpanExporter(path=path, max_queue_size=SPANS),
+        spans,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Throughput of MCPClient.execute_tool against a local stdio MCP server
+whose tool takes 50ms, for different max_concurrent_calls.
+
+usage: python tests/benchmark/bench_mcp_client.py
+"""
+
+import asyncio
+import os
+import time
+
+from arkitect.core.component.tool import MCPClient
+
+SERVER = os.path.join(os.path.dirname(__file__), "slow_mcp_server.py")
+CALLS = 100
+
+
+async def bench(max_concurrent_calls: int) -> float:
+    client = MCPClient(
+        command="python",
+        arguments=[SERVER],
+        max_concurrent_calls=max_concurrent_calls,
+    )
+    await client.connect_to_server()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            client.execute_tool("slow_echo", {"text": str(i), "seconds": 0.05})
+            for i in range(CALLS)
+        ]
+    )
+    elapsed = time.perf_counter() - start
+    await client.cleanup()
+    return CALLS / elapsed
+
+
+async def main() -> None:
+    print("max_concurrent_calls\tcalls/s")
+    for concurrency in [1, 2, 4, 8, 16, 32]:
+        print(f"{concurrency}\t{await bench(concurrency):.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Chunks per second on one core of the sse encoding done by
+ChatAsyncRunner.astream and CustomAsyncRunner.astream.
+
+usage: python tests/benchmark/bench_sse_encoder.py
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterable, Callable
+
+from arkitect.core.runtime import (
+    ChatAsyncRunner,
+    CustomAsyncRunner,
+    Request,
+    Response,
+    SSEEncoder,
+)
+from arkitect.types.llm.model import ArkChatCompletionChunk
+
+CHUNKS = 50_000
+
+CHUNK = ArkChatCompletionChunk.model_validate(
+    {
+        "id": "chatcmpl-0217000000000000000000000000000000000000000000",
+        "object": "chat.completion.chunk",
+        "created": 1700000000,
+        "model": "doubao-1-5-pro-32k-250115",
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"role": "assistant", "content": "你好"},
+                "finish_reason": None,
+            }
+        ],
+    }
+)
+DICT_CHUNK = CHUNK.model_dump(exclude_none=True)
+
+
+def _bench(name: str, fn: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    for _ in range(CHUNKS):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<40} {CHUNKS / elapsed:10.0f} chunks/s")
+
+
+async def _bench_runner(name: str, runner: Any) -> None:
+    start = time.perf_counter()
+    async for _ in runner.astream(Request()):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"{name:<40} {CHUNKS / elapsed:10.0f} chunks/s")
+
+
+async def chat(request: Request) -> AsyncIterable[ArkChatCompletionChunk]:
+    for _ in range(CHUNKS):
+        yield CHUNK
+
+
+async def custom(request: Request) -> AsyncIterable[dict]:
+    for _ in range(CHUNKS):
+        yield DICT_CHUNK
+
+
+def main() -> None:
+    encoder = SSEEncoder()
+    _bench(
+        "model_dump_json (previous)",
+        lambda: f"data:{CHUNK.model_dump_json(exclude_none=True)}\r\n\r\n",
+    )
+    _bench("SSEEncoder model", lambda: encoder.encode(CHUNK))
+    _bench(
+        "json.dumps dict (previous)",
+        lambda: f"data:{json.dumps(DICT_CHUNK, ensure_ascii=False)}\r\n\r\n",
+    )
+    _bench("SSEEncoder dict", lambda: encoder.encode(DICT_CHUNK))
+    asyncio.run(_bench_runner("ChatAsyncRunner.astream", ChatAsyncRunner(chat)))
+    asyncio.run(
+        _bench_runner(
+            "CustomAsyncRunner.astream dict", CustomAsyncRunner(Response, custom)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
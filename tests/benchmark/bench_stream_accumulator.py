@@ -0,0 +1,119 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cost of accumulating a streamed response of 10k content chunks followed by
+a tool call split into 1k argument fragments, comparing StreamAccumulator
+with the previous attribute `+=` and ArkChatCompletionChunk.merge approach.
+
+usage: python tests/benchmark/bench_stream_accumulator.py
+"""
+
+import time
+from typing import Any, List
+
+from volcenginesdkarkruntime.types.chat import ChatCompletionChunk
+from volcenginesdkarkruntime.types.chat.chat_completion_message import (
+    ChatCompletionMessage,
+)
+
+from arkitect.utils.stream import StreamAccumulator
+from arkitect.types.llm.model import ArkChatCompletionChunk
+
+CONTENT_CHUNKS = 10_000
+ARGUMENT_CHUNKS = 1_000
+
+
+def _chunk(delta: dict, finish_reason: Any = None) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "1",
+            "created": 0,
+            "model": "m",
+            "object": "chat.completion.chunk",
+            "service_tier": "default",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+    )
+
+
+def build_chunks() -> List[ChatCompletionChunk]:
+    chunks = [_chunk({"content": "token "}) for _ in range(CONTENT_CHUNKS)]
+    chunks.append(
+        _chunk(
+            {
+                "content": "",
+                "tool_calls": [
+                    {
+                        "index": 0,
+                        "id": "call_0",
+                        "type": "function",
+                        "function": {"name": "search", "arguments": ""},
+                    }
+                ],
+            }
+        )
+    )
+    chunks += [
+        _chunk(
+            {
+                "content": "",
+                "tool_calls": [{"index": 0, "function": {"arguments": "xx"}}],
+            }
+        )
+        for _ in range(ARGUMENT_CHUNKS)
+    ]
+    chunks.append(_chunk({"content": ""}, finish_reason="tool_calls"))
+    return chunks
+
+
+def previous(chunks: List[ChatCompletionChunk]) -> None:
+    message = ChatCompletionMessage(role="assistant", content="")
+    final_tool_calls: dict = {}
+    for chunk in chunks:
+        delta = chunk.choices[0].delta
+        if delta.content:
+            message.content += delta.content
+        for tool_call in delta.tool_calls or []:
+            if tool_call.index not in final_tool_calls:
+                final_tool_calls[tool_call.index] = tool_call.model_copy(deep=True)
+            else:
+                final_tool_calls[
+                    tool_call.index
+                ].function.arguments += tool_call.function.arguments
+    ArkChatCompletionChunk.merge(chunks)
+
+
+def accumulator(chunks: List[ChatCompletionChunk]) -> None:
+    acc = StreamAccumulator()
+    for chunk in chunks:
+        acc.add(chunk)
+    _ = acc.content, acc.tool_calls
+    acc.to_chunk()
+
+
+def bench(fn: Any, chunks: List[ChatCompletionChunk], rounds: int = 5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(chunks)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    chunks = build_chunks()
+    print(f"{len(chunks)} chunks")
+    for name, fn in [("previous", previous), ("StreamAccumulator", accumulator)]:
+        print(f"{name:>18}: {bench(fn, chunks) * 1000:8.2f} ms")
@@ -0,0 +1,85 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Per-call overhead of @task on a trivial function, without a tracer provider
+and with one exporting to a no-op exporter.
+
+usage: python tests/benchmark/bench_task.py
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from arkitect.telemetry.trace import task
+
+CALLS = 20_000
+
+
+class _NoopExporter(SpanExporter):
+    def export(self, spans: Sequence[Any]) -> SpanExportResult:
+        return SpanExportResult.SUCCESS
+
+
+def plain(request: str, config: dict, extra: Any = None) -> str:
+    return request
+
+
+traced = task()(plain)
+
+
+@task()
+async def traced_async(request: str, config: dict, extra: Any = None) -> str:
+    return request
+
+
+def _bench(name: str, fn: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {elapsed / CALLS * 1e6:8.2f} us/call")
+
+
+async def _bench_async(name: str) -> None:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await traced_async("hi", {})
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {elapsed / CALLS * 1e6:8.2f} us/call")
+
+
+def main() -> None:
+    _bench("undecorated", lambda: plain("hi", {}))
+    _bench("@task, no tracer provider", lambda: traced("hi", {}))
+    asyncio.run(_bench_async("async @task, no tracer provider"))
+
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(_NoopExporter()))
+    trace.set_tracer_provider(provider)
+    _bench("@task, traced", lambda: traced("hi", {}))
+    asyncio.run(_bench_async("async @task, traced"))
+
+
+if __name__ == "__main__":
+    main()
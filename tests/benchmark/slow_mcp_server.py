@@ -0,0 +1,36 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP()
+
+
+@server.tool()
+async def slow_echo(text: str, seconds: float = 0.05) -> str:
+    """Echo the text after waiting, stands in for a search tool
+    Args:
+        text (str): text to echo
+        seconds (float): seconds to wait
+    Returns:
+        str: the text
+    """
+    await asyncio.sleep(seconds)
+    return text
+
+
+if __name__ == "__main__":
+    server.run()
@@ -0,0 +1,129 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Uniqueness of the x-request-id generated by LogIdMiddleware across
+uvicorn workers and spawned processes, and the cost of each log id generator.
+
+usage: python tests/benchmark/stress_log_id.py [random|fast]
+"""
+
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import timeit
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+
+from arkitect.core.component.bot.middleware import LogIdMiddleware
+from arkitect.telemetry.logger import get_log_id_generator
+
+PORT = 18089
+WORKERS = 4
+REQUESTS = 20_000
+CONCURRENCY = 64
+IDS_PER_PROCESS = 50_000
+
+app = FastAPI()
+app.add_middleware(LogIdMiddleware)
+
+
+@app.get("/")
+async def index() -> dict:
+    return {}
+
+
+async def _request_ids() -> list:
+    ids = []
+    limits = httpx.Limits(max_connections=CONCURRENCY)
+    async with httpx.AsyncClient(limits=limits) as client:
+        queue = iter(range(REQUESTS))
+
+        async def worker() -> None:
+            for _ in queue:
+                response = await client.get(f"http://127.0.0.1:{PORT}/")
+                ids.append(response.headers["x-request-id"])
+
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return ids
+
+
+def _generate(n: int) -> List[str]:
+    return [get_log_id_generator()() for _ in range(n)]
+
+
+def _spawned_ids() -> List[str]:
+    # spawned processes share no state with the parent, unlike forked ones
+    ids = _generate(IDS_PER_PROCESS)
+    with multiprocessing.get_context("spawn").Pool(WORKERS) as pool:
+        results = pool.map(_generate, [IDS_PER_PROCESS] * WORKERS)
+    return ids + [log_id for process_ids in results for log_id in process_ids]
+
+
+def _wait_ready(timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/")
+            # give the other workers time to start accepting too
+            time.sleep(2)
+            return
+        except httpx.ConnectError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+
+
+def main() -> None:
+    name = sys.argv[1] if len(sys.argv) > 1 else "fast"
+    generator = get_log_id_generator(name)
+    cost = timeit.timeit(generator, number=100_000) / 100_000
+    print(f"{name}: {cost * 1e6:.2f} us per id")
+
+    os.environ["LOG_ID_GENERATOR"] = name
+    ids = _spawned_ids()
+    print(f"{len(ids)} ids, {len(ids) - len(set(ids))} duplicates across processes")
+
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "stress_log_id:app",
+            "--port",
+            str(PORT),
+            "--workers",
+            str(WORKERS),
+            "--log-level",
+            "warning",
+        ],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env={**os.environ, "LOG_ID_GENERATOR": name},
+    )
+    try:
+        _wait_ready()
+        ids = asyncio.run(_request_ids())
+    finally:
+        server.terminate()
+        server.wait()
+    print(f"{len(ids)} requests, {len(ids) - len(set(ids))} duplicate log ids")
+
+
+if __name__ == "__main__":
+    main()
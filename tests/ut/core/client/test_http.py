@@ -0,0 +1,114 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import fastapi
+import pytest
+
+from arkitect.core.client import (
+    ArkClientConfig,
+    close_ark_clients,
+    configure_ark_clients,
+    default_ark_client,
+    default_sync_ark_client,
+    get_request_loader,
+    load_request,
+)
+from arkitect.core.component.llm import ArkChatRequest
+from arkitect.core.errors import APIException, InvalidParameter
+
+
+@pytest.fixture(autouse=True)
+def ark_api_key(monkeypatch):
+    monkeypatch.setenv("ARK_API_KEY", "-")
+
+
+async def test_ark_clients_are_shared():
+    configure_ark_clients(ArkClientConfig(max_connections=8))
+    client = default_ark_client()
+    assert default_ark_client() is client
+    assert client._client._transport._pool._max_connections == 8
+
+    sync_client = default_sync_ark_client()
+    assert default_sync_ark_client() is sync_client
+
+    await close_ark_clients()
+    assert client.is_closed()
+    assert sync_client.is_closed()
+    assert default_ark_client() is not client
+    assert default_sync_ark_client() is not sync_client
+    await close_ark_clients()
+    configure_ark_clients(ArkClientConfig())
+
+
+def _http_request(body: bytes, chunk_size: int = 1 << 16, length: int = -1):
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks
+    ]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive():
+        return messages.pop(0)
+
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body) if length < 0 else length).encode()),
+    ]
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": headers}
+    return fastapi.Request(scope, receive)
+
+
+def _chat_body(image_size: int) -> bytes:
+    image = "data:image/png;base64," + "A" * image_size
+    return json.dumps(
+        {
+            "model": "m",
+            "stream": True,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": "describe"},
+                        {"type": "image_url", "image_url": {"url": image}},
+                    ],
+                }
+            ],
+        }
+    ).encode()
+
+
+async def test_load_request_small_and_large_bodies():
+    assert get_request_loader(ArkChatRequest) is get_request_loader(ArkChatRequest)
+    for size in [10, 200_000]:
+        body = _chat_body(size)
+        request = await load_request(_http_request(body), ArkChatRequest)
+        assert request == ArkChatRequest.model_validate_json(body)
+        assert request.stream
+
+
+async def test_load_request_large_body_errors():
+    body = _chat_body(200_000)
+    with pytest.raises(InvalidParameter):
+        await load_request(_http_request(body, length=len(body) - 1), ArkChatRequest)
+    with pytest.raises(InvalidParameter):
+        await load_request(_http_request(body, length=len(body) + 1), ArkChatRequest)
+    with pytest.raises(APIException):
+        await load_request(_http_request(body[:-1] + b"]"), ArkChatRequest)
+    with pytest.raises(APIException):
+        await load_request(
+            _http_request(body.replace(b'"stream": true', b'"stream": []')),
+            ArkChatRequest,
+        )
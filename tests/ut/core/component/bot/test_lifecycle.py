@@ -0,0 +1,152 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import signal
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterable, AsyncIterator, List
+
+import uvicorn
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from arkitect.core.component.bot import BotServer
+from arkitect.core.component.bot.lifecycle import (
+    DrainingServer,
+    Lifecycle,
+    LifecycleState,
+)
+from arkitect.core.runtime import ChatAsyncRunner
+
+
+async def main(request: Any) -> AsyncIterable[Any]:
+    yield None
+
+
+def test_readiness_and_shutdown_order() -> None:
+    calls: List[str] = []
+
+    async def warm_up() -> None:
+        calls.append("startup")
+
+    async def first() -> None:
+        calls.append("first")
+
+    async def failing() -> None:
+        raise RuntimeError("boom")
+
+    async def last() -> None:
+        calls.append("last")
+
+    server = BotServer(
+        runner=ChatAsyncRunner(runnable_func=main),
+        startup_hooks=[warm_up],
+        shutdown_hooks=[last, failing, first],
+    )
+    assert server.lifecycle.state == LifecycleState.STARTING
+
+    with TestClient(server.app) as client:
+        assert calls == ["startup"]
+        assert client.get("/readyz").json() == {"status": "ready"}
+        assert client.get("/livez").status_code == 200
+
+        server.lifecycle.start_draining()
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json() == {"status": "draining"}
+        assert client.get("/livez").status_code == 200
+
+    assert calls == ["startup", "first", "last"]
+    assert server.lifecycle.state == LifecycleState.STOPPED
+
+
+def test_custom_app_runs_hooks() -> None:
+    calls: List[str] = []
+
+    @asynccontextmanager
+    async def app_lifespan(app: FastAPI) -> AsyncIterator[None]:
+        calls.append("app startup")
+        yield
+        calls.append("app shutdown")
+
+    async def warm_up() -> None:
+        calls.append("startup")
+
+    async def close() -> None:
+        calls.append("shutdown")
+
+    server = BotServer(
+        runner=ChatAsyncRunner(runnable_func=main),
+        app=FastAPI(lifespan=app_lifespan),
+        startup_hooks=[warm_up],
+        shutdown_hooks=[close],
+    )
+    assert server.lifecycle.state == LifecycleState.STARTING
+
+    with TestClient(server.app) as client:
+        assert calls == ["startup", "app startup"]
+        assert client.get("/readyz").json() == {"status": "ready"}
+
+    assert calls == ["startup", "app startup", "app shutdown", "shutdown"]
+    assert server.lifecycle.state == LifecycleState.STOPPED
+
+
+async def test_shutdown_hook_timeout() -> None:
+    lifecycle = Lifecycle(hook_timeout=0.01)
+    calls: List[str] = []
+
+    @lifecycle.on_shutdown
+    async def done() -> None:
+        calls.append("done")
+
+    @lifecycle.on_shutdown
+    async def stuck() -> None:
+        await asyncio.sleep(10)
+
+    await lifecycle.startup()
+    assert lifecycle.ready
+    await lifecycle.shutdown()
+    assert calls == ["done"]
+    assert lifecycle.state == LifecycleState.STOPPED
+
+
+def test_draining_server_delays_exit(monkeypatch) -> None:
+    exits: List[int] = []
+
+    def handle_exit(self, sig, frame) -> None:
+        exits.append(sig)
+        self.should_exit = True
+
+    # keep wrappers of the default handling, e.g. of sse-starlette, untouched
+    monkeypatch.setattr(uvicorn.Server, "handle_exit", handle_exit)
+    lifecycle = Lifecycle()
+    lifecycle.state = LifecycleState.READY
+    server = DrainingServer(
+        uvicorn.Config(app=None), lifecycle=lifecycle, drain_delay=0.05
+    )
+
+    server.handle_exit(signal.SIGTERM, None)
+    assert lifecycle.state == LifecycleState.DRAINING
+    assert not server.should_exit
+    time.sleep(0.2)
+    assert server.should_exit
+    assert exits == [signal.SIGTERM]
+
+    server = DrainingServer(uvicorn.Config(app=None), drain_delay=10)
+    server.handle_exit(signal.SIGTERM, None)
+    assert not server.should_exit
+    server.handle_exit(signal.SIGTERM, None)
+    assert server.should_exit
+    assert exits == [signal.SIGTERM] * 2
@@ -0,0 +1,257 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Any, List
+from unittest import mock
+
+from arkitect.core.component.bot.middleware import (
+    AdmissionControlMiddleware,
+    ListenDisconnectionMiddleware,
+    LogIdMiddleware,
+)
+from arkitect.telemetry.logger import record_phase
+
+SCOPE = {"type": "http", "method": "POST", "path": "/"}
+
+
+def _receiver(disconnect: asyncio.Event):
+    messages = [{"type": "http.request", "body": b"{}", "more_body": False}]
+
+    async def receive() -> dict:
+        if messages:
+            return messages.pop(0)
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+async def test_cancel_stream_on_disconnect() -> None:
+    disconnect = asyncio.Event()
+    sent: List[Any] = []
+    cancelled = asyncio.Event()
+
+    async def app(scope, receive, send) -> None:
+        await receive()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        try:
+            for i in range(100):
+                await send(
+                    {"type": "http.response.body", "body": b"x", "more_body": True}
+                )
+                if i == 2:
+                    disconnect.set()
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    middleware = ListenDisconnectionMiddleware(app)
+    await asyncio.wait_for(middleware(SCOPE, _receiver(disconnect), send), 5)
+
+    assert cancelled.is_set()
+    assert len(sent) < 10
+
+
+async def test_no_watcher_without_streaming() -> None:
+    sent: List[Any] = []
+
+    async def app(scope, receive, send) -> None:
+        await receive()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    middleware = ListenDisconnectionMiddleware(app)
+    with mock.patch("asyncio.create_task") as create_task:
+        await middleware(SCOPE, _receiver(asyncio.Event()), send)
+
+    create_task.assert_not_called()
+    assert [m["type"] for m in sent] == ["http.response.start", "http.response.body"]
+
+
+async def test_timeline_header() -> None:
+    sent: List[Any] = []
+
+    async def app(scope, receive, send) -> None:
+        record_phase("llm.ttft", 0.25)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    middleware = LogIdMiddleware(app, timeline=True)
+    await middleware({**SCOPE, "headers": []}, _receiver(asyncio.Event()), send)
+
+    headers = dict(sent[0]["headers"])
+    assert b"x-request-id" in headers
+    assert b"llm.ttft;dur=250.0" in headers[b"server-timing"]
+
+
+async def test_timeline_of_stream_logged_at_end() -> None:
+    sent: List[Any] = []
+
+    async def app(scope, receive, send) -> None:
+        record_phase("llm.ttft", 0.25)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        record_phase("sse.serialize", 0.01)
+        await send({"type": "http.response.body", "body": b"data", "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    middleware = LogIdMiddleware(app, timeline=True)
+    with mock.patch("arkitect.core.component.bot.middleware.INFO") as info:
+        await middleware({**SCOPE, "headers": []}, _receiver(asyncio.Event()), send)
+
+    # the header only has the phases before the stream started
+    server_timing = dict(sent[0]["headers"])[b"server-timing"]
+    assert b"llm.ttft" in server_timing
+    assert b"sse.serialize" not in server_timing
+    info.assert_called_once()
+    assert "sse.serialize=10.0" in info.call_args.args[2]
+
+
+class _GatedApp:
+    """Answers once the gate of the request path is opened"""
+
+    def __init__(self) -> None:
+        self.gates: dict = {}
+        self.started: List[str] = []
+
+    async def __call__(self, scope, receive, send) -> None:
+        self.started.append(scope["path"])
+        await self.gates.setdefault(scope["path"], asyncio.Event()).wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    def open(self, path: str) -> None:
+        self.gates.setdefault(path, asyncio.Event()).set()
+
+
+async def _call(middleware, path: str, priority: int = 0) -> List[Any]:
+    sent: List[Any] = []
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [(b"x-request-priority", str(priority).encode())],
+    }
+    await middleware(scope, _receiver(asyncio.Event()), send)
+    return sent
+
+
+def _status(sent: List[Any]) -> int:
+    return sent[0]["status"]
+
+
+async def test_admission_queue_and_reject() -> None:
+    app = _GatedApp()
+    middleware = AdmissionControlMiddleware(
+        app, max_in_flight=1, max_queue_size=1, queue_timeout=5, retry_after=3
+    )
+    first = asyncio.create_task(_call(middleware, "/a"))
+    second = asyncio.create_task(_call(middleware, "/b"))
+    await asyncio.sleep(0.01)
+    assert app.started == ["/a"]
+
+    rejected = await _call(middleware, "/c")
+    assert _status(rejected) == 429
+    assert (b"retry-after", b"3") in rejected[0]["headers"]
+    assert b"ServerOverloaded" in rejected[1]["body"]
+
+    app.open("/a")
+    app.open("/b")
+    assert _status(await first) == 200
+    assert _status(await second) == 200
+    assert app.started == ["/a", "/b"]
+    assert middleware.controller.in_flight == 0
+    assert middleware.controller.queued == 0
+
+
+async def test_admission_priority_and_eviction() -> None:
+    app = _GatedApp()
+    middleware = AdmissionControlMiddleware(
+        app,
+        max_in_flight=1,
+        max_queue_size=2,
+        queue_timeout=5,
+        priority_header="x-request-priority",
+    )
+    running = asyncio.create_task(_call(middleware, "/running"))
+    await asyncio.sleep(0.01)
+    low = asyncio.create_task(_call(middleware, "/low", priority=-1))
+    normal = asyncio.create_task(_call(middleware, "/normal"))
+    await asyncio.sleep(0.01)
+    # the queue is full, the low priority request makes room
+    high = asyncio.create_task(_call(middleware, "/high", priority=5))
+    assert _status(await low) == 429
+    # not higher than anything queued, rejected
+    assert _status(await _call(middleware, "/other", priority=-2)) == 429
+
+    for path in ["/running", "/high", "/normal"]:
+        app.open(path)
+    assert [_status(await t) for t in (running, high, normal)] == [200] * 3
+    assert app.started == ["/running", "/high", "/normal"]
+
+
+def test_admission_priority_header_is_opt_in() -> None:
+    scope = {
+        "type": "http",
+        "path": "/a",
+        "headers": [(b"x-request-priority", b"5")],
+    }
+    middleware = AdmissionControlMiddleware(None, path_priorities={"/a": 1})
+    assert middleware.priority(scope) == 1
+    middleware.priority_header = "x-request-priority"
+    assert middleware.priority(scope) == 5
+
+
+async def test_admission_timeout_and_exempt_paths() -> None:
+    app = _GatedApp()
+    middleware = AdmissionControlMiddleware(
+        app, max_in_flight=1, max_queue_size=10, queue_timeout=0.05
+    )
+    running = asyncio.create_task(_call(middleware, "/running"))
+    await asyncio.sleep(0.01)
+    assert _status(await _call(middleware, "/late")) == 429
+
+    app.open("/healthz")
+    assert _status(await _call(middleware, "/healthz")) == 200
+
+    app.open("/running")
+    await running
+    app.open("/next")
+    assert _status(await _call(middleware, "/next")) == 200
+    assert middleware.controller.in_flight == 0
+
+
+async def test_admission_disabled_by_default() -> None:
+    app = _GatedApp()
+    middleware = AdmissionControlMiddleware(app)
+    assert middleware.controller is None
+    app.open("/a")
+    assert _status(await _call(middleware, "/a")) == 200
@@ -0,0 +1,87 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from arkitect.core.component.context.context import Context
+from arkitect.types.llm.model import FunctionCallMode
+
+
+@pytest.fixture(autouse=True)
+def ark_api_key(monkeypatch):
+    monkeypatch.setenv("ARK_API_KEY", "-")
+
+
+class SleepToolPool:
+    async def contain(self, tool_name: str) -> bool:
+        return True
+
+    async def execute_tool(self, tool_name: str, parameters: dict) -> str:
+        await asyncio.sleep(parameters["seconds"])
+        return f"{tool_name} done"
+
+
+def _tool_call_message(durations: list[float]) -> dict:
+    return {
+        "role": "assistant",
+        "tool_calls": [
+            {
+                "id": str(i),
+                "type": "function",
+                "function": {
+                    "name": f"tool_{i}",
+                    "arguments": json.dumps({"seconds": seconds}),
+                },
+            }
+            for i, seconds in enumerate(durations)
+        ],
+    }
+
+
+async def test_parallel_tool_calls_keep_order() -> None:
+    ctx = Context(model="abc", function_call_mode=FunctionCallMode.PARALLEL)
+    ctx.tool_pool = SleepToolPool()  # type: ignore
+    ctx.state.messages.append(_tool_call_message([0.3, 0.1, 0.2]))
+
+    start = time.perf_counter()
+    assert await ctx.completions.handle_tool_call()
+    assert time.perf_counter() - start < 0.5
+
+    tool_messages = ctx.state.messages[1:]
+    assert [m["tool_call_id"] for m in tool_messages] == ["0", "1", "2"]
+    assert [m["content"] for m in tool_messages] == [
+        "tool_0 done",
+        "tool_1 done",
+        "tool_2 done",
+    ]
+
+
+async def test_parallel_tool_call_timeout() -> None:
+    ctx = Context(
+        model="abc",
+        function_call_mode=FunctionCallMode.PARALLEL,
+        tool_call_timeout=0.1,
+    )
+    ctx.tool_pool = SleepToolPool()  # type: ignore
+    ctx.state.messages.append(_tool_call_message([0.01, 1]))
+
+    chunks = [c async for c in ctx.completions.create_tool_call_stream()]
+
+    results = [c for c in chunks if c.tool_response or c.tool_exception]
+    assert results[0].tool_response == "tool_0 done"
+    assert isinstance(results[1].tool_exception, TimeoutError)
@@ -0,0 +1,95 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from arkitect.core.component.context.history import (
+    SlidingWindowHistory,
+    SummarizeHistory,
+    TokenBudgetHistory,
+    estimate_tokens,
+)
+
+MESSAGES = [
+    {"role": "system", "content": "you are a helpful assistant"},
+    {"role": "user", "content": "search a"},
+    {"role": "assistant", "content": "", "tool_calls": [{"id": "1"}]},
+    {"role": "tool", "tool_call_id": "1", "content": "a" * 400},
+    {"role": "assistant", "content": "found a"},
+    {"role": "user", "content": "thanks"},
+]
+
+
+TOOL_MESSAGES = [
+    {"role": "system", "content": "you are a helpful assistant"},
+    {"role": "user", "content": "search a, b and c"},
+    {
+        "role": "assistant",
+        "content": "",
+        "tool_calls": [{"id": "1"}, {"id": "2"}, {"id": "3"}],
+    },
+    {"role": "tool", "tool_call_id": "1", "content": "a"},
+    {"role": "tool", "tool_call_id": "2", "content": "b"},
+    {"role": "tool", "tool_call_id": "3", "content": "c"},
+]
+
+
+async def test_sliding_window_keeps_tool_calls_with_results() -> None:
+    selected = await SlidingWindowHistory(max_messages=3).select(MESSAGES)
+    assert selected == [MESSAGES[0], *MESSAGES[2:]]
+    selected = await SlidingWindowHistory(max_messages=2).select(MESSAGES)
+    assert selected == [MESSAGES[0], MESSAGES[4], MESSAGES[5]]
+
+
+async def test_history_ending_in_tool_messages() -> None:
+    expected = [TOOL_MESSAGES[0], *TOOL_MESSAGES[2:]]
+    assert await SlidingWindowHistory(max_messages=3).select(TOOL_MESSAGES) == (
+        expected
+    )
+    assert await TokenBudgetHistory(max_tokens=12).select(TOOL_MESSAGES) == expected
+
+    async def summarize(messages) -> str:
+        assert messages == [TOOL_MESSAGES[1]]
+        return "summary"
+
+    selected = await SummarizeHistory(summarize, max_messages=3, keep_last=1).select(
+        TOOL_MESSAGES
+    )
+    assert selected[0] == TOOL_MESSAGES[0]
+    assert "summary" in selected[1]["content"]
+    assert selected[2:] == TOOL_MESSAGES[2:]
+
+
+async def test_token_budget() -> None:
+    budget = sum(estimate_tokens(m) for m in [MESSAGES[0], *MESSAGES[4:]])
+    selected = await TokenBudgetHistory(max_tokens=budget).select(MESSAGES)
+    assert selected == [MESSAGES[0], MESSAGES[4], MESSAGES[5]]
+    assert await TokenBudgetHistory(max_tokens=10**6).select(MESSAGES) == MESSAGES
+
+
+async def test_summarize_reuses_summary() -> None:
+    calls = []
+
+    async def summarize(messages) -> str:
+        calls.append(len(messages))
+        return "summary"
+
+    strategy = SummarizeHistory(summarize, max_messages=4, keep_last=2)
+    selected = await strategy.select(MESSAGES)
+    assert calls == [3]
+    assert selected[0] == MESSAGES[0]
+    assert "summary" in selected[1]["content"]
+    assert selected[2:] == MESSAGES[4:]
+
+    more = MESSAGES + [{"role": "assistant", "content": "bye"}]
+    assert (await strategy.select(more))[2:] == more[4:]
+    assert calls == [3]
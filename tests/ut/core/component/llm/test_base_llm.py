@@ -12,9 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import json
 import os
+import time
+
+from volcenginesdkarkruntime.types.chat import ChatCompletionChunk
+from volcenginesdkarkruntime.types.chat.chat_completion_chunk import (
+    Choice as ChunkChoice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
+from volcenginesdkarkruntime.types.chat.chat_completion_message_tool_call import (
+    ChatCompletionMessageToolCall,
+    Function,
+)
+
 from arkitect.core.component.llm import BaseChatLanguageModel
-from arkitect.types.llm.model import ArkChatResponse, ArkMessage
+from arkitect.types.llm.model import ArkChatResponse, ArkMessage, FunctionCallMode
 from util import MockAsyncArk, get_tool_call_reply
 
 os.environ["ARK_API_KEY"] = "-"
@@ -110,7 +126,231 @@ async def test_base_chat_llm_with_registered_tools() -> None:
     assert resp.choices[0].message.content == "tool call handled"
 
 
-if __name__ == "__main__":
-    import asyncio
+async def adder(a: int, b: int) -> int:
+    """Add two integer numbers
+    Args:
+        a (int): first number
+        b (int): second number
+    Returns:
+        int: sum result
+    """
+    return a + b
+
+
+async def test_base_chat_llm_with_parallel_function_call() -> None:
+    llm = BaseChatLanguageModel(
+        client=MockAsyncArk(message=get_tool_call_reply()),
+        messages=[ArkMessage(role="user", content="hi")],
+        model="abc",
+    )
+    resp = await llm.arun(
+        functions=[adder], function_call_mode=FunctionCallMode.PARALLEL
+    )
+    assert resp.choices[0].message.content == "tool call handled"
+
+
+async def test_base_chat_llm_with_once_function_call() -> None:
+    client = MockAsyncArk(message=get_tool_call_reply())
+    llm = BaseChatLanguageModel(
+        client=client,
+        messages=[ArkMessage(role="user", content="hi")],
+        model="abc",
+    )
+    resp = await llm.arun(functions=[adder], function_call_mode=FunctionCallMode.ONCE)
+    assert resp.choices[0].finish_reason == "tool_calls"
+    assert client.chat.completions.index == 1
+    tool_detail = resp.bot_usage.action_details[0].tool_details[0]
+    assert tool_detail.name == "adder"
+    assert tool_detail.output == "444"
+
+
+async def test_base_chat_llm_stream_with_once_function_call() -> None:
+    tool_call = get_tool_call_reply()[0].choices[0].message.tool_calls[0]
+    client = MockAsyncArk(
+        message=[
+            [
+                _chunk(
+                    ChoiceDelta(
+                        role="assistant",
+                        tool_calls=[
+                            ChoiceDeltaToolCall(
+                                index=0,
+                                id=tool_call.id,
+                                function=ChoiceDeltaToolCallFunction(
+                                    name=tool_call.function.name,
+                                    arguments=tool_call.function.arguments,
+                                ),
+                                type="function",
+                            )
+                        ],
+                    )
+                ),
+                _chunk(ChoiceDelta(role="assistant"), finish_reason="tool_calls"),
+            ],
+        ]
+    )
+    llm = BaseChatLanguageModel(
+        client=client,
+        messages=[ArkMessage(role="user", content="hi")],
+        model="abc",
+    )
+
+    outputs = [
+        chunk.bot_usage.action_details[0].tool_details[0].output
+        async for chunk in llm.astream(
+            functions=[adder], function_call_mode=FunctionCallMode.ONCE
+        )
+        if chunk.bot_usage
+    ]
+
+    assert outputs == ["444"]
+    assert client.chat.completions.index == 1
+
+
+SLOW_CALLS = {"a": 0.3, "b": 0.1, "c": 0.2}
+
+
+def _slow_tool_calls() -> list:
+    return [
+        ChatCompletionMessageToolCall(
+            id=name,
+            function=Function(
+                name="wait",
+                arguments=json.dumps({"name": name, "seconds": seconds}),
+            ),
+            type="function",
+        )
+        for name, seconds in SLOW_CALLS.items()
+    ]
+
+
+def _slow_tools():
+    running = []
+    max_running = []
+
+    async def wait(name: str, seconds: float) -> str:
+        """Wait for some seconds
+        Args:
+            name (str): name of the call
+            seconds (float): seconds to wait
+        Returns:
+            str: name of the call
+        """
+        running.append(name)
+        max_running.append(len(running))
+        await asyncio.sleep(seconds)
+        running.remove(name)
+        return name
+
+    return wait, max_running
+
+
+def _tool_messages(request: dict) -> list:
+    return [m["content"] for m in request["messages"] if m["role"] == "tool"]
+
+
+async def test_parallel_function_calls_run_concurrently() -> None:
+    reply = get_tool_call_reply()
+    reply[0].choices[0].message.tool_calls = _slow_tool_calls()
+    client = MockAsyncArk(message=reply)
+    llm = BaseChatLanguageModel(
+        client=client,
+        messages=[ArkMessage(role="user", content="hi")],
+        model="abc",
+    )
+    wait, max_running = _slow_tools()
+
+    start = time.perf_counter()
+    await llm.arun(functions=[wait], function_call_mode=FunctionCallMode.PARALLEL)
+
+    assert time.perf_counter() - start < 0.5
+    assert max(max_running) == 3
+    # tool messages keep the tool call order, not the completion order
+    assert _tool_messages(client.chat.completions.requests[1]) == ["a", "b", "c"]
+
+
+async def test_max_parallel_function_calls() -> None:
+    reply = get_tool_call_reply()
+    reply[0].choices[0].message.tool_calls = _slow_tool_calls()
+    client = MockAsyncArk(message=reply)
+    llm = BaseChatLanguageModel(
+        client=client,
+        messages=[ArkMessage(role="user", content="hi")],
+        model="abc",
+    )
+    wait, max_running = _slow_tools()
 
+    await llm.arun(
+        functions=[wait],
+        function_call_mode=FunctionCallMode.PARALLEL,
+        max_parallel_function_calls=2,
+    )
+
+    assert max(max_running) == 2
+    assert _tool_messages(client.chat.completions.requests[1]) == ["a", "b", "c"]
+
+
+def _chunk(delta: ChoiceDelta, finish_reason=None) -> ChatCompletionChunk:
+    return ChatCompletionChunk(
+        id="test_id",
+        choices=[ChunkChoice(index=0, delta=delta, finish_reason=finish_reason)],
+        created=0,
+        model="test_model",
+        service_tier="default",
+        object="chat.completion.chunk",
+    )
+
+
+async def test_stream_function_results_in_completion_order() -> None:
+    tool_calls = [
+        ChoiceDeltaToolCall(
+            index=index,
+            id=tool_call.id,
+            function=ChoiceDeltaToolCallFunction(
+                name=tool_call.function.name,
+                arguments=tool_call.function.arguments,
+            ),
+            type="function",
+        )
+        for index, tool_call in enumerate(_slow_tool_calls())
+    ]
+    client = MockAsyncArk(
+        message=[
+            [
+                _chunk(ChoiceDelta(role="assistant", tool_calls=tool_calls)),
+                _chunk(ChoiceDelta(role="assistant"), finish_reason="tool_calls"),
+            ],
+            [
+                _chunk(
+                    ChoiceDelta(role="assistant", content="done"),
+                    finish_reason="stop",
+                )
+            ],
+        ]
+    )
+    llm = BaseChatLanguageModel(
+        client=client,
+        messages=[ArkMessage(role="user", content="hi")],
+        model="abc",
+    )
+    wait, _ = _slow_tools()
+
+    start = time.perf_counter()
+    results = []
+    async for chunk in llm.astream(
+        functions=[wait],
+        function_call_mode=FunctionCallMode.PARALLEL,
+        stream_function_results=True,
+    ):
+        if chunk.bot_usage:
+            tool_detail = chunk.bot_usage.action_details[0].tool_details[0]
+            results.append((tool_detail.output, time.perf_counter() - start))
+
+    assert [output for output, _ in results] == ["b", "c", "a"]
+    # the fastest result is sent before the slowest call returns
+    assert results[0][1] < 0.25
+    assert _tool_messages(client.chat.completions.requests[1]) == ["a", "b", "c"]
+
+
+if __name__ == "__main__":
     asyncio.run(test_base_chat_llm_with_registered_tools())
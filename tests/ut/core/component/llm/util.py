@@ -76,15 +76,25 @@ def get_tool_call_reply():
     ]
 
 
+async def _stream(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
 class MockAsyncCompletions(AsyncCompletions):
     def __init__(self, message: list[ChatCompletion], client):
         super().__init__(client)
         self.message: list[ChatCompletion] = message
         self.index = 0
+        self.requests: list[dict] = []
 
     async def create(self, *args, **kwargs):
         msg = self.message[self.index]
         self.index += 1
+        self.requests.append(kwargs)
+        if isinstance(msg, list):
+            # chunks of a streamed reply
+            return _stream(msg)
         return msg
 
 
@@ -14,11 +14,42 @@
 
 from arkitect.core.component.tool import MCPClient
 
+import asyncio
 import multiprocessing
 import time
+
+import pytest
+from mcp.server.fastmcp import Context
+from mcp.server.fastmcp.tools.base import Tool
+from mcp.shared.memory import create_connected_server_and_client_session
+from dummy_mcp_server import server
 from utils import check_server_working, _start_server, _start_http_streamable_server
 
 
+@pytest.fixture
+def request_ids():
+    """ids of the sleep requests as received by the server"""
+    return []
+
+
+@pytest.fixture
+def slow_server(monkeypatch, request_ids):
+    async def sleep(seconds: float, ctx: Context) -> str:
+        """Sleep for some seconds
+        Args:
+            seconds (float): seconds to sleep
+        Returns:
+            str: done
+        """
+        request_ids.append(int(ctx.request_id))
+        await asyncio.sleep(seconds)
+        return "done"
+
+    # only registered for this test, forked servers of other tests stay as is
+    monkeypatch.setitem(server._tool_manager._tools, "sleep", Tool.from_function(sleep))
+    return server._mcp_server
+
+
 async def test_connect_to_sse_client():
     # Start server in a separate process
     server_process = multiprocessing.Process(target=_start_server, daemon=True)
@@ -50,13 +81,17 @@ async def test_connect_to_sse_client():
 
 async def test_connect_to_http_streamable_client():
     # Start http streamable server in a separate process
-    server_process = multiprocessing.Process(target=_start_http_streamable_server, daemon=True)
+    server_process = multiprocessing.Process(
+        target=_start_http_streamable_server, daemon=True
+    )
     server_process.start()
 
     # Wait a bit to ensure server starts
     time.sleep(3)
 
-    client = MCPClient(server_url="http://localhost:8001/mcp/", transport="streamable-http")
+    client = MCPClient(
+        server_url="http://localhost:8001/mcp/", transport="streamable-http"
+    )
     await client.connect_to_server()
     assert await check_server_working(
         client=client,
@@ -77,6 +112,43 @@ async def test_connect_to_http_streamable_client():
     server_process.kill()
 
 
+async def test_call_timeout_keeps_session(slow_server):
+    client = MCPClient(name="dummy", call_timeout=0.1)
+    async with create_connected_server_and_client_session(slow_server) as session:
+        client.session = session
+        start = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.execute_tool("sleep", {"seconds": 5})
+        assert time.perf_counter() - start < 1
+
+        # the late response of the timed out call is dropped by the session
+        assert await client.execute_tool("adder", {"a": 1, "b": 2}) == "3"
+        assert await client.execute_tool("sleep", {"seconds": 0}) == "done"
+
+
+async def test_cancellation_notification(slow_server, request_ids):
+    client = MCPClient(name="dummy", notify_cancellation=True)
+    async with create_connected_server_and_client_session(slow_server) as session:
+        client.session = session
+        notifications = []
+
+        async def send_notification(notification, *args, **kwargs):
+            # not forwarded, mcp 1.9.4 servers crash on notifications/cancelled
+            notifications.append(notification.root)
+
+        session.send_notification = send_notification
+        call = asyncio.ensure_future(client.execute_tool("sleep", {"seconds": 5}))
+        await asyncio.sleep(0.1)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+        assert [n.method for n in notifications] == ["notifications/cancelled"]
+        # pins the request id MCPClient reads from the session before sending
+        assert notifications[0].params.requestId == request_ids[0]
+        assert await client.execute_tool("adder", {"a": 1, "b": 2}) == "3"
+
+
 if __name__ == "__main__":
     import asyncio
 
@@ -0,0 +1,64 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+
+from arkitect.core.component.tool import MCPClientPool, ToolPool
+
+
+def _build_pool(**kwargs) -> MCPClientPool:
+    return MCPClientPool(
+        name="dummy",
+        command="python",
+        arguments=[os.path.join(os.path.dirname(__file__), "dummy_mcp_server.py")],
+        **kwargs,
+    )
+
+
+async def test_mcp_client_pool_in_tool_pool():
+    client = _build_pool(pool_size=2)
+    pool = ToolPool()
+    pool.add_mcp_client(client)
+    await pool.initialize()
+    assert sorted(t.function.name for t in await pool.list_tools()) == [
+        "adder",
+        "greeting",
+    ]
+    results = await asyncio.gather(
+        *[pool.execute_tool("adder", {"a": i, "b": 1}) for i in range(10)]
+    )
+    assert results == [str(i + 1) for i in range(10)]
+    assert all(s.ready.is_set() for s in client._slots)
+    await client.cleanup()
+    assert all(s.task.done() for s in client._slots)
+
+
+async def test_mcp_client_pool_reconnects_after_failed_health_check():
+    client = _build_pool(pool_size=1, health_check_interval=0.05)
+    await client.connect_to_server()
+    slot = client._slots[0]
+    first_session = slot.client
+
+    async def broken_ping():
+        raise ConnectionError("connection dropped")
+
+    first_session.session.send_ping = broken_ping
+    for _ in range(100):
+        await asyncio.sleep(0.05)
+        if slot.ready.is_set() and slot.client is not first_session:
+            break
+    assert slot.client is not first_session
+    assert await client.execute_tool("greeting", {"name": "John"}) == "Hello, John!"
+    await client.cleanup()
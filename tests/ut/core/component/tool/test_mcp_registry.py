@@ -0,0 +1,81 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import gc
+import json
+import os
+
+from arkitect.core.component.tool import MCPClientPool, MCPRegistry, ToolPool
+
+
+def _write_config(tmp_path) -> str:
+    server = os.path.join(os.path.dirname(__file__), "dummy_mcp_server.py")
+    config_file = tmp_path / "mcp_servers_config.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "mcpServers": {
+                    "shared": {"command": "python", "args": [server]},
+                    "isolated": {"command": "python", "args": [server]},
+                }
+            }
+        )
+    )
+    return str(config_file)
+
+
+async def test_mcp_registry_shares_clients(tmp_path):
+    registry = MCPRegistry(
+        config_file=_write_config(tmp_path), isolated_servers=["isolated"]
+    )
+    await registry.start()
+    shared = registry.get_client("shared")
+    # sessions are owned by the pool tasks, not by the task calling start()
+    assert isinstance(shared, MCPClientPool)
+    assert shared.pool_size == 1
+    assert registry.get_client("isolated") is None
+
+    isolated_clients = []
+    for _ in range(2):
+        async with registry.session() as clients:
+            assert clients["shared"] is shared
+            isolated_clients.append(clients["isolated"])
+            pool = ToolPool()
+            pool.add_mcp_client(clients["shared"])
+            pool.add_mcp_client(clients["isolated"])
+            await pool.initialize()
+            assert await pool.execute_tool("greeting", {"name": "a"}) == "Hello, a!"
+            assert await pool.execute_tool("isolated__adder", {"a": 1, "b": 2}) == "3"
+            del pool
+    assert isolated_clients[0] is not isolated_clients[1]
+
+    # tool pools of finished requests are not kept alive by the shared client
+    gc.collect()
+    assert all(ref() is None for ref in shared._tool_list_changed_callbacks)
+    await registry.close()
+
+
+async def test_mcp_registry_connects_lazily_from_request_task(tmp_path):
+    registry = MCPRegistry(config_file=_write_config(tmp_path))
+
+    async def request() -> str:
+        # the first call connects without start(), from the request task
+        return await registry.get_client("shared").execute_tool(
+            "greeting", {"name": "a"}
+        )
+
+    assert await asyncio.create_task(request()) == "Hello, a!"
+    # closed from another task without leaving a cancel scope behind
+    await registry.close()
@@ -0,0 +1,72 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+from opentelemetry import trace
+from opentelemetry.trace import NonRecordingSpan, SpanContext, TraceFlags
+
+from arkitect.core.component.tool import MCPClient
+from arkitect.core.component.tool.mcp_server import ArkFastMCP, continue_mcp_trace
+
+TRACE_ID = 0x0AF7651916CD43DD8448EB211C80319C
+SPAN_ID = 0x00F067AA0BA902B7
+
+
+def _current_trace_id() -> str:
+    return trace.format_trace_id(trace.get_current_span().get_span_context().trace_id)
+
+
+async def _call_in_trace(server: FastMCP, arguments: dict) -> str:
+    client = MCPClient(name="trace")
+    parent = NonRecordingSpan(
+        SpanContext(
+            trace_id=TRACE_ID,
+            span_id=SPAN_ID,
+            is_remote=False,
+            trace_flags=TraceFlags(TraceFlags.SAMPLED),
+        )
+    )
+    async with create_connected_server_and_client_session(
+        server._mcp_server
+    ) as session:
+        client.session = session
+        with trace.use_span(parent):
+            return await client.execute_tool("current_trace", arguments)
+
+
+async def test_ark_fastmcp_continues_client_trace():
+    server = ArkFastMCP()
+
+    @server.tool()
+    async def current_trace() -> str:
+        return _current_trace_id()
+
+    result = await _call_in_trace(server, {})
+    assert result == trace.format_trace_id(TRACE_ID)
+
+
+async def test_fastmcp_continue_mcp_trace():
+    server = FastMCP()
+
+    @server.tool()
+    async def current_trace(ctx: Context) -> str:
+        outside = _current_trace_id()
+        with continue_mcp_trace(ctx):
+            return f"{outside}/{_current_trace_id()}"
+
+    result = await _call_in_trace(server, {})
+    outside, inside = result.split("/")
+    assert outside != trace.format_trace_id(TRACE_ID)
+    assert inside == trace.format_trace_id(TRACE_ID)
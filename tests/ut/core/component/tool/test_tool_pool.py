@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from arkitect.core.component.tool import ToolPool
+import os
+
+from arkitect.core.component.tool import MCPClient, ToolPool
+from arkitect.types.llm.model import ChatCompletionTool, FunctionDefinition
 from utils import check_server_working
 
 
@@ -56,3 +59,96 @@ async def test_custom_tool():
             "greeting": {"input": {"name": "John"}, "output": "Hello, John!"},
         },
     )
+
+
+async def test_tool_params_cache():
+    pool = ToolPool()
+
+    @pool.tool()
+    async def adder(a: int, b: int) -> int:
+        """Add two integer numbers"""
+        return a + b
+
+    await pool.initialize()
+    params = await pool.list_tool_params()
+    assert [p["function"]["name"] for p in params] == ["adder"]
+    assert await pool.list_tool_params() is params
+
+    async def greeting(name: str) -> str:
+        """Greet a person"""
+        return f"Hello, {name}!"
+
+    pool.add_tool(greeting)
+    params = await pool.list_tool_params()
+    assert [p["function"]["name"] for p in params] == ["adder", "greeting"]
+    assert await pool.list_tool_params() is params
+    assert await pool.contain("greeting")
+
+
+class StaticMCPClient(MCPClient):
+    def __init__(self, tools: list[ChatCompletionTool]) -> None:
+        super().__init__(name="static")
+        self.static_tools = tools
+
+    async def list_tools(self, use_cache: bool = True) -> list[ChatCompletionTool]:
+        return self.static_tools
+
+
+def _chat_completion_tool(name: str) -> ChatCompletionTool:
+    return ChatCompletionTool(
+        type="function",
+        function=FunctionDefinition(
+            name=name, description=name, parameters={"type": "object"}
+        ),
+    )
+
+
+async def test_tool_params_cache_invalidated_by_client():
+    client = StaticMCPClient([_chat_completion_tool("search")])
+    pool = ToolPool()
+    pool.add_mcp_client(client)
+    params = await pool.list_tool_params()
+    assert [p["function"]["name"] for p in params] == ["search"]
+    assert await pool.list_tool_params() is params
+
+    client.static_tools = [_chat_completion_tool("fetch")]
+    client._notify_tool_list_changed()
+    params = await pool.list_tool_params()
+    assert [p["function"]["name"] for p in params] == ["fetch"]
+    # tools removed from the server are not routed anymore
+    assert not await pool.contain("search")
+    assert await pool.contain("fetch")
+
+
+async def test_tool_routing_with_duplicate_names():
+    client = MCPClient(
+        name="dummy",
+        command="python",
+        arguments=[os.path.join(os.path.dirname(__file__), "dummy_mcp_server.py")],
+    )
+    pool = ToolPool()
+
+    @pool.tool()
+    async def adder(a: int, b: int) -> int:
+        """Add two integer numbers"""
+        return a + b + 100
+
+    pool.add_mcp_client(client)
+    await pool.initialize()
+    names = [t.function.name for t in await pool.list_tools()]
+    assert sorted(names) == ["adder", "dummy__adder", "greeting"]
+
+    list_calls = 0
+    list_tools = client.session.list_tools
+
+    async def counting_list_tools():
+        nonlocal list_calls
+        list_calls += 1
+        return await list_tools()
+
+    client.session.list_tools = counting_list_tools
+    assert await pool.execute_tool("adder", {"a": 1, "b": 2}) == "103"
+    assert await pool.execute_tool("dummy__adder", {"a": 1, "b": 2}) == "3"
+    assert await pool.execute_tool("greeting", {"name": "John"}) == "Hello, John!"
+    assert list_calls == 0
+    await client.cleanup()
@@ -0,0 +1,156 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from typing import Any, AsyncIterable, List, Optional
+
+import pytest
+
+from arkitect.core.runtime import ChatAsyncRunner, ChunkCoalescer, Request
+from arkitect.types.llm.model import ArkChatCompletionChunk
+
+
+def _chunk(
+    content: Optional[str] = None,
+    reasoning: Optional[str] = None,
+    finish_reason: Optional[str] = None,
+    tool_calls: Optional[List[Any]] = None,
+    usage: Optional[dict] = None,
+) -> ArkChatCompletionChunk:
+    delta: dict = {"content": content, "reasoning_content": reasoning}
+    if tool_calls:
+        delta["tool_calls"] = tool_calls
+    return ArkChatCompletionChunk.model_validate(
+        {
+            "id": "chatcmpl-1",
+            "object": "chat.completion.chunk",
+            "created": 1700000000,
+            "model": "doubao",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            "usage": usage,
+        }
+    )
+
+
+TOOL_CALL = {
+    "index": 0,
+    "id": "call_1",
+    "type": "function",
+    "function": {"name": "adder", "arguments": "{}"},
+}
+USAGE = {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3}
+
+
+async def _stream(chunks: List[Any], delay: float = 0) -> AsyncIterable[Any]:
+    for chunk in chunks:
+        if delay:
+            await asyncio.sleep(delay)
+        yield chunk
+
+
+async def _collect(stream: AsyncIterable[Any]) -> List[Any]:
+    return [chunk async for chunk in stream]
+
+
+def _describe(chunk: ArkChatCompletionChunk) -> tuple:
+    delta = chunk.choices[0].delta
+    return (
+        delta.content,
+        delta.reasoning_content,
+        bool(delta.tool_calls),
+        chunk.choices[0].finish_reason,
+    )
+
+
+async def test_merge_text_keep_special_chunks():
+    chunks = [
+        _chunk(content=""),
+        _chunk(reasoning="th"),
+        _chunk(reasoning="ink"),
+        _chunk(content="Hel"),
+        _chunk(content="lo"),
+        _chunk(tool_calls=[TOOL_CALL]),
+        _chunk(content="!"),
+        _chunk(content="?"),
+        _chunk(finish_reason="stop"),
+    ]
+    originals = [chunk.model_copy(deep=True) for chunk in chunks]
+    out = await _collect(ChunkCoalescer(max_delay_ms=1000).coalesce(_stream(chunks)))
+    assert [_describe(c) for c in out] == [
+        ("", None, False, None),
+        (None, "think", False, None),
+        ("Hello", None, False, None),
+        (None, None, True, None),
+        ("!?", None, False, None),
+        (None, None, False, "stop"),
+    ]
+    # the chunks of the producer are left untouched
+    assert chunks == originals
+
+
+async def test_usage_chunk_not_merged():
+    usage_chunk = _chunk(content="", usage=USAGE)
+    chunks = [_chunk(content="a"), _chunk(content="b"), _chunk(content="c")]
+    out = await _collect(
+        ChunkCoalescer(max_delay_ms=1000).coalesce(_stream(chunks + [usage_chunk]))
+    )
+    assert [c.choices[0].delta.content for c in out] == ["a", "bc", ""]
+    assert out[-1] is usage_chunk
+
+
+async def test_latency_and_size_budget():
+    chunks = [_chunk(content=str(i)) for i in range(4)]
+    out = await _collect(ChunkCoalescer(max_delay_ms=1).coalesce(_stream(chunks, 0.02)))
+    assert len(out) == 4
+
+    chunks = [_chunk(content="ab") for _ in range(7)]
+    out = await _collect(
+        ChunkCoalescer(max_delay_ms=1000, max_chars=4).coalesce(_stream(chunks))
+    )
+    assert [c.choices[0].delta.content for c in out] == ["ab", "abab", "abab", "abab"]
+
+
+async def test_error_flushes_pending():
+    async def failing() -> AsyncIterable[Any]:
+        yield _chunk(content="a")
+        yield _chunk(content="b")
+        yield _chunk(content="c")
+        raise ValueError("boom")
+
+    out = []
+    with pytest.raises(ValueError):
+        async for chunk in ChunkCoalescer(max_delay_ms=1000).coalesce(failing()):
+            out.append(chunk.choices[0].delta.content)
+    assert out == ["a", "bc"]
+
+
+async def test_runner_astream_coalesced():
+    async def chat(request: Request) -> AsyncIterable[ArkChatCompletionChunk]:
+        for chunk in [_chunk(content="a"), _chunk(content="b"), _chunk(content="c")]:
+            yield chunk
+
+    runner = ChatAsyncRunner(chat)
+    events = [
+        event
+        async for event in runner.astream(
+            Request(), coalescer=ChunkCoalescer(max_delay_ms=1000)
+        )
+    ]
+    contents = [
+        json.loads(event[len("data:") :])["choices"][0]["delta"]["content"]
+        for event in events[:-1]
+    ]
+    assert contents == ["a", "bc"]
+    assert events[-1] == "data:[DONE]\r\n\r\n"
@@ -0,0 +1,86 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import dataclasses
+import json
+from typing import Any, AsyncIterable, Dict
+
+from arkitect.core.errors import InvalidParameter
+from arkitect.core.runtime import (
+    ChatAsyncRunner,
+    CustomAsyncRunner,
+    Request,
+    Response,
+    SSEEncoder,
+)
+from arkitect.types.llm.model import ArkChatCompletionChunk
+
+CHUNK = ArkChatCompletionChunk.model_validate(
+    {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 1700000000,
+        "model": "doubao",
+        "choices": [{"index": 0, "delta": {"content": "你好"}, "finish_reason": None}],
+    }
+)
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+def _payload(event: str) -> Any:
+    assert event.startswith("data:") and event.endswith("\r\n\r\n")
+    return json.loads(event[len("data:") : -len("\r\n\r\n")])
+
+
+def test_encode_matches_model_dump_json():
+    encoder = SSEEncoder()
+    assert encoder.encode(CHUNK) == (
+        f"data:{CHUNK.model_dump_json(exclude_none=True)}\r\n\r\n"
+    )
+    assert _payload(encoder.encode({"text": "你好", 1: 2})) == {
+        "text": "你好",
+        "1": 2,
+    }
+    assert _payload(SSEEncoder(use_orjson=False).encode(["a"])) == ["a"]
+    assert _payload(encoder.encode(Point(1, 2))) == {"x": 1, "y": 2}
+    assert encoder.encode_done() == "data:[DONE]\r\n\r\n"
+
+
+async def test_runners_use_encoder():
+    class UpperEncoder(SSEEncoder):
+        def encode(self, resp: Any) -> str:
+            return super().encode(resp).upper()
+
+    async def chat(request: Request) -> AsyncIterable[ArkChatCompletionChunk]:
+        yield CHUNK
+
+    async def custom(request: Request) -> AsyncIterable[Dict[str, str]]:
+        yield {"text": "hi"}
+        raise InvalidParameter("text")
+
+    runner = ChatAsyncRunner(chat, sse_encoder=UpperEncoder())
+    events = [event async for event in runner.astream(Request())]
+    assert events[0] == UpperEncoder().encode(CHUNK)
+    assert events[-1] == "data:[DONE]\r\n\r\n"
+
+    custom_runner = CustomAsyncRunner(Response, custom)
+    events = [event async for event in custom_runner.astream(Request())]
+    assert _payload(events[0]) == {"text": "hi"}
+    assert "error" in _payload(events[1])
+    assert events[-1] == "data:[DONE]\r\n\r\n"
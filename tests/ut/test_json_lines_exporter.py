@@ -0,0 +1,98 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from arkitect.telemetry.trace import JsonLinesSpanExporter
+
+
+class _BlockingOut(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.release.wait()
+        return super().write(s)
+
+
+class TestJsonLinesSpanExporter(unittest.TestCase):
+    def setUp(self):
+        self.tracer = TracerProvider().get_tracer(__name__)
+
+    def _spans(self, n: int, name: str = "task"):
+        spans = []
+        for i in range(n):
+            span = self.tracer.start_span(f"{name}-{i}")
+            span.set_attribute("input", "中文")
+            span.add_event("first_chunk")
+            span.end()
+            spans.append(span)
+        return spans
+
+    def test_same_fields_as_to_json(self):
+        for use_orjson in [True, False]:
+            out = io.StringIO()
+            exporter = JsonLinesSpanExporter(out=out, use_orjson=use_orjson)
+            (span,) = self._spans(1)
+            exporter.export([span])
+            self.assertTrue(exporter.force_flush())
+            lines = out.getvalue().splitlines()
+            self.assertEqual(len(lines), 1)
+            self.assertEqual(json.loads(lines[0]), json.loads(span.to_json()))
+            exporter.shutdown()
+
+    def test_drops_when_queue_is_full(self):
+        out = _BlockingOut()
+        exporter = JsonLinesSpanExporter(out=out, max_queue_size=2)
+        exporter.export(self._spans(1))
+        # wait until the writer thread blocks on the first span
+        while exporter._queue.qsize():
+            time.sleep(0.001)
+        exporter.export(self._spans(5))
+        self.assertEqual(exporter.dropped_spans, 3)
+        out.release.set()
+        self.assertTrue(exporter.force_flush())
+        self.assertEqual(exporter.written_spans, 3)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+        exporter.shutdown()
+
+    def test_rotation(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            path = os.path.join(log_dir, "trace.log")
+            exporter = JsonLinesSpanExporter(path=path, max_bytes=1, backup_count=2)
+            for span in self._spans(4):
+                exporter.export([span])
+                exporter.force_flush()
+            exporter.shutdown()
+            self.assertEqual(
+                sorted(os.listdir(log_dir)),
+                ["trace.log", "trace.log.1", "trace.log.2"],
+            )
+            with open(path) as f:
+                self.assertEqual(json.loads(f.read())["name"], "task-3")
+            with open(path + ".2") as f:
+                self.assertEqual(json.loads(f.read())["name"], "task-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import re
+import threading
+from typing import List
+
+import pytest
+
+from arkitect.telemetry.logger import (
+    gen_fast_log_id,
+    gen_log_id,
+    get_log_id_generator,
+)
+
+IDS_PER_WORKER = 50_000
+
+
+def _generate(n: int) -> List[str]:
+    return [gen_fast_log_id() for _ in range(n)]
+
+
+def test_format() -> None:
+    assert re.fullmatch(r"\d{14}[0-9A-F]{20}", gen_fast_log_id())
+    assert len(gen_fast_log_id()) == len(gen_log_id())
+    assert get_log_id_generator("fast") is gen_fast_log_id
+    assert get_log_id_generator("random") is gen_log_id
+    with pytest.raises(ValueError):
+        get_log_id_generator("unknown")
+
+
+def test_unique_across_workers() -> None:
+    # ids generated before forking must not be repeated by the children,
+    # spawned workers are checked by tests/benchmark/stress_log_id.py
+    parent_ids = _generate(IDS_PER_WORKER)
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(4) as pool:
+        results = pool.map(_generate, [IDS_PER_WORKER] * 4)
+    ids = parent_ids + [log_id for worker_ids in results for log_id in worker_ids]
+    assert len(set(ids)) == len(ids)
+
+
+def test_unique_across_threads() -> None:
+    results: List[List[str]] = []
+
+    def run() -> None:
+        results.append(_generate(IDS_PER_WORKER))
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    ids = [log_id for thread_ids in results for log_id in thread_ids]
+    assert len(set(ids)) == len(ids) == 4 * IDS_PER_WORKER
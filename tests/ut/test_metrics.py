@@ -0,0 +1,126 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from arkitect.core.component.bot import BotServer
+from arkitect.core.runtime import ChatAsyncRunner
+from arkitect.telemetry.metrics import (
+    LLM_REQUEST_DURATION,
+    LLM_TIME_TO_FIRST_TOKEN,
+    LLM_TOKENS,
+    TOOL_CALL_DURATION,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    generate_latest,
+    observe_llm_stream,
+    observe_tool_call,
+)
+
+
+def test_render() -> None:
+    registry = MetricsRegistry()
+    requests = Counter("requests_total", "Requests", ["path"], registry=registry)
+    latency = Histogram("latency_seconds", "Latency", registry=registry, buckets=[1, 2])
+    requests.labels(path='/a"b').inc()
+    requests.labels(path='/a"b').inc(2)
+    latency.observe(0.5)
+    latency.observe(1.5)
+    latency.observe(3)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{path="/a\\"b"} 3',
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="2"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5",
+        "latency_seconds_count 3",
+    ]
+    with pytest.raises(ValueError):
+        requests.inc()
+    with pytest.raises(ValueError):
+        Counter("requests_total", "Requests", registry=registry)
+
+
+async def test_observe_llm_stream() -> None:
+    async def stream():
+        yield SimpleNamespace(usage=None)
+        yield SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=3, completion_tokens=5)
+        )
+
+    ttft = LLM_TIME_TO_FIRST_TOKEN.labels("test-stream")
+    completion_tokens = LLM_TOKENS.labels("test-stream", "completion")
+    chunks = [chunk async for chunk in observe_llm_stream("test-stream", stream())]
+
+    assert len(chunks) == 2
+    assert sum(ttft.counts) == 1
+    assert completion_tokens.value == 5
+    assert LLM_TOKENS.labels("test-stream", "prompt").value == 3
+
+
+async def test_observe_llm_stream_excludes_consumer_time() -> None:
+    async def stream():
+        yield SimpleNamespace(usage=None)
+        yield SimpleNamespace(usage=None)
+
+    duration = LLM_REQUEST_DURATION.labels("test-paused-stream", "true", "ok")
+    async for _ in observe_llm_stream("test-paused-stream", stream()):
+        # e.g. running tool calls before reading the rest of the stream
+        await asyncio.sleep(0.2)
+
+    assert sum(duration.counts) == 1
+    assert duration.sum < 0.1
+
+
+def test_observe_tool_call() -> None:
+    with pytest.raises(RuntimeError):
+        with observe_tool_call("test-server", "adder"):
+            raise RuntimeError()
+    with observe_tool_call("test-server", "adder"):
+        pass
+
+    assert sum(TOOL_CALL_DURATION.labels("test-server", "adder", "error").counts) == 1
+    assert sum(TOOL_CALL_DURATION.labels("test-server", "adder", "ok").counts) == 1
+
+
+def test_metrics_endpoint() -> None:
+    async def main(request):
+        yield None
+
+    server = BotServer(runner=ChatAsyncRunner(runnable_func=main))
+    with TestClient(server.app) as client:
+        assert client.get("/metrics").status_code == 404
+
+    server = BotServer(
+        runner=ChatAsyncRunner(runnable_func=main), metrics_path="/metrics"
+    )
+    with observe_tool_call("test-endpoint", "adder"):
+        pass
+    with TestClient(server.app) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text == generate_latest()
+    assert 'server="test-endpoint"' in response.text
@@ -0,0 +1,102 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import logging
+import threading
+import unittest
+
+from arkitect.telemetry.logger import setup_queue_logging
+from arkitect.telemetry.logger.common import RpcFilter
+from arkitect.utils.context import set_client_reqid, set_reqid
+
+
+class BlockingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.unblocked = threading.Event()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.unblocked.wait(5)
+        self.records.append(record)
+
+
+class TestQueueLogging(unittest.TestCase):
+    def test_json_fields(self):
+        out = io.StringIO()
+        handler = logging.StreamHandler(out)
+        handler.addFilter(RpcFilter())
+        setup = setup_queue_logging(
+            "test_queue_logging.json", handlers=[handler], level=logging.INFO
+        )
+        logger = logging.getLogger("test_queue_logging.json")
+
+        set_reqid("req-1")
+        set_client_reqid("client-1")
+        logger.info("hello %s", "world", extra={"tags": {"method": "chat"}})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed", extra={"tags": {"method": "chat"}})
+        setup.stop()
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["message"], "hello world")
+        self.assertEqual(lines[0]["logid"], "req-1")
+        self.assertEqual(lines[0]["client_reqid"], "client-1")
+        self.assertEqual(lines[0]["rpc_tags"], "method:chat")
+        self.assertEqual(lines[0]["level"], "INFO")
+        self.assertIn("ValueError: boom", lines[1]["exc_info"])
+        self.assertEqual(setup.dropped_records, 0)
+        self.assertEqual(logger.handlers, [])
+
+    def test_stop_restores_handlers(self):
+        logger = logging.getLogger("test_queue_logging.restore")
+        formatter = logging.Formatter("%(message)s")
+        handler = logging.StreamHandler(io.StringIO())
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+        setup = setup_queue_logging("test_queue_logging.restore")
+        self.assertEqual(logger.handlers, [setup.handler])
+        self.assertIsNot(handler.formatter, formatter)
+        setup.stop()
+
+        self.assertEqual(logger.handlers, [handler])
+        self.assertIs(handler.formatter, formatter)
+        logger.removeHandler(handler)
+
+    def test_drop_when_full(self):
+        handler = BlockingHandler()
+        setup = setup_queue_logging(
+            "test_queue_logging.drop",
+            handlers=[handler],
+            level=logging.INFO,
+            max_queue_size=4,
+        )
+        logger = logging.getLogger("test_queue_logging.drop")
+        for i in range(50):
+            logger.info("record %d", i)
+        # the listener holds at most one record while blocked
+        self.assertGreaterEqual(setup.dropped_records, 50 - 5)
+        handler.unblocked.set()
+        setup.stop()
+        self.assertEqual(len(handler.records) + setup.dropped_records, 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,6 +19,7 @@ import logging
 import unittest
 from os import linesep
 from typing import IO, List, Optional
+from unittest import mock
 
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
@@ -91,6 +92,21 @@ class TestTask(unittest.TestCase):
         input = _update_kwargs(args, kwargs, func)
         self.assertEqual(input, {})
 
+        def varargs_func(request, *rest, extra=None):
+            pass
+
+        input = _update_kwargs(["1", "2", "3"], {"extra": "4"}, varargs_func)
+        self.assertEqual(input, {"request": "1", "rest": ("2", "3"), "extra": "4"})
+
+    def test_no_tracer_provider(self):
+        with mock.patch(
+            "arkitect.telemetry.trace.wrapper._tracing_enabled", return_value=False
+        ):
+            self.assertEqual(test_sync(), 2)
+            loop = asyncio.get_event_loop()
+            self.assertEqual(loop.run_until_complete(test_async()), 2)
+        self.assertEqual(self.f.getvalue(), "")
+
     def test_sync_nested(self):
         test_sync()
         spans = []
@@ -151,6 +167,26 @@ class TestTask(unittest.TestCase):
         self.assertEqual(spans[1]["parent_id"], spans[2]["context"]["span_id"])
         self.assertEqual(spans[0]["parent_id"], spans[1]["context"]["span_id"])
 
+    def test_aggregate_stream(self):
+        @task(aggregate_stream=True)
+        async def stream(n: int):
+            for i in range(n):
+                yield i
+
+        async def consume():
+            return [i async for i in stream(3)]
+
+        loop = asyncio.get_event_loop()
+        self.assertEqual(loop.run_until_complete(consume()), [0, 1, 2])
+        spans = [json.loads(line) for line in self.f.getvalue().splitlines()]
+        self.assertEqual(len(spans), 1)
+        attributes = spans[0]["attributes"]
+        self.assertEqual(attributes["stream.chunk_count"], 3)
+        self.assertEqual(attributes["output"], "2")
+        self.assertEqual(json.loads(attributes["input"]), {"n": 3})
+        self.assertEqual(sum(attributes["stream.inter_chunk_ms.bucket_counts"]), 2)
+        self.assertEqual(spans[0]["events"][0]["name"], "first_chunk")
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextvars
+import re
+
+from arkitect.telemetry.logger import (
+    Timeline,
+    record_phase,
+    start_timeline,
+    timeline_phase,
+)
+from arkitect.telemetry.metrics import observe_tool_call
+
+
+def test_summary() -> None:
+    timeline = Timeline(start=0)
+    timeline.record("llm.ttft", 0.3)
+    timeline.record("tool.search", 0.05)
+    timeline.record("tool.search", 0.02)
+
+    summary = timeline.summary()
+    assert re.fullmatch(
+        r"total=\d+\.\d llm.ttft=300.0 tool.search=70.0/2\(max=50.0\)", summary
+    )
+    assert timeline.server_timing().endswith(
+        ", llm.ttft;dur=300.0, tool.search;dur=70.0"
+    )
+
+
+def test_request_scoped() -> None:
+    def request() -> Timeline:
+        timeline = start_timeline()
+        with timeline_phase("prompt.render"):
+            pass
+        with observe_tool_call("local", "adder"):
+            pass
+
+        async def child() -> None:
+            # phases of tasks started by the request are on its timeline
+            record_phase("llm.ttft", 0.1)
+
+        asyncio.run(child())
+        return timeline
+
+    timeline = contextvars.copy_context().run(request)
+    assert list(timeline.phases) == ["prompt.render", "tool.adder", "llm.ttft"]
+
+    # no timeline outside of a request
+    contextvars.copy_context().run(record_phase, "llm.ttft", 0.1)
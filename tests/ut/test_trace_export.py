@@ -0,0 +1,127 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from arkitect.telemetry.metrics import TRACE_DEFERRED_SPANS_EVICTED
+from arkitect.telemetry.trace import (
+    DeferredAttributesSpanExporter,
+    TailSamplingSpanProcessor,
+    enable_deferred_attributes,
+    set_trace_attributes,
+)
+
+
+class TestTraceExport(unittest.TestCase):
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        self.provider = TracerProvider()
+        self.tracer = self.provider.get_tracer(__name__)
+        enable_deferred_attributes()
+
+    def tearDown(self):
+        enable_deferred_attributes(False)
+
+    def test_deferred_attributes(self):
+        self.provider.add_span_processor(
+            SimpleSpanProcessor(DeferredAttributesSpanExporter(self.exporter))
+        )
+        with mock.patch(
+            "arkitect.telemetry.trace.attributes.dump_json_str_truncate",
+            wraps=lambda obj, limit: str(obj),
+        ) as dump:
+            span = self.tracer.start_span("task")
+            set_trace_attributes(
+                span, input={"a": 1}, output="x" * 100, attribute_budget=10
+            )
+            self.assertEqual(dump.call_count, 0)
+            self.assertNotIn("input", span.attributes)
+            span.end()
+            self.assertEqual(dump.call_count, 2)
+
+        exported = self.exporter.get_finished_spans()[0]
+        self.assertEqual(exported.attributes["input"], "{'a': 1}")
+        self.assertEqual(exported.attributes["output"], "x" * 10 + "...(truncated)")
+        self.assertEqual(exported.attributes["merge_output"], False)
+
+    def test_deferred_attributes_snapshot(self):
+        self.provider.add_span_processor(
+            SimpleSpanProcessor(DeferredAttributesSpanExporter(self.exporter))
+        )
+        span = self.tracer.start_span("task")
+        messages = [{"role": "user"}]
+        set_trace_attributes(span, input=messages)
+        messages.append({"role": "assistant"})
+        messages[0]["role"] = "system"
+        span.end()
+
+        exported = self.exporter.get_finished_spans()[0]
+        self.assertIn("system", exported.attributes["input"])
+        self.assertNotIn("assistant", exported.attributes["input"])
+
+    def test_deferred_attributes_eviction(self):
+        self.provider.add_span_processor(
+            SimpleSpanProcessor(DeferredAttributesSpanExporter(self.exporter))
+        )
+        evicted = TRACE_DEFERRED_SPANS_EVICTED.labels().value
+        with (
+            mock.patch(
+                "arkitect.telemetry.trace.attributes._MAX_OPEN_DEFERRED_SPANS", 1
+            ),
+            mock.patch("arkitect.telemetry.trace.attributes.WARN") as warn,
+        ):
+            enable_deferred_attributes(max_queue_size=1)
+            spans = [self.tracer.start_span(str(i)) for i in range(3)]
+            for span in spans:
+                set_trace_attributes(span, input="x")
+            for span in spans:
+                span.end()
+
+        self.assertEqual(TRACE_DEFERRED_SPANS_EVICTED.labels().value, evicted + 1)
+        warn.assert_called_once()
+        exported = self.exporter.get_finished_spans()
+        self.assertEqual(
+            ["input" in span.attributes for span in exported], [False, True, True]
+        )
+
+    def test_tail_sampling(self):
+        self.provider.add_span_processor(
+            TailSamplingSpanProcessor(
+                SimpleSpanProcessor(DeferredAttributesSpanExporter(self.exporter)),
+                sample_rate=0,
+                slow_span_threshold_ms=1000,
+            )
+        )
+        with mock.patch(
+            "arkitect.telemetry.trace.attributes.dump_json_str_truncate"
+        ) as dump:
+            dump.return_value = ""
+            for status_code in [trace.StatusCode.OK, trace.StatusCode.ERROR]:
+                span = self.tracer.start_span(status_code.name)
+                set_trace_attributes(span, status_code=status_code, input="x")
+                span.end()
+            span = self.tracer.start_span("slow", start_time=0)
+            span.end(end_time=2_000_000_000)
+            # only the kept error span is serialized
+            self.assertEqual(dump.call_count, 2)
+        names = [s.name for s in self.exporter.get_finished_spans()]
+        self.assertEqual(names, ["ERROR", "slow"])
@@ -0,0 +1,74 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from volcenginesdkarkruntime.types.chat import ChatCompletionChunk
+
+from arkitect.types.llm.model import ArkChatCompletionChunk
+from arkitect.utils.stream import StreamAccumulator
+
+
+def _chunk(delta: dict, finish_reason: str | None = None) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "1",
+            "created": 0,
+            "model": "m",
+            "object": "chat.completion.chunk",
+            "service_tier": "default",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+    )
+
+
+def test_stream_accumulator() -> None:
+    def tool_call(index: int, arguments: str, **kwargs: str) -> dict:
+        return {
+            "index": index,
+            "function": {"arguments": arguments, **kwargs},
+            **({"id": f"call_{index}", "type": "function"} if kwargs else {}),
+        }
+
+    chunks = [
+        _chunk({"role": "assistant", "content": "Let me "}),
+        _chunk({"content": "add."}),
+        _chunk({"tool_calls": [tool_call(0, '{"a": ', name="adder")]}),
+        _chunk({"tool_calls": [tool_call(1, "", name="greeting")]}),
+        _chunk({"tool_calls": [tool_call(0, "1}")]}),
+        _chunk({"tool_calls": [tool_call(1, '{"name": "x"}')]}),
+        _chunk({"content": None}, finish_reason="tool_calls"),
+    ]
+    accumulator = StreamAccumulator()
+    for chunk in chunks:
+        accumulator.add(chunk)
+
+    assert accumulator.content == "Let me add."
+    assert accumulator.finish_reason == "tool_calls"
+    assert [
+        (t.id, t.function.name, t.function.arguments) for t in accumulator.tool_calls
+    ] == [
+        ("call_0", "adder", '{"a": 1}'),
+        ("call_1", "greeting", '{"name": "x"}'),
+    ]
+    merged = accumulator.to_chunk()
+    assert type(merged) is ChatCompletionChunk
+    assert merged.choices[0].delta.content == "Let me add."
+    assert merged.choices[0].finish_reason == "tool_calls"
+    assert len(merged.choices[0].delta.tool_calls) == 2
+    # chunks already sent to the caller are left untouched
+    assert chunks[2].choices[0].delta.tool_calls[0].function.arguments == '{"a": '
+    assert chunks[-1].choices[0].delta.content is None
+
+    merged = accumulator.to_chunk(ArkChatCompletionChunk)
+    assert isinstance(merged, ArkChatCompletionChunk)
+    assert merged.choices[0].delta.content == "Let me add."